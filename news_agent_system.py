@@ -23,11 +23,17 @@ KVALITETSKRITERIER:
 import json
 import logging
 import asyncio
-from typing import List, Dict, Optional
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
 from datetime import datetime
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
 
+from src.episode_archive import EpisodeArchive
+from src.relevance_model import RelevanceModel
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
@@ -56,6 +62,100 @@ class NewsArticle:
     fact_check_passed: bool = False
     fact_check_notes: str = ""
     geographic_region: str = ""  # Sverige, Norden, Europa, Global
+    alternates: List[Dict[str, str]] = field(default_factory=list)  # Samma story från andra källor
+
+    @property
+    def matching_text(self) -> str:
+        """Titel och innehåll plus de andra källornas rubriker på samma story (för nyckelordsmatchning)"""
+        alternate_titles = [
+            alt.get('title') or '' for alt in self.alternates if isinstance(alt, dict)
+        ]
+        return " ".join([self.title, self.content] + alternate_titles)
+
+
+class KeywordMatcher:
+    """
+    Hittar vilka nyckelordsklasser som förekommer i en text, i ett enda regex-pass.
+
+    Nyckelord matchar som delsträng oavsett skiftläge (så att sammansättningar som
+    "klimatmålen" träffar "klimat"), utom de i ``whole_words`` som måste stå som
+    egna ord och de i ``prefixes`` som måste inleda ett ord. Alla klasser vars
+    nyckelord förekommer returneras, även när nyckelorden överlappar i texten.
+    """
+
+    def __init__(
+        self,
+        classes: Dict[str, Iterable[str]],
+        whole_words: Iterable[str] = (),
+        prefixes: Iterable[str] = (),
+    ):
+        whole = {w.strip().lower() for w in whole_words}
+        starts = {w.strip().lower() for w in prefixes}
+        self._classes: Dict[str, Set[str]] = {}
+        for name, keywords in classes.items():
+            for keyword in keywords:
+                keyword = keyword.strip().lower()
+                if keyword:
+                    self._classes.setdefault(keyword, set()).add(name)
+        self._left = {k for k in self._classes if k in whole or k in starts}
+        self._right = {k for k in self._classes if k in whole}
+        self._class_count = len({name for names in self._classes.values() for name in names})
+
+        # A match is the longest keyword starting at that position; every other keyword
+        # starting there is a prefix of it. Word boundaries are checked per hit.
+        ordered = sorted(self._classes, key=len, reverse=True)
+        self._pattern = re.compile(self._trie_pattern(ordered))
+        self._candidates = {
+            k: [k] + [s for s in ordered if len(s) < len(k) and k.startswith(s)] for k in ordered
+        }
+
+    @staticmethod
+    def _trie_pattern(keywords: Iterable[str]) -> str:
+        """Regex for the keywords as a prefix tree (greedy, so the longest keyword wins).
+
+        Shared prefixes are tested once, so each text position costs one branch per
+        character instead of one attempt per keyword.
+        """
+        trie: Dict[str, dict] = {}
+        for keyword in keywords:
+            node = trie
+            for char in keyword:
+                node = node.setdefault(char, {})
+            node[''] = {}
+
+        def _build(node: Dict[str, dict]) -> str:
+            branches = [re.escape(char) + _build(child) for char, child in sorted(node.items()) if char]
+            if not branches:
+                return ''
+            body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+            return f'(?:{body})?' if '' in node else body
+
+        return _build(trie)
+
+    def _matches_at(self, keyword: str, text: str, start: int) -> bool:
+        if keyword in self._left and start > 0 and text[start - 1].isalpha():
+            return False
+        end = start + len(keyword)
+        if keyword in self._right and end < len(text) and text[end].isalpha():
+            return False
+        return True
+
+    def matches(self, text: str) -> Set[str]:
+        """Namnen på alla klasser med minst ett nyckelord i ``text``."""
+        text = (text or '').lower()
+        hits: Set[str] = set()
+        search = self._pattern.search
+        match = search(text)
+        while match is not None:
+            start = match.start()
+            for keyword in self._candidates[match.group()]:
+                if not self._classes[keyword] <= hits and self._matches_at(keyword, text, start):
+                    hits |= self._classes[keyword]
+            if len(hits) == self._class_count:
+                break
+            # Next start position, so keywords overlapping this one are found too
+            match = search(text, start + 1)
+        return hits
 
 
 class NewsScraperAgent:
@@ -76,7 +176,7 @@ class NewsScraperAgent:
         'miljö', 'environment', 'hållbarhet', 'sustainability',
         'natur', 'nature', 'ekosystem', 'ecosystem', 'biologisk mångfald',
         'biodiversity', 'återvinning', 'recycling', 'cirkulär ekonomi',
-        'förorening', 'pollution', 'skog', 'forest', 'hav', 'ocean',
+        'förorening', 'pollution', 'skog', 'forest', 'hav', 'havet', 'havs', 'ocean',
         'vatten', 'water', 'luft', 'air quality', 'naturvård',
         'skyddad', 'arter', 'species'
     ]
@@ -111,26 +211,52 @@ class NewsScraperAgent:
         'riksdag', 'regering', 'statsminister', 'miljöminister',
         'naturvårdsverket', 'smhi', 'sgu', 'havs- och vattenmyndigheten'
     ]
-    
+
+    # Korta ord som annars träffar inuti andra ord ("ev" i "every", "hav" i "have", "cop" i "copy")
+    WHOLE_WORD_KEYWORDS = ['EV', 'COP', 'hav', 'sale', 'sgu', 'llm']
+    # Måste inleda ett ord ("arter" men inte "starter"/"karter"). Böjningar och
+    # sammansättningar av "hav" fångas av "havet" och "havs" ("havsnivån", "havsisen")
+    PREFIX_KEYWORDS = ['arter', 'havs']
+
+    _matcher: Optional[KeywordMatcher] = None
+
+    @classmethod
+    def keyword_matcher(cls) -> KeywordMatcher:
+        """Matcher för alla nyckelordslistor, byggd en gång per process."""
+        if cls._matcher is None:
+            cls._matcher = KeywordMatcher(
+                {
+                    'irrelevant': cls.IRRELEVANT_KEYWORDS,
+                    'swedish': cls.SWEDISH_INDICATORS,
+                    'climate': cls.CLIMATE_KEYWORDS,
+                    'environment': cls.ENVIRONMENT_KEYWORDS,
+                    'tech_climate': cls.TECH_CLIMATE_KEYWORDS,
+                    'ai': cls.AI_KEYWORDS,
+                },
+                whole_words=cls.WHOLE_WORD_KEYWORDS,
+                prefixes=cls.PREFIX_KEYWORDS,
+            )
+        return cls._matcher
+
     def categorize(self, article: NewsArticle) -> NewsArticle:
         """Kategorisera artikel baserat på innehåll"""
-        text = f"{article.title} {article.content}".lower()
+        hits = self.keyword_matcher().matches(article.matching_text)
         
         # Kolla om irrelevant först
-        if any(keyword in text for keyword in self.IRRELEVANT_KEYWORDS):
+        if 'irrelevant' in hits:
             article.category = NewsCategory.IRRELEVANT
-            logger.info(f"[SCRAPER] ❌ IRRELEVANT: {article.title}")
+            logger.debug(f"[SCRAPER] ❌ IRRELEVANT: {article.title}")
             return article
         
         # Identifiera geografisk region
-        is_swedish = any(indicator in text for indicator in self.SWEDISH_INDICATORS)
+        is_swedish = 'swedish' in hits
         article.geographic_region = "Sverige" if is_swedish else "Global"
         
         # Kategorisera efter innehåll
-        has_climate = any(kw in text for kw in self.CLIMATE_KEYWORDS)
-        has_environment = any(kw in text for kw in self.ENVIRONMENT_KEYWORDS)
-        has_tech_climate = any(kw in text for kw in self.TECH_CLIMATE_KEYWORDS)
-        has_ai = any(kw in text for kw in self.AI_KEYWORDS)
+        has_climate = 'climate' in hits
+        has_environment = 'environment' in hits
+        has_tech_climate = 'tech_climate' in hits
+        has_ai = 'ai' in hits
         
         if has_climate and is_swedish:
             article.category = NewsCategory.CLIMATE_SWEDEN
@@ -147,16 +273,59 @@ class NewsScraperAgent:
         else:
             article.category = NewsCategory.TECH_GENERAL
         
-        logger.info(f"[SCRAPER] ✅ {article.category.value.upper()} ({article.geographic_region}): {article.title[:60]}")
+        logger.debug(f"[SCRAPER] ✅ {article.category.value.upper()} ({article.geographic_region}): {article.title[:60]}")
         return article
 
 
+def load_relevance_model() -> Optional[RelevanceModel]:
+    """TF-IDF-profilen av tidigare avsnitts artiklar, uppdaterad med nya avsnitt i arkivet"""
+    path = os.getenv('MMM_RELEVANCE_MODEL', 'relevance_model.json').strip()
+    if not path or path.lower() in {'0', 'false', 'no'}:
+        return None
+    try:
+        model = RelevanceModel.load(path)
+        learned = model.sync_with_archive(EpisodeArchive(os.getenv('MMM_EPISODE_ARCHIVE', 'episode_archive.jsonl')))
+        if learned:
+            logger.info(f"[RELEVANCE] Relevansmodellen lärde sig {learned} nya avsnitt")
+        return model
+    except Exception as e:
+        logger.warning(f"[RELEVANCE] Kunde inte ladda relevansmodellen, kör utan: {e}")
+        return None
+
+
 class RelevanceAgent:
     """
     Agent 2: Bedömer relevans mot MMM:s kriterier
-    Ger relevance_score 0-100
+    Ger relevance_score 0-100, plus upp till ``model_weight`` poäng för likhet med
+    artiklar som tidigare avsnitt faktiskt använt (RelevanceModel)
     """
     
+    # Likhet (cosinus) med avsnittsprofilen som ger full bonus; de bästa träffarna ligger runt 0.2
+    MODEL_FULL_SIMILARITY = 0.2
+
+    NUCLEAR_KEYWORDS = ['kärnkraft', 'karnkraft', 'nuclear', 'smr', 'reaktor', 'reactor']
+    NUCLEAR_PROBLEM_KEYWORDS = ['dyr', 'kostnad', 'försening', 'försen', 'slutförvar', 'avfall', 'waste', 'delay', 'overrun']
+
+    _matcher: Optional[KeywordMatcher] = None
+
+    @classmethod
+    def nuclear_matcher(cls) -> KeywordMatcher:
+        if cls._matcher is None:
+            cls._matcher = KeywordMatcher(
+                {'nuclear': cls.NUCLEAR_KEYWORDS, 'nuclear_problem': cls.NUCLEAR_PROBLEM_KEYWORDS},
+                whole_words=['smr'],
+            )
+        return cls._matcher
+
+    def __init__(self, model: Optional[RelevanceModel] = None, model_weight: Optional[float] = None):
+        self.model = model
+        if model_weight is None:
+            try:
+                model_weight = float(os.getenv('MMM_RELEVANCE_MODEL_WEIGHT', '15') or 15)
+            except ValueError:
+                model_weight = 15.0
+        self.model_weight = model_weight
+
     def evaluate(self, article: NewsArticle) -> NewsArticle:
         """Betygsätt relevans för MMM Senaste Nytt"""
         
@@ -189,13 +358,18 @@ class RelevanceAgent:
 
         # Redaktionell linje: undvik att driva kärnkraft som "lösning".
         # Vi tillåter kärnkraftsnyheter, men sänker prioriteten om de inte tydligt handlar om problem/konsekvenser.
-        text = f"{article.title} {article.content}".lower()
-        mentions_nuclear = any(k in text for k in ['kärnkraft', 'karnkraft', 'nuclear', 'smr', 'reaktor', 'reactor'])
-        nuclear_problem_context = any(k in text for k in ['dyr', 'kostnad', 'försening', 'försen', 'slutförvar', 'avfall', 'waste', 'delay', 'overrun'])
+        hits = self.nuclear_matcher().matches(article.matching_text)
+        mentions_nuclear = 'nuclear' in hits
+        nuclear_problem_context = 'nuclear_problem' in hits
         if mentions_nuclear and not nuclear_problem_context:
             article.relevance_score -= 10
+
+        # Likhet med det redaktionen faktiskt valt tidigare
+        if self.model is not None and self.model_weight and self.model.trained:
+            similarity = self.model.score(article.title)
+            article.relevance_score += round(self.model_weight * min(1.0, similarity / self.MODEL_FULL_SIMILARITY), 1)
         
-        logger.info(f"[RELEVANCE] Score {article.relevance_score}: {article.title[:60]}")
+        logger.debug(f"[RELEVANCE] Score {article.relevance_score}: {article.title[:60]}")
         return article
 
 
@@ -213,8 +387,17 @@ class FactCheckAgent:
         (r'100%|hundra procent', r'', 
          "100% påståenden är ofta orealistiska"),
     ]
-    
+
+    _UNREALISTIC_RES = [
+        (re.compile(pattern), re.compile(counter_pattern) if counter_pattern else None, message)
+        for pattern, counter_pattern, message in UNREALISTIC_PATTERNS
+    ]
+
     async def verify(self, article: NewsArticle) -> NewsArticle:
+        """Verifiera fakta och rimlighet (se ``check``; ren CPU, ingen I/O)"""
+        return self.check(article)
+
+    def check(self, article: NewsArticle) -> NewsArticle:
         """Verifiera fakta och rimlighet"""
         text = f"{article.title} {article.content}".lower()
         
@@ -222,8 +405,6 @@ class FactCheckAgent:
         issues = []
         
         # Kolla efter orimliga siffror
-        import re
-        
         # Sudan-specifik check (exempel från dagens problem)
         if 'sudan' in text:
             if 'hundred' in text and 'dead' in text:
@@ -231,9 +412,9 @@ class FactCheckAgent:
                     issues.append("⚠️ Sudan-konflikten: 'Hundratals' döda verkar vara en underskattning. Troligen tusentals.")
         
         # Generella checks
-        for pattern, counter_pattern, message in self.UNREALISTIC_PATTERNS:
-            if re.search(pattern, text):
-                if counter_pattern and not re.search(counter_pattern, text):
+        for pattern, counter_pattern, message in self._UNREALISTIC_RES:
+            if pattern.search(text):
+                if counter_pattern and not counter_pattern.search(text):
                     issues.append(message)
         
         if issues:
@@ -244,7 +425,7 @@ class FactCheckAgent:
                 logger.warning(f"              {issue}")
         else:
             article.fact_check_passed = True
-            logger.info(f"[FACT-CHECK] ✅ {article.title[:60]}")
+            logger.debug(f"[FACT-CHECK] ✅ {article.title[:60]}")
         
         return article
 
@@ -307,6 +488,10 @@ class NewsQualityAgent:
         r'naturskydd.*beslut|nationalpark|artutrotning|biodiversitet.*kris',  # Naturvård
         r'väder.*extrem.*öka|torka.*värre|översvämning.*klimat',  # Klimateffekter
     ]
+
+    # Kompileras en gång; klimatmönstren slås ihop till ett regex eftersom bara "någon träff" spelar roll
+    _FALSE_POSITIVE_RES = [(re.compile(pattern), reason) for pattern, reason in FALSE_POSITIVE_PATTERNS]
+    _TRUE_CLIMATE_RE = re.compile('|'.join(f'(?:{pattern})' for pattern in TRUE_CLIMATE_PATTERNS))
     
     def evaluate_quality(self, article: NewsArticle) -> tuple[bool, str]:
         """
@@ -330,9 +515,8 @@ class NewsQualityAgent:
             return (True, "Korrekt kategoriserad som irrelevant")
         
         # Kolla efter false positives
-        for pattern, reason in self.FALSE_POSITIVE_PATTERNS:
-            import re
-            if re.search(pattern, text):
+        for pattern, reason in self._FALSE_POSITIVE_RES:
+            if pattern.search(text):
                 return (False, reason)
         
         # Om kategoriserad som klimat, verifiera att det VERKLIGEN är klimat
@@ -341,8 +525,7 @@ class NewsQualityAgent:
                              'climate_sweden', 'climate_global', 'environment_sweden', 'environment_global']
         if category in climate_categories:
             # Kräv minst ETT true climate pattern
-            import re
-            has_true_climate = any(re.search(pattern, text) for pattern in self.TRUE_CLIMATE_PATTERNS)
+            has_true_climate = self._TRUE_CLIMATE_RE.search(text) is not None
             
             if not has_true_climate:
                 # Om inget true climate pattern hittades, kräv svensk relevans eller forskning
@@ -438,19 +621,104 @@ class BalanceAgent:
         return selected[:target_count]
 
 
+def _new_curation_stats() -> Dict[str, Any]:
+    return {'total': 0, 'irrelevant': 0, 'fact_check_failed': 0, 'quality_rejected': 0, 'passed': 0, 'reasons': {}}
+
+
+def _merge_curation_stats(into: Dict[str, Any], other: Dict[str, Any]) -> None:
+    for key, value in other.items():
+        if key == 'reasons':
+            for reason, count in value.items():
+                into['reasons'][reason] = into['reasons'].get(reason, 0) + count
+        else:
+            into[key] += value
+
+
+def _curate_batch(raw_articles: List[Dict]) -> Tuple[List[NewsArticle], Dict[str, Any]]:
+    """Kör en batch genom agenterna i en separat process (se NewsOrchestrator.curate)"""
+    return NewsOrchestrator(workers=0).curate(raw_articles)
+
+
 class NewsOrchestrator:
     """
     HUVUDORCHESTRATOR
     Koordinerar alla agenter och fattar slutgiltiga beslut
+
+    Varje artikel går hela vägen genom kategorisering → relevans → faktakontroll →
+    kvalitet innan nästa tas, och stannar vid första agent som underkänner den.
+    Balanseringen tar bara emot artiklar som klarat alla steg. Med
+    ``MMM_CURATION_WORKERS`` > 1 delas stora urval upp på en processpool.
     """
-    
-    def __init__(self):
+
+    # Under så här många artiklar kostar processpoolen mer än den sparar
+    PARALLEL_MIN_ARTICLES = 400
+
+    def __init__(self, workers: Optional[int] = None):
         self.scraper = NewsScraperAgent()
-        self.relevance = RelevanceAgent()
+        self.relevance = RelevanceAgent(model=load_relevance_model())
         self.fact_checker = FactCheckAgent()
         self.quality = NewsQualityAgent()
         self.balance = BalanceAgent()
-    
+        if workers is None:
+            try:
+                workers = int(os.getenv('MMM_CURATION_WORKERS', '0') or 0)
+            except ValueError:
+                workers = 0
+        self.workers = max(0, workers)
+
+    def curate(self, raw_articles: List[Dict]) -> Tuple[List[NewsArticle], Dict[str, Any]]:
+        """Kategorisera, betygsätt, faktakontrollera och kvalitetsgranska artikel för artikel.
+
+        Returnerar artiklarna som klarat alla steg (i ursprunglig ordning) och räknare per steg.
+        """
+        stats = _new_curation_stats()
+        passed: List[NewsArticle] = []
+        for raw in raw_articles:
+            stats['total'] += 1
+            article = NewsArticle(
+                source=raw.get('source', ''),
+                title=raw.get('title', ''),
+                content=raw.get('content', ''),
+                link=raw.get('link', ''),
+                alternates=list(raw.get('alternates') or []),
+            )
+
+            self.scraper.categorize(article)
+            if article.category == NewsCategory.IRRELEVANT:
+                stats['irrelevant'] += 1
+                continue
+
+            self.relevance.evaluate(article)
+
+            self.fact_checker.check(article)
+            if not article.fact_check_passed:
+                stats['fact_check_failed'] += 1
+                continue
+
+            is_quality, reason = self.quality.evaluate_quality(article)
+            if not is_quality:
+                stats['quality_rejected'] += 1
+                stats['reasons'][reason] = stats['reasons'].get(reason, 0) + 1
+                logger.debug(f"[QUALITY] ❌ {article.title[:60]} ({reason})")
+                continue
+
+            passed.append(article)
+        stats['passed'] = len(passed)
+        return passed, stats
+
+    async def _curate_parallel(self, raw_articles: List[Dict]) -> Tuple[List[NewsArticle], Dict[str, Any]]:
+        batch_size = max(50, -(-len(raw_articles) // (self.workers * 4)))
+        batches = [raw_articles[i:i + batch_size] for i in range(0, len(raw_articles), batch_size)]
+        loop = asyncio.get_running_loop()
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            results = await asyncio.gather(*(loop.run_in_executor(pool, _curate_batch, batch) for batch in batches))
+        passed: List[NewsArticle] = []
+        stats = _new_curation_stats()
+        for batch_passed, batch_stats in results:
+            passed.extend(batch_passed)
+            _merge_curation_stats(stats, batch_stats)
+        return passed, stats
+
     async def process_articles(self, raw_articles: List[Dict]) -> List[NewsArticle]:
         """
         Huvudprocess: Kör alla artiklar genom agent-pipeline
@@ -458,47 +726,34 @@ class NewsOrchestrator:
         logger.info(f"\n{'='*60}")
         logger.info(f"🎯 ORCHESTRATOR: Startar bearbetning av {len(raw_articles)} artiklar")
         logger.info(f"{'='*60}\n")
-        
-        # Konvertera till NewsArticle-objekt
-        articles = [
-            NewsArticle(
-                source=a.get('source', ''),
-                title=a.get('title', ''),
-                content=a.get('content', ''),
-                link=a.get('link', '')
-            )
-            for a in raw_articles
-        ]
-        
-        # Steg 1: Kategorisering
-        logger.info("\n📋 STEG 1: KATEGORISERING")
-        logger.info("-" * 60)
-        articles = [self.scraper.categorize(a) for a in articles]
-        
-        # Steg 2: Relevansbedömning
-        logger.info("\n⭐ STEG 2: RELEVANSBEDÖMNING")
-        logger.info("-" * 60)
-        articles = [self.relevance.evaluate(a) for a in articles]
-        
-        # Steg 3: Faktakontroll
-        logger.info("\n🔍 STEG 3: FAKTAKONTROLL")
-        logger.info("-" * 60)
-        articles = await asyncio.gather(*[self.fact_checker.verify(a) for a in articles])
-        
-        # Steg 4: Kvalitetsgranskning (NY!)
-        logger.info("\n🎯 STEG 4: KVALITETSGRANSKNING")
-        logger.info("-" * 60)
-        quality_filtered = []
-        for article in articles:
-            is_quality, reason = self.quality.evaluate_quality(article)
-            if is_quality:
-                quality_filtered.append(article)
-                logger.info(f"[QUALITY] ✅ {article.title[:60]}")
-            else:
-                logger.warning(f"[QUALITY] ❌ {article.title[:60]}")
-                logger.warning(f"           Reason: {reason}")
-        articles = quality_filtered
-        
+
+        # Dagens kandidater räknas in i relevansmodellens IDF (sparas innan ev. processpool läser den)
+        if self.relevance.model is not None:
+            try:
+                self.relevance.model.observe(a.get('title', '') for a in raw_articles)
+                self.relevance.model.save()
+            except Exception as e:
+                logger.warning(f"[RELEVANCE] Kunde inte spara relevansmodellen: {e}")
+
+        # Steg 1-4: Kategorisering, relevans, faktakontroll och kvalitetsgranskning per artikel
+        articles: Optional[List[NewsArticle]] = None
+        if self.workers > 1 and len(raw_articles) >= self.PARALLEL_MIN_ARTICLES:
+            try:
+                articles, stats = await self._curate_parallel(raw_articles)
+                logger.info(f"[ORCHESTRATOR] Bearbetade i {self.workers} processer")
+            except Exception as e:
+                logger.warning(f"[ORCHESTRATOR] Processpoolen misslyckades, kör i en process: {e}")
+        if articles is None:
+            articles, stats = self.curate(raw_articles)
+
+        logger.info(
+            f"[ORCHESTRATOR] {stats['total']} in → {stats['irrelevant']} irrelevanta, "
+            f"{stats['fact_check_failed']} fact-check failed, {stats['quality_rejected']} underkända i kvalitetsgranskning, "
+            f"{stats['passed']} kvar"
+        )
+        for reason, count in sorted(stats['reasons'].items(), key=lambda kv: kv[1], reverse=True):
+            logger.info(f"[QUALITY] ❌ {count} st: {reason}")
+
         # Steg 5: Balansering
         logger.info("\n⚖️  STEG 5: BALANSERING")
         logger.info("-" * 60)
@@ -508,9 +763,9 @@ class NewsOrchestrator:
         logger.info(f"\n{'='*60}")
         logger.info(f"✅ ORCHESTRATOR: Slutresultat")
         logger.info(f"{'='*60}")
-        logger.info(f"Totalt bearbetade: {len(articles)}")
-        logger.info(f"Irrelevanta: {len([a for a in articles if a.category == NewsCategory.IRRELEVANT])}")
-        logger.info(f"Fact-check failed: {len([a for a in articles if not a.fact_check_passed and a.category != NewsCategory.IRRELEVANT])}")
+        logger.info(f"Totalt bearbetade: {stats['total']}")
+        logger.info(f"Irrelevanta: {stats['irrelevant']}")
+        logger.info(f"Fact-check failed: {stats['fact_check_failed']}")
         logger.info(f"Valda för podcast: {len(selected)}")
         
         logger.info(f"\n📊 FÖRDELNING AV VALDA:")
@@ -6,26 +6,17 @@ Integrerar multi-agent systemet i run_podcast_complete.py
 
 import json
 import logging
-from typing import List, Dict
+from typing import Dict, List, Union
 from news_agent_system import NewsOrchestrator, NewsArticle
 import asyncio
 
 logger = logging.getLogger(__name__)
 
 
-async def curate_news_with_agents(scraped_content_path: str = 'scraped_content.json') -> List[Dict]:
-    """
-    Använd agent-systemet för att kurera nyheter
-    Returnerar lista av valda artiklar i format kompatibelt med run_podcast_complete.py
-    """
-    
-    # Läs in scrapade artiklar
-    with open(scraped_content_path, 'r', encoding='utf-8') as f:
-        scraped_data = json.load(f)
-    
-    # Konvertera till flat lista av artiklar
+def scraped_to_raw_articles(scraped_data: List[Dict]) -> List[Dict]:
+    """Platta ut scraperns källgrupper till artiklar för agent-systemet"""
     raw_articles = []
-    for source_group in scraped_data:
+    for source_group in scraped_data or []:
         source_name = source_group.get('source', 'Okänd')
         items = source_group.get('items', [])
         
@@ -36,10 +27,21 @@ async def curate_news_with_agents(scraped_content_path: str = 'scraped_content.j
                 'source': source_name,
                 'title': item.get('title', ''),
                 'content': item_content or item_summary,
-                'link': item.get('link', '')
+                'link': item.get('link', ''),
+                'alternates': item.get('alternates') or [],
             })
+    return raw_articles
+
+
+async def curate_scraped_data(scraped_data: List[Dict]) -> List[Dict]:
+    """
+    Kurera nyheter direkt från scraperns resultat (samma lista som skrivs till scraped_content.json).
+    Körs i den event loop som redan är igång; ingen fil läses.
+    Returnerar lista av valda artiklar i format kompatibelt med run_podcast_complete.py
+    """
+    raw_articles = scraped_to_raw_articles(scraped_data)
     
-    logger.info(f"[AGENT-CURATION] Bearbetar {len(raw_articles)} artiklar från {len(scraped_data)} källor")
+    logger.info(f"[AGENT-CURATION] Bearbetar {len(raw_articles)} artiklar från {len(scraped_data or [])} källor")
     
     # Kör genom agent-systemet
     orchestrator = NewsOrchestrator()
@@ -55,7 +57,8 @@ async def curate_news_with_agents(scraped_content_path: str = 'scraped_content.j
             'link': article.link,
             'category': article.category.value if article.category else 'unknown',
             'relevance_score': article.relevance_score,
-            'geographic_region': article.geographic_region
+            'geographic_region': article.geographic_region,
+            'alternates': article.alternates,
         })
     
     logger.info(f"[AGENT-CURATION] ✅ Valde {len(result)} artiklar för podcast")
@@ -63,9 +66,20 @@ async def curate_news_with_agents(scraped_content_path: str = 'scraped_content.j
     return result
 
 
-def curate_news_sync(scraped_content_path: str = 'scraped_content.json') -> List[Dict]:
-    """Synkron wrapper för async curate_news_with_agents"""
-    return asyncio.run(curate_news_with_agents(scraped_content_path))
+async def curate_news_with_agents(scraped_content_path: str = 'scraped_content.json') -> List[Dict]:
+    """
+    Använd agent-systemet för att kurera nyheter från en sparad scraped_content.json
+    """
+    with open(scraped_content_path, 'r', encoding='utf-8') as f:
+        scraped_data = json.load(f)
+    return await curate_scraped_data(scraped_data)
+
+
+def curate_news_sync(scraped: Union[str, List[Dict]] = 'scraped_content.json') -> List[Dict]:
+    """Synkron wrapper: tar antingen scraperns resultat direkt eller en sökväg till scraped_content.json"""
+    if isinstance(scraped, str):
+        return asyncio.run(curate_news_with_agents(scraped))
+    return asyncio.run(curate_scraped_data(scraped))
 
 
 if __name__ == "__main__":
@@ -13,13 +13,23 @@ import logging
 from datetime import datetime, timedelta
 import re
 from typing import Dict, List, Tuple, Optional
-import openai
 from dataclasses import dataclass
 
+from src.llm_cache import acached_llm_call
+from src.llm_client import default_llm_client
+
 # Konfigurera logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+
+def _is_json_object(text: str) -> bool:
+    try:
+        return isinstance(json.loads(text), dict)
+    except (TypeError, ValueError):
+        return False
+
+
 @dataclass
 class FactCheckResult:
     """Resultat från faktakontroll"""
@@ -49,19 +59,17 @@ class NewsFactChecker:
                 config = json.load(f)
             
             # Använd OpenRouter API som huvudsystemet
-            api_key = config.get('openrouter_api_key')
-            if api_key:
-                self.openai_client = openai.OpenAI(
-                    base_url="https://openrouter.ai/api/v1",
-                    api_key=api_key
-                )
+            self.api_key = config.get('openrouter_api_key')
+            if self.api_key:
+                self.llm_client = default_llm_client()
                 logger.info("[FACT-CHECK] OpenRouter API konfigurerad för faktakontroll")
             else:
                 logger.error("OpenRouter API-nyckel saknas i sources.json")
-                self.openai_client = None
+                self.llm_client = None
         except Exception as e:
             logger.error(f"Kunde inte ladda konfiguration: {e}")
-            self.openai_client = None
+            self.api_key = None
+            self.llm_client = None
         
         # Kritiska kategorier som MÅSTE verifieras
         self.critical_patterns = {
@@ -128,6 +136,12 @@ class NewsFactChecker:
 
     def verify_fact_with_ai(self, fact: Dict) -> FactCheckResult:
         """Använder AI för att verifiera ett specifikt faktum"""
+        if not self.llm_client:
+            return self._verification_failed(Exception("OpenAI-klient inte tillgänglig"))
+        return self.llm_client.gather([self.averify_fact_with_ai(fact)])[0]
+
+    async def averify_fact_with_ai(self, fact: Dict) -> FactCheckResult:
+        """Async verify_fact_with_ai; flera fakta kan kontrolleras samtidigt"""
         
         verification_prompt = f"""
         Du är en KRITISK faktakontroll-agent för svenska nyheter. Din uppgift är att identifiera POTENTIELLT FELAKTIG information.
@@ -160,16 +174,24 @@ class NewsFactChecker:
         """
 
         try:
-            if not self.openai_client:
+            if not self.llm_client:
                 raise Exception("OpenAI-klient inte tillgänglig")
                 
-            response = self.openai_client.chat.completions.create(
-                model="gpt-4",
-                messages=[{"role": "user", "content": verification_prompt}],
-                temperature=0.1  # Låg temperatur för konsistens
+            messages = [{"role": "user", "content": verification_prompt}]
+
+            def _verify():
+                return self.llm_client.acomplete(
+                    "openrouter",
+                    "gpt-4",
+                    messages,
+                    temperature=0.1,  # Låg temperatur för konsistens
+                    api_key=self.api_key,
+                )
+
+            # Spara bara svar som går att tolka, annars fastnar ett trasigt svar i cachen
+            result_text = await acached_llm_call(
+                "openrouter", "gpt-4", messages, 0.1, None, _verify, accept=_is_json_object
             )
-            
-            result_text = response.choices[0].message.content
             result_data = json.loads(result_text)
             
             return FactCheckResult(
@@ -182,16 +204,19 @@ class NewsFactChecker:
             )
             
         except Exception as e:
-            logger.error(f"Fel vid faktakontroll: {e}")
-            # Vid fel, markera som potentiellt problematisk för säkerhets skull
-            return FactCheckResult(
-                is_accurate=False,
-                confidence_score=0.0,
-                issues_found=[f"Kunde inte verifiera pga tekniskt fel: {e}"],
-                corrections=["Manuell kontroll krävs"],
-                sources_checked=[],
-                verification_date=datetime.now()
-            )
+            return self._verification_failed(e)
+
+    def _verification_failed(self, e: Exception) -> FactCheckResult:
+        logger.error(f"Fel vid faktakontroll: {e}")
+        # Vid fel, markera som potentiellt problematisk för säkerhets skull
+        return FactCheckResult(
+            is_accurate=False,
+            confidence_score=0.0,
+            issues_found=[f"Kunde inte verifiera pga tekniskt fel: {e}"],
+            corrections=["Manuell kontroll krävs"],
+            sources_checked=[],
+            verification_date=datetime.now()
+        )
 
     def check_podcast_script(self, script_text: str) -> Dict:
         """Huvudfunktion: Kontrollerar hela podcast-manuset"""
@@ -204,9 +229,16 @@ class NewsFactChecker:
         verification_results = []
         critical_issues = []
         
-        for fact in facts_to_check:
-            logger.info(f"[FACT-CHECK] Kontrollerar: {fact['entity']}")
-            result = self.verify_fact_with_ai(fact)
+        # Fakta verifieras oberoende av varandra, så anropen körs parallellt
+        if facts_to_check and self.llm_client:
+            results = self.llm_client.gather([self.averify_fact_with_ai(fact) for fact in facts_to_check])
+        else:
+            results = [self.verify_fact_with_ai(fact) for fact in facts_to_check]
+
+        for fact, result in zip(facts_to_check, results):
+            logger.info(f"[FACT-CHECK] Kontrollerat: {fact['entity']}")
+            if isinstance(result, Exception):
+                result = self._verification_failed(result)
             verification_results.append(result)
             
             if not result.is_accurate or result.confidence_score < 0.7:
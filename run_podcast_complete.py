@@ -12,8 +12,9 @@ import shutil
 import requests
 import re
 import html
+import contextlib
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from dotenv import load_dotenv
 
 # Lägg till modules
@@ -54,6 +55,11 @@ except ImportError as e:
 # Ladda miljövariabler
 load_dotenv()
 sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+from src.news_dedupe import DedupeService, article_keys, public_fields
+from src.episode_archive import EpisodeArchive, TitleIndex
+from src.llm_cache import cached_llm_call
+from src.llm_client import LLMError, default_llm_client
+from src.prompt_budget import ArticlePromptBuilder
 
 # Konfigurera logging
 logging.basicConfig(
@@ -91,14 +97,6 @@ SWEDISH_MONTHS = {
     12: 'december'
 }
 
-# Stopwords för enkel titel-fingerprinting (för att undvika dagliga upprepningar)
-_TITLE_STOPWORDS = {
-    'och', 'eller', 'men', 'att', 'som', 'det', 'den', 'detta', 'dessa', 'en', 'ett', 'i', 'på', 'av', 'till',
-    'för', 'med', 'utan', 'över', 'under', 'efter', 'före', 'om', 'när', 'där', 'här', 'från', 'mot',
-    'säger', 'sa', 'uppger', 'enligt', 'nya', 'ny', 'nu', 'idag', 'igår', 'imorgon',
-    'the', 'a', 'an', 'and', 'or', 'but', 'to', 'of', 'in', 'on', 'for', 'with', 'from', 'by', 'as', 'at',
-}
-
 _PROMOTIONAL_TITLE_PATTERNS = (
     r'\bsave up to\b',
     r'\bdays? left\b',
@@ -216,6 +214,11 @@ _SPOKEN_URL_PATTERNS = (
     ),
 )
 
+# Referenced articles of all episodes, one line per episode
+EPISODE_ARCHIVE_FILE = os.getenv('MMM_EPISODE_ARCHIVE', 'episode_archive.jsonl')
+# Samma temperatur för alla providers (ingår i LLM-cachens nyckel)
+LLM_TEMPERATURE = 0.7
+
 # Diagnostics
 DIAGNOSTICS_FILE = os.getenv('MMM_DIAGNOSTICS_FILE', 'diagnostics.jsonl')
 _CURRENT_RUN_ID: Optional[str] = None
@@ -437,40 +440,6 @@ def _set_last_gemini_error(message: Optional[str]) -> None:
     _LAST_GEMINI_ERROR = message
 
 
-def _canonicalize_url(url: str) -> str:
-    """Skapa stabil URL-nyckel som inte påverkas av tracking-parametrar."""
-    if not url:
-        return ""
-    try:
-        from urllib.parse import urlparse, urlunparse, parse_qsl, urlencode
-
-        parsed = urlparse(url.strip())
-        query_pairs = [(k, v) for k, v in parse_qsl(parsed.query, keep_blank_values=True)
-                       if not k.lower().startswith('utm_') and k.lower() not in {'fbclid', 'gclid'}]
-        cleaned = parsed._replace(query=urlencode(query_pairs, doseq=True), fragment="")
-
-        # Normalisera bort trailing slash
-        normalized = urlunparse(cleaned).rstrip('/')
-        return normalized
-    except Exception:
-        return url.strip().rstrip('/')
-
-
-def _title_fingerprint(title: str) -> str:
-    """Skapa en grov "fingerprint" av en titel för dedupe mellan dagar."""
-    if not title:
-        return ""
-    text = title.lower()
-    text = re.sub(r'[^\w\såäöÅÄÖ-]', ' ', text)
-    text = re.sub(r'\s+', ' ', text).strip()
-    tokens = [t for t in text.split(' ') if len(t) >= 4 and t not in _TITLE_STOPWORDS and not t.isdigit()]
-    if not tokens:
-        return ""
-    # Sortera och ta en begränsad mängd token för stabilitet
-    tokens = sorted(set(tokens))
-    return ' '.join(tokens[:12])
-
-
 def _is_follow_up_article(title: str, content: str) -> bool:
     """Heuristik: uppföljningar är okej, men daglig repetition ska bort."""
     text = f"{title} {content}".lower()
@@ -490,44 +459,29 @@ def _format_swedish_date(dt: datetime) -> str:
 
 
 def _load_recent_episode_articles(within_days: int, today: datetime) -> List[Dict[str, Any]]:
-    """Load recent episode_articles_*.json entries.
+    """Load articles from episodes of the last ``within_days`` days (episode_archive.jsonl).
 
     Returns a flat list of dicts:
-    { 'date': datetime, 'source': str, 'title': str, 'link': str, 'content': str }
+    { 'date': datetime, 'source': str, 'title': str, 'link': str }
     """
     try:
-        import glob
-
         cutoff_date = (today - timedelta(days=within_days)).date()
-        results: List[Dict[str, Any]] = []
-        for article_file in glob.glob('episode_articles_*.json'):
-            try:
-                # episode_articles_20251014_190405.json
-                date_part = article_file.split('_')[2]
-                file_date = datetime.strptime(date_part, '%Y%m%d').date()
-                if file_date < cutoff_date:
-                    continue
-            except Exception:
-                continue
-
-            try:
-                with open(article_file, 'r', encoding='utf-8') as f:
-                    prev_articles = json.load(f) or []
-                for a in prev_articles:
-                    results.append({
-                        'date': datetime.combine(file_date, datetime.min.time()),
-                        'source': (a.get('source') or '').strip(),
-                        'title': (a.get('title') or '').strip(),
-                        'link': (a.get('link') or '').strip(),
-                        'content': (a.get('content') or '').strip(),
-                    })
-            except Exception as e:
-                logger.warning(f"[HISTORY] Kunde inte läsa {article_file}: {e}")
-        return results
-    except Exception:
+        return EpisodeArchive(EPISODE_ARCHIVE_FILE).query(since=cutoff_date)
+    except Exception as e:
+        logger.warning(f"[HISTORY] Kunde inte läsa avsnittsarkivet {EPISODE_ARCHIVE_FILE}: {e}")
         return []
 
 
+def _load_recent_title_index(within_days: int, today: datetime) -> Optional[TitleIndex]:
+    """The archive's persisted title-token index, narrowed to the last ``within_days`` days."""
+    try:
+        cutoff_date = (today - timedelta(days=within_days)).date()
+        return EpisodeArchive(EPISODE_ARCHIVE_FILE).title_index().window(since=cutoff_date)
+    except Exception as e:
+        logger.warning(f"[MEMORY] Kunde inte läsa titelindexet för avsnittsarkivet: {e}")
+        return None
+
+
 def _build_previous_coverage_hints(
     current_articles: List[Dict[str, Any]],
     recent_episode_articles: List[Dict[str, Any]],
@@ -539,11 +493,16 @@ def _build_previous_coverage_hints(
     min_anchor_token_len: int = 7,
     debug: bool = False,
     debug_max_samples: int = 6,
+    title_index: Optional[TitleIndex] = None,
 ) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
     """Find conservative "topic" matches between today's curated articles and recent episode archives.
 
     Goal: enable safe callbacks like "senast vi var inne på ämnet".
     We only emit hints when we have high confidence (rare anchor token overlap + similarity).
+
+    Only archive items sharing an anchor token are compared, looked up in
+    ``title_index`` (the archive's persisted index, narrowed to the recent
+    window); without it an in-memory index over ``recent_episode_articles`` is built.
     """
     debug_info: Dict[str, Any] = {
         'current_considered': 0,
@@ -565,11 +524,13 @@ def _build_previous_coverage_hints(
         'samples': [],
     }
 
-    if not current_articles or not recent_episode_articles:
+    if title_index is None:
+        title_index = TitleIndex.build(recent_episode_articles or [])
+    if not current_articles or not len(title_index):
         return [], debug_info
 
-    def _token_set_from_title(title: str) -> set:
-        fp = _title_fingerprint(title)
+    def _token_set(article: Dict[str, Any]) -> set:
+        fp = article_keys(article)[1]
         return set(fp.split(' ')) if fp else set()
 
     def _jaccard(a: set, b: set) -> float:
@@ -579,18 +540,7 @@ def _build_previous_coverage_hints(
         union = len(a | b)
         return (inter / union) if union else 0.0
 
-    # Precompute token sets for recent items + token frequency for "rarity".
-    recent: List[Tuple[Dict[str, Any], set]] = []
-    token_freq: Dict[str, int] = {}
-    for r in recent_episode_articles:
-        tset = _token_set_from_title(r.get('title', ''))
-        if not tset:
-            continue
-        recent.append((r, tset))
-        for t in tset:
-            token_freq[t] = token_freq.get(t, 0) + 1
-
-    debug_info['recent_items'] = len(recent)
+    debug_info['recent_items'] = len(title_index)
 
     hints: List[Dict[str, Any]] = []
     used_prev_keys: set = set()
@@ -601,23 +551,26 @@ def _build_previous_coverage_hints(
         cur_link = (cur.get('link') or '').strip()
         cur_source = (cur.get('source') or '').strip()
 
-        cur_tokens = _token_set_from_title(cur_title)
+        cur_tokens = _token_set(cur)
         if not cur_tokens:
             debug_info['reasons']['no_title_tokens'] += 1
             continue
 
-        cur_url_key = _canonicalize_url(cur_link)
-        cur_fp = _title_fingerprint(cur_title)
+        cur_url_key, cur_fp = article_keys(cur)
 
         # Identify "anchor" tokens that are rare in the recent archive.
         cur_informative = {
             t for t in cur_tokens
-            if token_freq.get(t, 0) <= informative_max_freq and len(t) >= min_anchor_token_len
+            if len(t) >= min_anchor_token_len and title_index.frequency(t) <= informative_max_freq
         }
         if not cur_informative:
             debug_info['reasons']['no_anchor_tokens'] += 1
             continue
 
+        # Items without a shared anchor token could never match; they are not compared at all.
+        candidate_ids = title_index.candidates(cur_informative)
+        debug_info['reasons']['no_anchor_overlap'] += len(title_index) - len(candidate_ids)
+
         best = None
         best_score = 0.0
         best_date = None
@@ -628,22 +581,22 @@ def _build_previous_coverage_hints(
         best_any_prev_source = ""
         best_any_prev_date = None
 
-        for prev, prev_tokens in recent:
-            prev_title = (prev.get('title') or '').strip()
-            prev_link = (prev.get('link') or '').strip()
-
+        for prev_id in candidate_ids:
+            prev = title_index.article(prev_id)
+            prev_tokens = title_index.tokens(prev_id)
             debug_info['evaluated_pairs'] += 1
 
             # Avoid identical items (dedupe already tries, but keep this strict)
-            if cur_url_key and cur_url_key == _canonicalize_url(prev_link):
+            prev_url_key, prev_fp = article_keys(prev)
+            if cur_url_key and cur_url_key == prev_url_key:
                 debug_info['reasons']['identical_url'] += 1
                 continue
-            if cur_fp and cur_fp == _title_fingerprint(prev_title):
+            if cur_fp and cur_fp == prev_fp:
                 debug_info['reasons']['identical_title_fp'] += 1
                 continue
 
             # Avoid mentioning the same historical item multiple times
-            prev_key = _canonicalize_url(prev_link) or _title_fingerprint(prev_title)
+            prev_key = prev_url_key or prev_fp
             if prev_key and prev_key in used_prev_keys:
                 debug_info['reasons']['prev_already_used'] += 1
                 continue
@@ -663,9 +616,6 @@ def _build_previous_coverage_hints(
                 continue
 
             overlap_info = len(cur_informative & prev_tokens)
-            if overlap_info < 1:
-                debug_info['reasons']['no_anchor_overlap'] += 1
-                continue
 
             score = _jaccard(cur_tokens, prev_tokens)
 
@@ -732,7 +682,8 @@ def _build_previous_coverage_hints(
                 'score': round(best_score, 3),
             })
 
-            prev_key = _canonicalize_url(prev_link) or _title_fingerprint(prev_title)
+            prev_url_key, prev_fp = article_keys(best)
+            prev_key = prev_url_key or prev_fp
             if prev_key:
                 used_prev_keys.add(prev_key)
 
@@ -779,9 +730,8 @@ def extract_referenced_articles(podcast_content: str, candidate_articles: List[D
 
     scored: List[tuple[int, Dict]] = []
     for article in candidate_articles:
-        title = (article.get('title') or '').strip()
         source = (article.get('source') or '').strip()
-        fp = _title_fingerprint(title)
+        fp = article_keys(article)[1]
         if not fp:
             continue
 
@@ -863,170 +813,219 @@ def _normalize_gemini_model(model: str) -> str:
     return raw.split('/', 1)[1] if '/' in raw else raw
 
 
-def _get_gemini_direct_response(messages: List[Dict], model: str) -> str:
-    """Skicka förfrågan direkt till Gemini API (utan OpenRouter)."""
-    api_key = os.getenv('GEMINI_API_KEY', '').strip()
-    if not api_key:
-        raise ValueError("GEMINI_API_KEY saknas i miljövariabler")
-
-    gemini_model = _normalize_gemini_model(model)
-    url = f"https://generativelanguage.googleapis.com/v1beta/models/{gemini_model}:generateContent"
-
+def _llm_max_tokens() -> int:
     max_tokens_env = os.getenv('MMM_MAX_TOKENS', '').strip()
     try:
-        max_tokens = int(max_tokens_env) if max_tokens_env else 2200
+        return int(max_tokens_env) if max_tokens_env else 2200
     except ValueError:
-        max_tokens = 2200
-
-    system_lines: List[str] = []
-    contents: List[Dict[str, Any]] = []
-    for msg in messages or []:
-        role = (msg.get('role') or 'user').strip().lower()
-        text = (msg.get('content') or '').strip()
-        if not text:
-            continue
-        if role == 'system':
-            system_lines.append(text)
-            continue
-        gemini_role = 'model' if role == 'assistant' else 'user'
-        contents.append({
-            'role': gemini_role,
-            'parts': [{'text': text}],
-        })
+        return 2200
 
-    if not contents:
-        raise ValueError("Inga giltiga messages för Gemini-anrop")
 
-    payload: Dict[str, Any] = {
-        'contents': contents,
-        'generationConfig': {
-            'temperature': 0.7,
-            'maxOutputTokens': max_tokens,
-        }
-    }
-    if system_lines:
-        payload['systemInstruction'] = {
-            'parts': [{'text': "\n\n".join(system_lines)}]
-        }
+def _resolve_llm_target(model: str, provider: str) -> Tuple[str, str]:
+    """(provider, modell) som anropet faktiskt går till, givet vilka API-nycklar som finns."""
+    if provider == 'gemini':
+        # Direkt mot Gemini API (utan OpenRouter)
+        if not os.getenv('GEMINI_API_KEY', '').strip():
+            raise ValueError("GEMINI_API_KEY saknas i miljövariabler")
+        return 'gemini', _normalize_gemini_model(model)
+
+    # OpenRouter-modellnamn kan vara t.ex. "openai/gpt-4o-mini".
+    # För OpenAI vill vi oftast ha "gpt-4o-mini".
+    default_openai_model = model.split('/', 1)[1] if '/' in model else model
+    openai_model = os.getenv('OPENAI_MODEL', '').strip() or default_openai_model
+
+    if provider == 'openai':
+        if not os.getenv('OPENAI_API_KEY'):
+            raise ValueError("OPENAI_API_KEY saknas i miljövariabler")
+        return 'openai', openai_model
 
+    # Default: OpenRouter (med fallback till OpenAI om OpenRouter-nyckel saknas)
+    if os.getenv('OPENROUTER_API_KEY'):
+        return 'openrouter', model
+    if os.getenv('OPENAI_API_KEY'):
+        return 'openai', openai_model
+    raise ValueError("OPENROUTER_API_KEY saknas i miljövariabler (och OPENAI_API_KEY saknas också)")
+
+
+def get_openrouter_response(
+    messages: List[Dict],
+    model: str = "google/gemini-2.5-flash",
+    provider: str = "openrouter",
+    use_cache: bool = True,
+    max_tokens: Optional[int] = None,
+) -> str:
+    """Skicka förfrågan till vald LLM-provider (gemini/openrouter/openai).
+
+    Svar sparas i LLM-cachen (llm_cache.sqlite3) per provider och modell som anropet
+    faktiskt går till (se _resolve_llm_target), meddelanden, temperatur och max_tokens, så att en omkörning (t.ex. efter ett TTS-fel) inte
+    betalar för samma anrop igen. ``use_cache=False`` eller MMM_LLM_CACHE_BYPASS=1
+    hämtar ett nytt svar. ``max_tokens`` ersätter MMM_MAX_TOKENS för just detta anrop.
+    """
+    provider = (provider or 'openrouter').strip().lower()
+    max_tokens = max_tokens or _llm_max_tokens()
+    target_provider, target_model = _resolve_llm_target(model, provider)
+    return cached_llm_call(
+        target_provider,
+        target_model,
+        messages,
+        LLM_TEMPERATURE,
+        max_tokens,
+        lambda: _get_llm_response_uncached(messages, target_provider, target_model, max_tokens),
+        use_cache=use_cache,
+    )
+
+
+def _get_llm_response_uncached(
+    messages: List[Dict], target_provider: str, target_model: str, max_tokens: int
+) -> str:
     try:
-        response = requests.post(
-            url,
-            params={'key': api_key},
-            json=payload,
-            timeout=90,
+        return default_llm_client().complete(
+            target_provider,
+            target_model,
+            messages,
+            temperature=LLM_TEMPERATURE,
+            max_tokens=max_tokens,
         )
-        response.raise_for_status()
-        result = response.json()
-
-        candidates = result.get('candidates') or []
-        if not candidates:
-            raise RuntimeError("Gemini svar saknar candidates")
-        parts = (candidates[0].get('content') or {}).get('parts') or []
-        text = ''.join((p.get('text') or '') for p in parts).strip()
-        if not text:
-            raise RuntimeError("Gemini svar saknar text")
-        return text
-    except requests.RequestException as e:
-        logger.error(f"[ERROR] Gemini API error: {e}")
+    except LLMError as e:
+        logger.error(f"[ERROR] {target_provider} API error: {e}")
         raise
 
 
-def get_openrouter_response(messages: List[Dict], model: str = "google/gemini-2.5-flash", provider: str = "openrouter") -> str:
-    """Skicka förfrågan till vald LLM-provider (gemini/openrouter/openai)."""
-    provider = (provider or 'openrouter').strip().lower()
+# Repliker som börjar så avrundar avsnittet (matchas bara i början av en replik)
+_SIGN_OFF_MARKERS = ('tack för att du lyssnade', 'tack för idag')
 
-    if provider == 'gemini':
-        return _get_gemini_direct_response(messages, model)
 
-    if provider == 'openai':
-        openai_api_key = os.getenv('OPENAI_API_KEY')
-        if not openai_api_key:
-            raise ValueError("OPENAI_API_KEY saknas i miljövariabler")
-        try:
-            from openai import OpenAI
+class ScriptStreamAborted(RuntimeError):
+    """Ett strömmat manus som avbröts innan det var klart (``reason``: 'format' eller 'too_short').
 
-            default_openai_model = model.split('/', 1)[1] if '/' in model else model
-            openai_model = os.getenv('OPENAI_MODEL', '').strip() or default_openai_model
-            max_tokens_env = os.getenv('MMM_MAX_TOKENS', '').strip()
-            try:
-                max_tokens = int(max_tokens_env) if max_tokens_env else 2200
-            except ValueError:
-                max_tokens = 2200
-
-            client = OpenAI(api_key=openai_api_key)
-            resp = client.chat.completions.create(
-                model=openai_model,
-                messages=messages,
-                temperature=0.7,
-                max_tokens=max_tokens,
-            )
-            return (resp.choices[0].message.content or "").strip()
-        except Exception as e:
-            logger.error(f"[ERROR] OpenAI API error: {type(e).__name__}: {e}")
-            raise
+    ``partial`` är texten som hann komma innan avbrottet.
+    """
 
-    # Default: OpenRouter (med fallback till OpenAI om OpenRouter-nyckel saknas)
-    api_key = os.getenv('OPENROUTER_API_KEY')
-    if api_key:
-        url = "https://openrouter.ai/api/v1/chat/completions"
-        headers = {
-            "Authorization": f"Bearer {api_key}",
-            "HTTP-Referer": "https://github.com/PontusDahlberg",
-            "X-Title": "MMM Podcast Generator",
-            "Content-Type": "application/json"
-        }
+    def __init__(self, reason: str, message: str, partial: str = ''):
+        super().__init__(message)
+        self.reason = reason
+        self.partial = partial
 
-        max_tokens_env = os.getenv('MMM_MAX_TOKENS', '').strip()
-        try:
-            max_tokens = int(max_tokens_env) if max_tokens_env else 2200
-        except ValueError:
-            max_tokens = 2200
 
-        data = {
-            "model": model,
-            "messages": messages,
-            "temperature": 0.7,
-            "max_tokens": max_tokens
-        }
+def _script_streaming_enabled() -> bool:
+    return os.getenv('MMM_SCRIPT_STREAMING', '1').strip().lower() not in {'0', 'false', 'no'}
 
-        try:
-            response = requests.post(url, headers=headers, json=data, timeout=90)
-            response.raise_for_status()
-            result = response.json()
-            return result['choices'][0]['message']['content']
-        except requests.RequestException as e:
-            logger.error(f"[ERROR] OpenRouter API error: {e}")
-            raise
 
-    openai_api_key = os.getenv('OPENAI_API_KEY')
-    if openai_api_key:
-        try:
-            from openai import OpenAI
+def _emit_script_turns(content: str, on_turn: Optional[Callable[[Optional[Dict[str, str]]], None]]) -> None:
+    if not on_turn or not content:
+        return
+    turns = ScriptTurnStream()
+    for turn in turns.feed(content) + turns.close():
+        on_turn(turn)
 
-            # OpenRouter-modellnamn kan vara t.ex. "openai/gpt-4o-mini".
-            # För OpenAI vill vi oftast ha "gpt-4o-mini".
-            default_openai_model = model.split('/', 1)[1] if '/' in model else model
-            openai_model = os.getenv('OPENAI_MODEL', '').strip() or default_openai_model
-            max_tokens_env = os.getenv('MMM_MAX_TOKENS', '').strip()
-            try:
-                max_tokens = int(max_tokens_env) if max_tokens_env else 2200
-            except ValueError:
-                max_tokens = 2200
-
-            client = OpenAI(api_key=openai_api_key)
-            resp = client.chat.completions.create(
-                model=openai_model,
-                messages=messages,
-                temperature=0.7,
-                max_tokens=max_tokens,
-            )
-            return (resp.choices[0].message.content or "").strip()
-        except Exception as e:
-            logger.error(f"[ERROR] OpenAI API error (fallback): {type(e).__name__}: {e}")
-            raise
 
-    raise ValueError("OPENROUTER_API_KEY saknas i miljövariabler (och OPENAI_API_KEY saknas också)")
+def _restart_script_turns(
+    on_turn: Optional[Callable[[Optional[Dict[str, str]]], None]], content: str
+) -> None:
+    """Be mottagaren kasta skickade repliker och skicka ``content`` i stället."""
+    if on_turn:
+        on_turn(None)
+        _emit_script_turns(content, on_turn)
+
+
+def _stream_script_uncached(
+    messages: List[Dict],
+    target_provider: str,
+    target_model: str,
+    turns: "ScriptTurnStream",
+    abort_if_below_words: int,
+    on_turn: Optional[Callable[[Optional[Dict[str, str]]], None]],
+    max_tokens: int,
+) -> str:
+    format_check_chars_env = os.getenv('MMM_STREAM_FORMAT_CHECK_CHARS', '').strip()
+    try:
+        format_check_chars = int(format_check_chars_env) if format_check_chars_env else 800
+    except ValueError:
+        format_check_chars = 800
+    parts: List[str] = []
+    stream = default_llm_client().stream(
+        target_provider,
+        target_model,
+        messages,
+        temperature=LLM_TEMPERATURE,
+        max_tokens=max_tokens,
+    )
+    # Stänger strömmen (och avbryter anropet) när vi slutar läsa i förtid
+    with contextlib.closing(stream):
+        for delta in stream:
+            parts.append(delta)
+            for turn in turns.feed(delta):
+                if on_turn:
+                    on_turn(turn)
+            if not turns.has_speaker and turns.chars >= format_check_chars:
+                raise ScriptStreamAborted(
+                    'format', f"Inga 'Namn: text'-repliker efter {turns.chars} tecken", ''.join(parts)
+                )
+            if (
+                abort_if_below_words
+                and turns.words_so_far < abort_if_below_words
+                and turns.open_turn_start().lower().startswith(_SIGN_OFF_MARKERS)
+            ):
+                raise ScriptStreamAborted(
+                    'too_short', f"Modellen avrundar redan efter {turns.words_so_far} ord", ''.join(parts)
+                )
+    for turn in turns.close():
+        if on_turn:
+            on_turn(turn)
+    logger.info(f"[AI] 📡 Strömmat manus klart: {turns.count} repliker, {turns.words} ord")
+    return ''.join(parts).strip()
+
+
+def get_script_response(
+    messages: List[Dict],
+    model: str,
+    provider: str,
+    *,
+    abort_if_below_words: int = 0,
+    on_turn: Optional[Callable[[Optional[Dict[str, str]]], None]] = None,
+    max_tokens: Optional[int] = None,
+) -> str:
+    """Hämta podcast-manuset, strömmat när MMM_SCRIPT_STREAMING=1 (standard).
+
+    Färdiga repliker (``{'speaker', 'text'}``) skickas till ``on_turn`` medan svaret
+    strömmar in. Svarar modellen inte i formatet 'Namn: text', eller börjar den
+    avrunda innan ``abort_if_below_words`` ord, avbryts anropet direkt med
+    ScriptStreamAborted. Samma LLM-cache som get_openrouter_response används.
+    """
+    provider = (provider or 'openrouter').strip().lower()
+    max_tokens = max_tokens or _llm_max_tokens()
+    if not _script_streaming_enabled():
+        content = get_openrouter_response(messages, model=model, provider=provider, max_tokens=max_tokens)
+        _emit_script_turns(content, on_turn)
+        return content
+
+    target_provider, target_model = _resolve_llm_target(model, provider)
+    turns = ScriptTurnStream()
+    try:
+        content = cached_llm_call(
+            target_provider,
+            target_model,
+            messages,
+            LLM_TEMPERATURE,
+            max_tokens,
+            lambda: _stream_script_uncached(
+                messages, target_provider, target_model, turns, abort_if_below_words, on_turn, max_tokens
+            ),
+        )
+    except LLMError as e:
+        if turns.chars:
+            raise
+        # Strömningen kom aldrig igång; ett vanligt anrop har egna omförsök
+        logger.warning(f"[AI] Strömning misslyckades ({e}); hämtar manuset utan strömning")
+        content = get_openrouter_response(
+            messages, model=model, provider=provider, use_cache=False, max_tokens=max_tokens
+        )
+        _emit_script_turns(content, on_turn)
+        return content
+    if not turns.chars:
+        # Svaret kom från cachen
+        _emit_script_turns(content, on_turn)
+    return content
 
 
 def _count_words(text: str) -> int:
@@ -1188,30 +1187,82 @@ def _split_outro_block(script_text: str) -> tuple[str, str]:
     return body, outro
 
 
-def _fallback_collect_articles_from_scraped(max_per_source: int = 5, max_total: int = 30) -> List[Dict]:
-    """Fallback: plocka ett litet urval artiklar direkt från scraped_content.json."""
+def _load_scraped_content(path: str = 'scraped_content.json') -> List[Dict]:
+    """Läs scraperns resultat en gång per körning ([] om filen saknas eller är trasig)."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except Exception as e:
+        logger.warning(f"⚠️ Kunde inte läsa {path}: {e}")
+        return []
+    return data if isinstance(data, list) else []
+
+
+def _fallback_collect_articles_from_scraped(
+    scraped_data: Optional[List[Dict]] = None,
+    max_per_source: int = 5,
+    max_total: int = 30,
+) -> List[Dict]:
+    """Fallback: plocka ett litet urval artiklar direkt från scraperns resultat (scraped_content.json)."""
+    if scraped_data is None:
+        scraped_data = _load_scraped_content()
     available_articles: List[Dict] = []
     try:
-        with open('scraped_content.json', 'r', encoding='utf-8') as f:
-            scraped_data = json.load(f)
-            for source_group in scraped_data:
-                source_name = source_group.get('source', 'Okänd')
-                items = source_group.get('items', [])
-                for item in items[:max_per_source]:
-                    if item.get('link') and item.get('title'):
-                        available_articles.append({
-                            'source': source_name,
-                            'title': item['title'][:100],
-                            'content': _article_text(item, 1600),
-                            'link': item['link']
-                        })
-                    if len(available_articles) >= max_total:
-                        return available_articles
+        for source_group in scraped_data:
+            source_name = source_group.get('source', 'Okänd')
+            items = source_group.get('items', [])
+            for item in items[:max_per_source]:
+                if item.get('link') and item.get('title'):
+                    available_articles.append({
+                        'source': source_name,
+                        'title': item['title'][:100],
+                        'content': _article_text(item, 1600),
+                        'link': item['link'],
+                        'alternates': item.get('alternates') or [],
+                    })
+                if len(available_articles) >= max_total:
+                    return available_articles
     except Exception as e:
         logger.error(f"❌ Fallback-filtrering misslyckades: {e}")
     return available_articles
 
 
+def _log_scrape_diagnostics(scraped_data: List[Dict]) -> None:
+    """Skriv scraperns tider och bytes per källa (scrape_stats) till diagnostics.jsonl."""
+
+    totals = {'sources': 0, 'total_ms': 0.0, 'requests': 0, 'bytes': 0, 'article_fetches': 0, 'article_cache_hits': 0}
+    phase_totals: Dict[str, float] = {}
+    slowest: List[Tuple[float, str]] = []
+    for source_group in scraped_data if isinstance(scraped_data, list) else []:
+        stats = source_group.get('scrape_stats') if isinstance(source_group, dict) else None
+        if not isinstance(stats, dict):
+            continue
+        source_name = source_group.get('source', 'Okänd')
+        log_diagnostic('scrape_source_stats', {
+            'source': source_name,
+            'format': source_group.get('format'),
+            'items': len(source_group.get('items') or []),
+            'error': source_group.get('error'),
+            **stats,
+        })
+        totals['sources'] += 1
+        for key in ('total_ms', 'requests', 'bytes', 'article_fetches', 'article_cache_hits'):
+            totals[key] += stats.get(key, 0) or 0
+        for phase, ms in (stats.get('phases_ms') or {}).items():
+            phase_totals[phase] = round(phase_totals.get(phase, 0.0) + (ms or 0.0), 1)
+        slowest.append((float(stats.get('total_ms', 0.0) or 0.0), source_name))
+
+    if not totals['sources']:
+        return
+    slowest.sort(reverse=True)
+    log_diagnostic('scrape_run_summary', {
+        **totals,
+        'total_ms': round(totals['total_ms'], 1),
+        'phases_ms': phase_totals,
+        'slowest_sources': [{'source': name, 'total_ms': ms} for ms, name in slowest[:5]],
+    })
+
+
 def _truncate_text(text: str, max_chars: int) -> str:
     if not text:
         return ""
@@ -1275,15 +1326,19 @@ def _is_promotional_article(article: Dict[str, Any]) -> bool:
     return False
 
 
-def _article_text(article: Dict[str, Any], max_chars: int) -> str:
-    """Hämta bästa tillgängliga artikeltext (content -> summary -> description -> snippet)."""
-    text = (
+def _article_raw_text(article: Dict[str, Any]) -> str:
+    """Bästa tillgängliga artikeltext (content -> summary -> description -> snippet)."""
+    return (
         (article.get('content') or '')
         or (article.get('summary') or '')
         or (article.get('description') or '')
         or (article.get('snippet') or '')
     )
-    sanitized = _strip_article_noise(text)
+
+
+def _article_text(article: Dict[str, Any], max_chars: int) -> str:
+    """Hämta bästa tillgängliga artikeltext (content -> summary -> description -> snippet)."""
+    sanitized = _strip_article_noise(_article_raw_text(article))
     return _truncate_text(sanitized, max_chars)
 
 
@@ -1345,14 +1400,112 @@ def _append_article_padding(script_text: str, articles: List[Dict], min_words: i
     return (combined + ("\n\n" + outro if outro else "")).strip()
 
 
+# Kortare utkast än så är inte värda att bygga vidare på; då skrivs manuset om
+_CONTINUATION_MIN_DRAFT_WORDS = 150
+
+
+def _script_continuation_enabled() -> bool:
+    return os.getenv('MMM_SCRIPT_CONTINUATION', '1').strip().lower() not in {'0', 'false', 'no'}
+
+
+def _continuation_max_tokens(deficit_words: int) -> int:
+    """Tokenbudget för en förlängning med ``deficit_words`` ord."""
+    try:
+        tokens_per_word = float(os.getenv('MMM_TOKENS_PER_WORD', '1.8') or 1.8)
+    except ValueError:
+        tokens_per_word = 1.8
+    # Marginal för talarnamn, radbrytningar och en outro
+    budget = int(deficit_words * tokens_per_word * 1.3) + 150
+    return max(300, min(_llm_max_tokens(), budget))
+
+
+def continue_short_script(
+    messages: List[Dict],
+    draft: str,
+    articles: List[Dict],
+    min_words: int,
+    model: str,
+    provider: str,
+    *,
+    keep_outro: bool = True,
+    on_turn: Optional[Callable[[Optional[Dict[str, str]]], None]] = None,
+) -> str:
+    """Förläng ett för kort manus i stället för att skriva om det från början.
+
+    Utkastet (utan outro) skickas tillbaka som modellens eget svar och modellen
+    ombeds bara skriva de ord som fattas, om artiklar ur källistan som inte
+    nämnts ännu; max_tokens räknas fram ur ordunderskottet. Med ``keep_outro``
+    läggs utkastets outro tillbaka sist, annars ska modellen skriva en.
+    """
+    body, outro = _split_outro_block(draft)
+    body = body or draft
+    if not keep_outro:
+        outro = ''
+    wc = _count_words(body)
+    deficit = max(0, min_words - wc - _count_words(outro))
+
+    mentioned = {id(a) for a in extract_referenced_articles(body, articles, max_results=len(articles))}
+    remaining = [a for a in articles if id(a) not in mentioned][:8]
+    if remaining:
+        topics = "\n".join(
+            f"- {(a.get('source') or 'Okänd källa').strip()}: {_truncate_text((a.get('title') or '').strip(), 160)}"
+            for a in remaining
+        )
+    else:
+        topics = "- (alla artiklar är redan nämnda – fördjupa de viktigaste med fakta ur källistan)"
+    ending = (
+        "Skriv INGEN avslutning eller outro – den finns redan och läggs till efteråt."
+        if outro else
+        "Avsluta med en kort outro enligt instruktionerna ovan."
+    )
+    instruction = (
+        f"Manuset ovan blev för kort ({wc} ord, målet är minst {min_words}). "
+        f"Fortsätt dialogen exakt där den slutar med ungefär {deficit} nya ord.\n"
+        f"- Ta upp dessa artiklar ur källistan, som inte nämnts ännu:\n{topics}\n"
+        "- Samma FORMAT (bara 'Namn: text'), samma talare, upprepa inget som redan sagts och skriv inget nytt intro.\n"
+        f"- {ending}\n"
+        "Skriv ENDAST de nya replikerna."
+    )
+    continuation_messages = list(messages) + [
+        {"role": "assistant", "content": body},
+        {"role": "user", "content": instruction},
+    ]
+    max_tokens = _continuation_max_tokens(deficit)
+    logger.info(
+        f"[AI] ✍️ Förlänger manuset: {wc} ord + ~{deficit} nya ({len(remaining)} nya artiklar, max_tokens={max_tokens})"
+    )
+    if on_turn:
+        on_turn(None)
+        _emit_script_turns(body, on_turn)
+    extension = get_script_response(
+        continuation_messages, model, provider, on_turn=on_turn, max_tokens=max_tokens
+    )
+    _emit_script_turns(outro, on_turn)
+    combined = (body.rstrip() + "\n" + (extension or '').strip()).strip()
+    return (combined + ("\n\n" + outro if outro else "")).strip()
+
+
 def _should_pad_short_scripts() -> bool:
     return os.getenv('MMM_PAD_SHORT_SCRIPTS', '0').strip().lower() in {'1', 'true', 'yes'}
 
-def generate_structured_podcast_content(weather_info: str, today: Optional[datetime] = None) -> tuple[str, List[Dict]]:
-    """Generera strukturerat podcast-innehåll med AI och riktig väderdata"""
+def generate_structured_podcast_content(
+    weather_info: str,
+    today: Optional[datetime] = None,
+    scraped_data: Optional[List[Dict]] = None,
+    on_turn: Optional[Callable[[Optional[Dict[str, str]]], None]] = None,
+) -> tuple[str, List[Dict]]:
+    """Generera strukturerat podcast-innehåll med AI och riktig väderdata
+
+    ``scraped_data`` är scraperns resultat; utan det läses scraped_content.json.
+    ``on_turn`` får varje färdig replik (``{'speaker', 'text'}``) medan manuset
+    strömmar in, t.ex. för att starta TTS tidigt; ``None`` betyder att repliker
+    som redan skickats ska kastas (omförsök eller fallback-manus följer).
+    """
     
     # Dagens datum för kontext
     today = today or datetime.now()
+    if scraped_data is None:
+        scraped_data = _load_scraped_content()
 
     # Eftertalk/eftersnack styrs av sources.json (så att GitHub Actions kan styra beteendet)
     config = load_config()
@@ -1366,7 +1519,6 @@ def generate_structured_podcast_content(weather_info: str, today: Optional[datet
     # Läs tidigare använda artiklar för upprepningsfilter (senaste 21 dagarna)
     # (viktigt för att undvika att samma nyhet tas upp dag efter dag)
     dedupe_days = 21
-    used_articles = set()
     recent_episode_articles: List[Dict[str, Any]] = []
 
     memory_days_env = os.getenv('MMM_MEMORY_DAYS', '').strip()
@@ -1376,39 +1528,16 @@ def generate_structured_podcast_content(weather_info: str, today: Optional[datet
         memory_days = 60
     memory_days = max(memory_days, dedupe_days)
 
-    # Primärt: använd en persistent historikfil (fungerar i GitHub Actions via cache)
-    history = None
-    try:
-        from src.news_dedupe import NewsHistory
-
-        history = NewsHistory("news_history.json")
-        history.load()
-        history.prune(keep_days=60)
-        logger.info("[HISTORY] news_history.json loaded (%s keys)", len(history.data.get('items', {})))
-    except Exception as e:
-        history = None
-        logger.warning(f"[HISTORY] Kunde inte initiera news_history.json: {e}")
+    # Ett gemensamt index: persistent historik (GitHub Actions-cache) + tidigare avsnitts artiklar
+    dedupe = DedupeService("news_history.jsonl", dedupe_days=dedupe_days, retain_days=60)
+    if dedupe.persistent:
+        logger.info("[HISTORY] news_history.jsonl loaded (%s keys)", len(dedupe))
+    else:
+        logger.warning("[HISTORY] Kunde inte läsa news_history.jsonl, använder bara avsnittsarkivet")
     try:
         recent_episode_articles = _load_recent_episode_articles(within_days=memory_days, today=today)
-        cutoff_date = (today - timedelta(days=dedupe_days)).date()
-        for prev in recent_episode_articles:
-            try:
-                prev_dt = prev.get('date')
-                if isinstance(prev_dt, datetime) and prev_dt.date() < cutoff_date:
-                    continue
-            except Exception:
-                continue
-
-            prev_link = prev.get('link', '')
-            prev_title = prev.get('title', '')
-            url_key = _canonicalize_url(prev_link)
-            fp_key = _title_fingerprint(prev_title)
-            if url_key:
-                used_articles.add(url_key)
-            if fp_key:
-                used_articles.add(fp_key)
-
-        logger.info(f"[HISTORY] Laddade {len(used_articles)} tidigare använda artiklar för upprepningsfilter")
+        absorbed = dedupe.absorb(recent_episode_articles)
+        logger.info(f"[HISTORY] Laddade {absorbed} nycklar från tidigare avsnitt för upprepningsfilter")
     except Exception as e:
         logger.warning(f"[HISTORY] Upprepningsfilter misslyckades: {e}")
     
@@ -1425,13 +1554,13 @@ def generate_structured_podcast_content(weather_info: str, today: Optional[datet
         from news_curation_integration import curate_news_sync
 
         # Använd agent-systemet för att kurera artiklar
-        available_articles = curate_news_sync('scraped_content.json')
+        available_articles = curate_news_sync(scraped_data)
 
         # Viktigt: agent-systemet kan "lyckas" men ändå ge 0 artiklar. Då får vi
         # ett extremt kort avsnitt (ex. 1 minut). Falla tillbaka till enkel filtrering.
         if not available_articles:
             logger.warning("⚠️ Agent-systemet returnerade 0 artiklar. Faller tillbaka på enkel filtrering...")
-            available_articles = _fallback_collect_articles_from_scraped()
+            available_articles = _fallback_collect_articles_from_scraped(scraped_data)
 
         logger.info(f"\n✅ Artikelurval klart: {len(available_articles)} artiklar för podcast")
         logger.info("="*80 + "\n")
@@ -1439,10 +1568,11 @@ def generate_structured_podcast_content(weather_info: str, today: Optional[datet
     except Exception as e:
         logger.error(f"❌ Agent-systemet misslyckades: {e}")
         logger.warning("Faller tillbaka på enkel filtrering...")
-        available_articles = _fallback_collect_articles_from_scraped()
+        available_articles = _fallback_collect_articles_from_scraped(scraped_data)
     
     # Skapa artikelreferenser för AI
     article_refs = ""
+    prompt_articles = []
     if available_articles:
         # Filtrera bort upprepningar (men tillåt uppföljningar)
         filtered_articles = []
@@ -1460,23 +1590,15 @@ def generate_structured_podcast_content(weather_info: str, today: Optional[datet
                 })
                 continue
 
-            url_key = _canonicalize_url(a.get('link', ''))
-            fp_key = _title_fingerprint(a.get('title', ''))
-
-            # Matcha både "legacy" (episode_articles_*.json) och persistent historik (news_history.json)
-            hist_url_key = f"url:{url_key}" if url_key else ""
-            hist_fp_key = f"title:{fp_key}" if fp_key else ""
-
-            is_repeat_by_url = bool(url_key and url_key in used_articles)
-            is_repeat_by_fp = bool(fp_key and fp_key in used_articles)
+            url_key, fp_key = article_keys(a)
 
-            if history is not None:
-                try:
-                    is_repeat_by_url = is_repeat_by_url or bool(hist_url_key and history.seen_within_days(hist_url_key, dedupe_days))
-                    is_repeat_by_fp = is_repeat_by_fp or bool(hist_fp_key and history.seen_within_days(hist_fp_key, dedupe_days))
-                except Exception:
-                    # Historik ska aldrig stoppa körningen
-                    pass
+            # Ett uppslag täcker både avsnittsarkivet och persistent historik
+            is_repeat_by_url, is_repeat_by_fp = False, False
+            try:
+                is_repeat_by_url, is_repeat_by_fp = dedupe.seen(a)
+            except Exception:
+                # Historik ska aldrig stoppa körningen
+                pass
 
             is_repeat = is_repeat_by_url or is_repeat_by_fp
             is_follow_up = _is_follow_up_article(a.get('title', ''), a.get('content', ''))
@@ -1520,11 +1642,10 @@ def generate_structured_podcast_content(weather_info: str, today: Optional[datet
             filtered_articles.append(a)
 
             # Markera som sedd i persistent historik när vi väljer att behålla artikeln
-            if history is not None:
-                try:
-                    history.mark_seen([hist_url_key, hist_fp_key])
-                except Exception:
-                    pass
+            try:
+                dedupe.mark_used([a])
+            except Exception:
+                pass
 
         if skipped_count:
             logger.info(f"[HISTORY] Filtrerade bort {skipped_count} upprepade artiklar")
@@ -1563,13 +1684,13 @@ def generate_structured_podcast_content(weather_info: str, today: Optional[datet
 
         available_articles = filtered_articles
 
-        # Spara persistent historik (om den är aktiverad)
-        if history is not None:
+        # Spara persistent historik (om den gick att läsa)
+        if dedupe.persistent:
             try:
-                history.save()
-                logger.info("[HISTORY] news_history.json saved")
+                dedupe.save()
+                logger.info("[HISTORY] news_history.jsonl saved")
             except Exception as e:
-                logger.warning(f"[HISTORY] Kunde inte spara news_history.json: {e}")
+                logger.warning(f"[HISTORY] Kunde inte spara news_history.jsonl: {e}")
 
         article_refs = "\n\nTILLGÄNGLIGA ARTIKLAR ATT REFERERA TILL:\n"
         max_article_chars_env = os.getenv('MMM_PROMPT_ARTICLE_CHARS', '').strip()
@@ -1585,11 +1706,40 @@ def generate_structured_podcast_content(weather_info: str, today: Optional[datet
             max_prompt_articles = 6
         max_prompt_articles = max(3, min(10, max_prompt_articles))
 
-        for i, article in enumerate(available_articles[:max_prompt_articles], 1):
+        # Tokenbudget för artikelblocket; utan MMM_PROMPT_ARTICLE_TOKENS blir den lika stor
+        # som tidigare (antal artiklar x MMM_PROMPT_ARTICLE_CHARS), men fördelas efter relevans.
+        article_tokens_env = os.getenv('MMM_PROMPT_ARTICLE_TOKENS', '').strip()
+        try:
+            article_token_budget = int(article_tokens_env) if article_tokens_env else 0
+        except ValueError:
+            article_token_budget = 0
+        if article_token_budget <= 0:
+            article_token_budget = max_prompt_articles * (max_article_chars // 4 + 60)
+
+        def _render_article_entry(i: int, article: Dict, article_content: str) -> str:
             article_title = _truncate_text(article.get('title', ''), 140)
-            article_content = _article_text(article, max_article_chars)
             article_source = article.get('source', 'Okänd källa')
-            article_refs += f"{i}. {article_source}: {article_title}\n   Innehåll: {article_content}\n   [Referera som: {article_source}]\n\n"
+            also_reported = sorted({
+                (alt.get('source') or '').strip()
+                for alt in article.get('alternates') or []
+                if isinstance(alt, dict) and (alt.get('source') or '').strip() not in {'', article_source}
+            })
+            also_line = f"   Även rapporterat av: {', '.join(also_reported)}\n" if also_reported else ""
+            return f"{i}. {article_source}: {article_title}\n   Innehåll: {article_content}\n{also_line}   [Referera som: {article_source}]\n\n"
+
+        prompt_builder = ArticlePromptBuilder(
+            article_token_budget,
+            max_chars=3 * max_article_chars,
+            clean=_strip_article_noise,
+        )
+        article_block, prompt_articles, article_block_tokens = prompt_builder.build(
+            available_articles[:max_prompt_articles], _article_raw_text, _render_article_entry
+        )
+        article_refs += article_block
+        logger.info(
+            f"[PROMPT] Artikelblock: {len(prompt_articles)} artiklar, ~{article_block_tokens} tokens "
+            f"(budget {article_token_budget})"
+        )
 
     callback_refs = ""
     try:
@@ -1641,6 +1791,7 @@ def generate_structured_podcast_content(weather_info: str, today: Optional[datet
                 min_anchor_token_len=max(4, anchor_min_len),
                 debug=memory_debug,
                 debug_max_samples=max(0, debug_max_samples),
+                title_index=_load_recent_title_index(within_days=memory_days, today=today),
             )
 
             # Always log a compact summary so we can tune thresholds without guesswork.
@@ -1879,7 +2030,7 @@ Skapa nu ett komplett manus för dagens avsnitt. Sikta på cirka 900 ord och gå
         # Bygg ett längre, källbaserat manus utan LLM så att vi inte publicerar ~1 minut.
         chosen = list(available_articles or [])
         if not chosen:
-            chosen = _fallback_collect_articles_from_scraped(max_per_source=4, max_total=20)
+            chosen = _fallback_collect_articles_from_scraped(scraped_data, max_per_source=4, max_total=20)
 
         # Håll fallback-läget kort och tydligt i stället för att maxa antalet punkter.
         chosen = chosen[:5]
@@ -1959,7 +2110,6 @@ Skapa nu ett komplett manus för dagens avsnitt. Sikta på cirka 900 ord och gå
 
     try:
         logger.info(f"[AI] Using LLM provider/model: {llm_provider}/{llm_model}")
-        content = get_openrouter_response(messages, model=llm_model, provider=llm_provider)
         # Guard: ibland svarar modellen alldeles för kort (t.ex. när källistan är tunn).
         # Gör retry endast vid extremt kort svar för att minska extra API-kostnad.
         min_words_env = os.getenv('MMM_MIN_SCRIPT_WORDS', '').strip()
@@ -1972,18 +2122,61 @@ Skapa nu ett komplett manus för dagens avsnitt. Sikta på cirka 900 ord och gå
             retry_if_below_words = int(retry_threshold_env) if retry_threshold_env else 700
         except ValueError:
             retry_if_below_words = 700
+        try:
+            content = get_script_response(
+                messages,
+                llm_model,
+                llm_provider,
+                abort_if_below_words=retry_if_below_words,
+                on_turn=on_turn,
+            )
+        except ScriptStreamAborted as e:
+            # Avbrutet i förtid: gå direkt till omförsöket i stället för att vänta ut svaret
+            logger.warning(f"[AI] Strömmat manus avbröts ({e.reason}): {e}")
+            log_diagnostic('ai_script_stream_aborted', {
+                'reason': e.reason,
+                'error': str(e),
+                'provider': llm_provider,
+                'model': llm_model,
+            })
+            # Början av ett manus som avrundades för tidigt går att bygga vidare på
+            content = e.partial if e.reason == 'too_short' else ''
+            draft_complete = False
+        else:
+            draft_complete = True
         wc = _count_words(content)
         if wc < retry_if_below_words:
-            logger.warning(f"[AI] Manus för kort ({wc} ord < {min_words}). Försöker en gång till med förtydligad prompt...")
+            continue_draft = _script_continuation_enabled() and wc >= _CONTINUATION_MIN_DRAFT_WORDS
+            logger.warning(
+                f"[AI] Manus för kort ({wc} ord < {min_words}). "
+                + ("Förlänger utkastet..." if continue_draft else "Försöker en gång till med förtydligad prompt...")
+            )
             log_diagnostic('ai_script_too_short_retry', {
                 'word_count': wc,
                 'min_words': min_words,
                 'retry_if_below_words': retry_if_below_words,
                 'provider': llm_provider,
                 'model': llm_model,
+                'mode': 'continuation' if continue_draft else 'regenerate',
             })
-            retry_prompt = prompt + "\n\nVIKTIGT: Ditt förra svar blev för kort. Skriv om manuset till minst " + str(min_words) + " ord. Behåll exakt samma FORMAT (bara 'Namn: text') och använd de listade källorna."
-            content = get_openrouter_response([{"role": "user", "content": retry_prompt}], model=llm_model, provider=llm_provider)
+            if continue_draft:
+                content = continue_short_script(
+                    messages,
+                    content,
+                    prompt_articles,
+                    min_words,
+                    llm_model,
+                    llm_provider,
+                    keep_outro=draft_complete,
+                    on_turn=on_turn,
+                )
+            else:
+                retry_prompt = prompt + "\n\nVIKTIGT: Ditt förra svar blev för kort. Skriv om manuset till minst " + str(min_words) + " ord. Behåll exakt samma FORMAT (bara 'Namn: text') och använd de listade källorna."
+                if on_turn:
+                    on_turn(None)
+                content = get_script_response(
+                    [{"role": "user", "content": retry_prompt}], llm_model, llm_provider, on_turn=on_turn
+                )
             wc2 = _count_words(content)
             logger.info(f"[AI] Retry word count: {wc2}")
             if wc2 < min_words:
@@ -1996,6 +2189,7 @@ Skapa nu ett komplett manus för dagens avsnitt. Sikta på cirka 900 ord och gå
                         'min_words': min_words,
                     })
                     content = _append_article_padding(content, available_articles, min_words)
+                    _restart_script_turns(on_turn, content)
                 else:
                     logger.warning(
                         f"[AI] Retry fortfarande kort ({wc2} < {min_words}) och padding är av. Faller tillbaka till källbaserat manus."
@@ -2008,6 +2202,7 @@ Skapa nu ett komplett manus för dagens avsnitt. Sikta på cirka 900 ord och gå
                         'fallback': 'article_based',
                     })
                     content = generate_fallback_content_from_articles()
+                    _restart_script_turns(on_turn, content)
         logger.info("[AI] Genererade podcast-innehåll med väderdata")
         return content, available_articles
     except Exception as e:
@@ -2017,7 +2212,9 @@ Skapa nu ett komplett manus för dagens avsnitt. Sikta på cirka 900 ord och gå
             'fallback': 'article_based',
         })
         # Fallback till källbaserat (längre) innehåll
-        return generate_fallback_content_from_articles(), available_articles
+        content = generate_fallback_content_from_articles()
+        _restart_script_turns(on_turn, content)
+        return content, available_articles
 
 def generate_fallback_content(date_str: str, weekday: str, weather_info: str) -> str:
     """Fallback-innehåll om AI inte fungerar"""
@@ -2231,6 +2428,99 @@ def parse_podcast_text(text: str) -> List[Dict]:
     
     return segments
 
+class ScriptTurnStream:
+    """Plockar ut färdiga repliker ur ett manus medan det strömmar in.
+
+    Samma regler som parse_podcast_text; en replik är klar när nästa talare
+    börjar eller när strömmen tar slut (``close``).
+    """
+
+    def __init__(self):
+        self._pending = ''
+        self._speaker: Optional[str] = None
+        self._text: List[str] = []
+        self.count = 0
+        self.words = 0
+        self.chars = 0
+
+    def feed(self, delta: str) -> List[Dict[str, str]]:
+        """Lägg till text; returnerar repliker som blev klara."""
+        self.chars += len(delta or '')
+        self._pending += delta or ''
+        if '\n' not in self._pending:
+            return []
+        complete, self._pending = self._pending.rsplit('\n', 1)
+        return self._read_lines(complete)
+
+    def close(self) -> List[Dict[str, str]]:
+        rest, self._pending = self._pending, ''
+        return self._read_lines(rest) + self._finish_turn()
+
+    @property
+    def words_so_far(self) -> int:
+        """Ord i klara repliker plus de klara raderna i repliken som pågår."""
+        return self.words + sum(_count_words(text) for text in self._text)
+
+    @property
+    def has_speaker(self) -> bool:
+        """Om någon 'Namn: text'-rad har setts, även i en replik som inte är klar."""
+        return self._speaker is not None or self._last_pending_turn() is not None
+
+    def open_turn_start(self) -> str:
+        """Början av repliken som ännu inte är klar (inklusive påbörjad rad)."""
+        pending_turn = self._last_pending_turn()
+        if pending_turn is not None:
+            return pending_turn
+        if self._text:
+            return self._text[0]
+        return self._pending.strip() if self._speaker else ''
+
+    def _last_pending_turn(self) -> Optional[str]:
+        # Texten efter talarnamnet i den senaste talarraden på den påbörjade raden
+        for line in reversed(_normalize_inline_speaker_turns(self._pending).split('\n')):
+            turn = self._speaker_line(line.strip())
+            if turn is not None:
+                return clean_text_for_tts(turn[1]).strip()
+        return None
+
+    @staticmethod
+    def _speaker_line(line: str) -> Optional[Tuple[str, str]]:
+        if ':' not in line:
+            return None
+        speaker_part, text_part = line.split(':', 1)
+        speaker_name = clean_text_for_tts(speaker_part).strip()
+        if not speaker_name or len(speaker_name.split()) > 2:
+            return None
+        return speaker_name, text_part
+
+    def _read_lines(self, text: str) -> List[Dict[str, str]]:
+        finished: List[Dict[str, str]] = []
+        for line in _normalize_inline_speaker_turns(text).split('\n'):
+            line = line.strip()
+            if not line or line.startswith('#') or line.startswith('---'):
+                continue
+            turn = self._speaker_line(line)
+            if turn is not None:
+                finished.extend(self._finish_turn())
+                self._speaker = turn[0]
+                text_part_clean = clean_text_for_tts(turn[1]).strip()
+                self._text = [text_part_clean] if text_part_clean else []
+                continue
+            if self._speaker:
+                clean_line = clean_text_for_tts(line)
+                if clean_line:
+                    self._text.append(clean_line)
+        return finished
+
+    def _finish_turn(self) -> List[Dict[str, str]]:
+        text = ' '.join(self._text).strip()
+        self._text = []
+        if not self._speaker or not text:
+            return []
+        self.count += 1
+        self.words += _count_words(text)
+        return [{'speaker': self._speaker, 'text': text}]
+
 def generate_audio_with_gemini_dialog(script_content: str, weather_info: str, output_file: str) -> bool:
     """Generera audio med Gemini TTS för naturlig dialog mellan Lisa och Pelle"""
     if not GEMINI_TTS_AVAILABLE:
@@ -2627,6 +2917,9 @@ def main():
         # Sätt run-id så att diagnostics kan korreleras mellan moduler
         set_run_id(timestamp)
         os.environ['MMM_RUN_ID'] = timestamp
+        # Scraperns resultat läses en gång och delas av diagnostik, kurering och kvalitetsrapport
+        scraped_data = _load_scraped_content()
+        _log_scrape_diagnostics(scraped_data)
         
         # Skapa output-mappar
         os.makedirs('audio', exist_ok=True)
@@ -2634,7 +2927,9 @@ def main():
         
         # Generera strukturerat podcast-innehåll med riktig väderdata
         logger.info("[AI] Genererar strukturerat podcast-innehåll...")
-        podcast_content, referenced_articles = generate_structured_podcast_content(weather_info, today=today)
+        podcast_content, referenced_articles = generate_structured_podcast_content(
+            weather_info, today=today, scraped_data=scraped_data
+        )
 
         weekday_swedish = SWEDISH_WEEKDAYS.get(today.strftime('%A'), today.strftime('%A'))
         month_swedish = SWEDISH_MONTHS.get(today.month, today.strftime('%B').lower())
@@ -2647,9 +2942,14 @@ def main():
         logger.info(f"[SCRIPT] Manus sparat: {script_path}")
         
         # Spara artikelreferenser för senare användning
+        # (arkivet först: en första import av episode_articles_*.json ska inte få med dagens fil dubbelt)
+        try:
+            EpisodeArchive(EPISODE_ARCHIVE_FILE).append(today.date(), referenced_articles, run_id=timestamp)
+        except Exception as e:
+            logger.warning(f"[ARTICLES] Kunde inte uppdatera avsnittsarkivet: {e}")
         articles_path = f"episode_articles_{timestamp}.json"
         with open(articles_path, 'w', encoding='utf-8') as f:
-            json.dump(referenced_articles, f, indent=2, ensure_ascii=False)
+            json.dump([public_fields(a) for a in referenced_articles], f, indent=2, ensure_ascii=False)
         logger.info(f"[ARTICLES] Artikelreferenser sparade: {articles_path}")
         
         # 🛡️ SJÄLVKORRIGERANDE FAKTAKONTROLL - Automatisk korrigering av problem
@@ -2833,13 +3133,13 @@ def main():
         try:
             matched_keys = set()
             for a in rss_referenced_articles:
-                key = _canonicalize_url(a.get('link', '')) or _title_fingerprint(a.get('title', ''))
+                key = article_keys(a)[0] or article_keys(a)[1]
                 if key:
                     matched_keys.add(key)
 
             unmatched = []
             for a in referenced_articles:
-                key = _canonicalize_url(a.get('link', '')) or _title_fingerprint(a.get('title', ''))
+                key = article_keys(a)[0] or article_keys(a)[1]
                 if key and key not in matched_keys:
                     unmatched.append({'source': a.get('source', ''), 'title': a.get('title', ''), 'link': a.get('link', '')})
 
@@ -2902,18 +3202,11 @@ def main():
         try:
             from src.episode_quality import generate_episode_quality_report, write_quality_reports
 
-            scraped_data_for_report = None
-            try:
-                with open('scraped_content.json', 'r', encoding='utf-8') as f:
-                    scraped_data_for_report = json.load(f)
-            except Exception:
-                scraped_data_for_report = None
-
             quality_report = generate_episode_quality_report(
                 run_id=timestamp,
                 script_text=podcast_content,
                 referenced_articles=referenced_articles,
-                scraped_content=scraped_data_for_report,
+                scraped_content=scraped_data or None,
                 diagnostics_file=DIAGNOSTICS_FILE,
                 fact_check_summary=fact_check_summary,
             )
@@ -10,7 +10,8 @@ import logging
 import re
 from typing import Dict, List, Tuple, Optional
 from datetime import datetime
-import openai
+from src.llm_cache import acached_llm_call
+from src.llm_client import default_llm_client
 
 logger = logging.getLogger(__name__)
 
@@ -27,10 +28,7 @@ class SelfCorrectingFactChecker:
                 config = json.load(f)
             self.api_key = config.get('openrouter_api_key')
             if self.api_key:
-                self.client = openai.OpenAI(
-                    base_url="https://openrouter.ai/api/v1",
-                    api_key=self.api_key
-                )
+                self.client = default_llm_client()
                 self.ai_available = True
             else:
                 self.ai_available = False
@@ -155,9 +153,9 @@ class SelfCorrectingFactChecker:
         
         # Identifiera problematiska stycken
         paragraphs = content.split('\n\n')
-        corrected_paragraphs = []
+        to_rewrite = []
         
-        for paragraph in paragraphs:
+        for index, paragraph in enumerate(paragraphs):
             needs_rewrite = False
             
             # Kolla om detta stycke innehåller några av problemen
@@ -167,15 +165,22 @@ class SelfCorrectingFactChecker:
                     break
             
             if needs_rewrite:
-                logger.info("[AUTO-CORRECT] Skriver om problematiskt stycke med AI...")
-                rewritten = self._ai_rewrite_paragraph(paragraph)
-                corrected_paragraphs.append(rewritten if rewritten else paragraph)
-            else:
-                corrected_paragraphs.append(paragraph)
+                to_rewrite.append(index)
+
+        if not to_rewrite:
+            return content
+
+        # Styckena är oberoende av varandra, så omskrivningarna körs parallellt
+        logger.info(f"[AUTO-CORRECT] Skriver om {len(to_rewrite)} problematiska stycken med AI...")
+        rewrites = self.client.gather([self._ai_rewrite_paragraph(paragraphs[i]) for i in to_rewrite])
+        corrected_paragraphs = list(paragraphs)
+        for index, rewritten in zip(to_rewrite, rewrites):
+            if rewritten and isinstance(rewritten, str):
+                corrected_paragraphs[index] = rewritten
         
         return '\n\n'.join(corrected_paragraphs)
 
-    def _ai_rewrite_paragraph(self, paragraph: str) -> Optional[str]:
+    async def _ai_rewrite_paragraph(self, paragraph: str) -> Optional[str]:
         """Skriv om ett specifikt stycke med AI"""
         try:
             prompt = f"""
@@ -193,14 +198,19 @@ class SelfCorrectingFactChecker:
             VIKTIGT: Behåll Lisa/Pelle-dialogen om den finns. Skriv ENDAST det omskrivna stycket, inget annat.
             """
 
-            response = self.client.chat.completions.create(
-                model="openai/gpt-4o-mini",
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0.3,
-                max_tokens=500
-            )
-            
-            rewritten = response.choices[0].message.content.strip()
+            messages = [{"role": "user", "content": prompt}]
+
+            def _rewrite():
+                return self.client.acomplete(
+                    "openrouter",
+                    "openai/gpt-4o-mini",
+                    messages,
+                    temperature=0.3,
+                    max_tokens=500,
+                    api_key=self.api_key,
+                )
+
+            rewritten = await acached_llm_call("openrouter", "openai/gpt-4o-mini", messages, 0.3, 500, _rewrite)
             logger.info(f"[AUTO-CORRECT] AI omskrivning: {len(paragraph)} → {len(rewritten)} tecken")
             return rewritten
             
@@ -236,14 +246,14 @@ class SelfCorrectingFactChecker:
             Ämne att ersätta: {problematic_topic}
             """
 
-            response = self.client.chat.completions.create(
-                model="openai/gpt-4o-mini",
-                messages=[{"role": "user", "content": prompt}],
+            alternative_news = self.client.complete(
+                "openrouter",
+                "openai/gpt-4o-mini",
+                [{"role": "user", "content": prompt}],
                 temperature=0.7,
-                max_tokens=400
+                max_tokens=400,
+                api_key=self.api_key,
             )
-            
-            alternative_news = response.choices[0].message.content.strip()
             logger.info("[AUTO-CORRECT] Alternativa nyheter genererade")
             return alternative_news
             
@@ -0,0 +1,141 @@
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from typing import Any, Dict, List, Optional
+
+
+_DEFAULT_CACHE_PATH = "article_cache.sqlite3"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    key TEXT PRIMARY KEY,
+    text TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_articles_fetched_at ON articles(fetched_at);
+CREATE INDEX IF NOT EXISTS idx_articles_last_access ON articles(last_access);
+CREATE TABLE IF NOT EXISTS related (
+    key TEXT PRIMARY KEY,
+    payload TEXT NOT NULL,
+    fetched_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_related_fetched_at ON related(fetched_at);
+"""
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha1((text or "").encode("utf-8")).hexdigest()
+
+
+class ArticleCache:
+    """On-disk cache of extracted article text keyed by canonical URL.
+
+    Entries older than ``ttl_days`` are ignored and evicted; when more than
+    ``max_entries`` remain, the least recently used ones are dropped.
+    Writes are committed by ``flush()`` so a scrape run costs one fsync.
+    """
+
+    def __init__(
+        self,
+        path: str = _DEFAULT_CACHE_PATH,
+        ttl_days: float = 3,
+        max_entries: int = 5000,
+    ):
+        self.path = path
+        self.ttl_seconds = max(0.0, float(ttl_days)) * 86400
+        self.max_entries = max(1, int(max_entries))
+        self.hits = 0
+        self.misses = 0
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(self.path)
+            self._conn.executescript(_SCHEMA)
+        return self._conn
+
+    def _cutoff(self) -> float:
+        return time.time() - self.ttl_seconds
+
+    def get(self, key: str) -> Optional[str]:
+        """Return cached text for a canonical URL, or None if missing/expired."""
+        if not key:
+            return None
+        conn = self._connect()
+        row = conn.execute(
+            "SELECT text, fetched_at FROM articles WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None or row[1] < self._cutoff():
+            self.misses += 1
+            return None
+        conn.execute("UPDATE articles SET last_access = ? WHERE key = ?", (time.time(), key))
+        self.hits += 1
+        return row[0]
+
+    def put(self, key: str, text: str) -> None:
+        if not key or not text:
+            return
+        now = time.time()
+        self._connect().execute(
+            "INSERT OR REPLACE INTO articles (key, text, content_hash, fetched_at, last_access) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (key, text, content_hash(text), now, now),
+        )
+
+    def get_related(self, key: str) -> Optional[List[Dict[str, Any]]]:
+        """Return related articles stored by a previous enrichment of ``key``."""
+        if not key:
+            return None
+        row = self._connect().execute(
+            "SELECT payload, fetched_at FROM related WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None or row[1] < self._cutoff():
+            return None
+        try:
+            payload = json.loads(row[0])
+        except Exception:
+            return None
+        return payload if isinstance(payload, list) and payload else None
+
+    def put_related(self, key: str, related: List[Dict[str, Any]]) -> None:
+        if not key or not related:
+            return
+        self._connect().execute(
+            "INSERT OR REPLACE INTO related (key, payload, fetched_at) VALUES (?, ?, ?)",
+            (key, json.dumps(related, ensure_ascii=False), time.time()),
+        )
+
+    def evict(self) -> int:
+        """Drop expired entries, then trim to ``max_entries`` by least recent access."""
+        conn = self._connect()
+        cutoff = self._cutoff()
+        removed = conn.execute("DELETE FROM articles WHERE fetched_at < ?", (cutoff,)).rowcount
+        removed += conn.execute("DELETE FROM related WHERE fetched_at < ?", (cutoff,)).rowcount
+        (count,) = conn.execute("SELECT COUNT(*) FROM articles").fetchone()
+        if count > self.max_entries:
+            removed += conn.execute(
+                "DELETE FROM articles WHERE key IN "
+                "(SELECT key FROM articles ORDER BY last_access ASC LIMIT ?)",
+                (count - self.max_entries,),
+            ).rowcount
+        return removed
+
+    def flush(self) -> None:
+        if self._conn is None:
+            return
+        self.evict()
+        self._conn.commit()
+
+    def close(self) -> None:
+        if self._conn is None:
+            return
+        self.flush()
+        self._conn.close()
+        self._conn = None
@@ -0,0 +1,403 @@
+import json
+import logging
+import os
+import re
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from bs4 import BeautifulSoup, NavigableString, Tag
+from bs4.element import PreformattedString
+
+# lxml builds the tree in C, which is most of the cost of extraction;
+# BeautifulSoup's html.parser is the pure-Python fallback.
+try:
+    import lxml.html
+    from lxml import etree
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+DEFAULT_PARSER = 'lxml' if LXML_AVAILABLE else 'html.parser'
+
+logger = logging.getLogger(__name__)
+
+_DEFAULT_SELECTORS_PATH = "extractor_selectors.json"
+
+# Subtrees that never contain article text
+_SKIP_TAGS = {
+    'script', 'style', 'nav', 'header', 'footer', 'aside', 'form',
+    'noscript', 'template', 'svg', 'iframe', 'button', 'select',
+}
+_SKIP_CLASSES = {'comment-form', 'comments', 'respond', 'comment-respond', 'reply'}
+
+# Elements whose text forms one paragraph
+_BLOCK_TAGS = {'p', 'h2', 'h3', 'h4', 'blockquote', 'pre', 'li', 'dd'}
+# Elements that may hold the article body
+_CONTAINER_TAGS = {'article', 'main', 'section', 'div', 'td'}
+# Elements that end a run of loose text (text not wrapped in a block)
+_BOUNDARY_TAGS = _BLOCK_TAGS | _CONTAINER_TAGS | {'br', 'ul', 'ol', 'table', 'tr', 'h1', 'h5', 'h6', 'figure'}
+
+_TAG_BONUS = {'article': 1.25, 'main': 1.1}
+_POSITIVE_HINTS = re.compile(r'article|body|content|entry|post|story|text|brodtext|artikel', re.IGNORECASE)
+_NEGATIVE_HINTS = re.compile(
+    r'comment|footer|sidebar|related|share|social|promo|teaser|nav|menu|cookie|newsletter|advert|annons',
+    re.IGNORECASE,
+)
+
+_SKIP_PARAGRAPH_PHRASES = ('din e-postadress', 'obligatoriska fält', 'lämna ett svar', 'avbryt svar')
+
+MIN_PARAGRAPH_CHARS = 30
+MIN_ARTICLE_CHARS = 100
+
+
+_START, _TEXT, _END = 0, 1, 2
+
+_SAFE_NAME = re.compile(r'^[\w-]+$')
+
+
+@dataclass
+class _Frame:
+    depth: int
+    para_start: int
+    text_len: int = 0
+    link_len: int = 0
+    para_len: int = 0
+
+
+@dataclass
+class _Candidate:
+    node: Any
+    name: str
+    element_id: str
+    classes: List[str]
+    depth: int
+    start: int
+    end: int
+    score: float
+
+
+def _normalize(text: str) -> str:
+    return ' '.join(text.split())
+
+
+def _is_skipped(name: str, classes: List[str]) -> bool:
+    return name in _SKIP_TAGS or (bool(classes) and not _SKIP_CLASSES.isdisjoint(classes))
+
+
+def _bs4_attrs(tag: Tag) -> Tuple[str, List[str]]:
+    classes = tag.get('class') or []
+    if isinstance(classes, str):
+        classes = classes.split()
+    return str(tag.get('id') or ''), list(classes)
+
+
+def _bs4_events(root: Tag) -> Iterator[Tuple[int, Any, Any]]:
+    """Yield (kind, value, node) events for the children of a BeautifulSoup element."""
+    stack: List[Tuple[Any, bool]] = [(child, False) for child in reversed(root.contents)]
+    while stack:
+        node, exiting = stack.pop()
+        if exiting:
+            yield _END, node.name, node
+            continue
+        if isinstance(node, NavigableString):
+            # Comments, CDATA, doctype etc. are PreformattedString subclasses
+            if not isinstance(node, PreformattedString):
+                yield _TEXT, str(node), None
+            continue
+        if not isinstance(node, Tag):
+            continue
+        if _is_skipped(node.name, _bs4_attrs(node)[1]):
+            continue
+        yield _START, node.name, node
+        stack.append((node, True))
+        stack.extend((child, False) for child in reversed(node.contents))
+
+
+def _lxml_attrs(element: Any) -> Tuple[str, List[str]]:
+    return element.get('id') or '', (element.get('class') or '').split()
+
+
+def _lxml_events(root: Any) -> Iterator[Tuple[int, Any, Any]]:
+    """Yield (kind, value, node) events for the children of an lxml element.
+
+    lxml stores text after a child as that child's ``tail``, so it is emitted
+    once the child (or a skipped subtree) is done.
+    """
+    if root.text:
+        yield _TEXT, root.text, None
+    stack: List[Tuple[Any, bool]] = [(child, False) for child in reversed(root)]
+    while stack:
+        element, exiting = stack.pop()
+        if exiting:
+            yield _END, element.tag, element
+            if element.tail:
+                yield _TEXT, element.tail, None
+            continue
+        name = element.tag
+        if not isinstance(name, str) or _is_skipped(name, _lxml_attrs(element)[1]):
+            # Comments/processing instructions and skipped subtrees keep their tail
+            if element.tail:
+                yield _TEXT, element.tail, None
+            continue
+        yield _START, name, element
+        if element.text:
+            yield _TEXT, element.text, None
+        stack.append((element, True))
+        stack.extend((child, False) for child in reversed(element))
+
+
+def _walk(events: Iterator[Tuple[int, Any, Any]], attrs) -> Tuple[List[str], List[_Candidate]]:
+    """Consume one tree walk, collecting paragraph texts (in document order) and scored containers.
+
+    Paragraphs inside a container form a contiguous slice of the paragraph list,
+    so each candidate only needs to remember its [start, end) range.
+    """
+    paragraphs: List[str] = []
+    candidates: List[_Candidate] = []
+    frames: List[_Frame] = [_Frame(depth=0, para_start=0)]
+    buffer: List[str] = []
+    block_depth = 0
+    link_depth = 0
+
+    def _flush() -> None:
+        if not buffer:
+            return
+        text = _normalize(''.join(buffer))
+        buffer.clear()
+        if len(text) < MIN_PARAGRAPH_CHARS:
+            return
+        lowered = text.lower()
+        if any(phrase in lowered for phrase in _SKIP_PARAGRAPH_PHRASES):
+            return
+        paragraphs.append(text)
+        frames[-1].para_len += len(text)
+
+    for kind, value, node in events:
+        if kind == _TEXT:
+            frame = frames[-1]
+            frame.text_len += len(value)
+            if link_depth:
+                frame.link_len += len(value)
+            buffer.append(value)
+            continue
+
+        name = value
+        if kind == _START:
+            if name in _BLOCK_TAGS:
+                if block_depth == 0:
+                    _flush()
+                block_depth += 1
+            elif name in _BOUNDARY_TAGS and block_depth == 0:
+                _flush()
+            if name == 'a':
+                link_depth += 1
+            elif name == 'br':
+                buffer.append(' ')
+            frames.append(_Frame(depth=frames[-1].depth + 1, para_start=len(paragraphs)))
+            continue
+
+        # _END
+        if name in _BLOCK_TAGS:
+            block_depth -= 1
+            if block_depth == 0:
+                _flush()
+        elif name in _BOUNDARY_TAGS and block_depth == 0:
+            _flush()
+        if name == 'a':
+            link_depth -= 1
+
+        frame = frames.pop()
+        parent = frames[-1]
+        parent.text_len += frame.text_len
+        parent.link_len += frame.link_len
+        parent.para_len += frame.para_len
+
+        if name in _CONTAINER_TAGS and frame.para_len:
+            link_density = (frame.link_len / frame.text_len) if frame.text_len else 0.0
+            score = frame.para_len * (1.0 - link_density) * _TAG_BONUS.get(name, 1.0)
+            element_id, classes = attrs(node)
+            hints = ' '.join(classes) + ' ' + element_id
+            if _NEGATIVE_HINTS.search(hints):
+                score *= 0.3
+            elif _POSITIVE_HINTS.search(hints):
+                score *= 1.25
+            candidates.append(_Candidate(
+                node=node,
+                name=name,
+                element_id=element_id,
+                classes=classes,
+                depth=frame.depth,
+                start=frame.para_start,
+                end=len(paragraphs),
+                score=score,
+            ))
+
+    _flush()
+    return paragraphs, candidates
+
+
+def _pick_candidate(candidates: List[_Candidate]) -> Optional[_Candidate]:
+    if not candidates:
+        return None
+    best = max(candidates, key=lambda c: c.score)
+    if best.score <= 0:
+        return None
+    # Prefer the tightest container that keeps (almost) all of the best score.
+    threshold = best.score * 0.9
+    nested = [
+        c for c in candidates
+        if c.score >= threshold and c.start >= best.start and c.end <= best.end
+    ]
+    return max(nested, key=lambda c: c.depth) if nested else best
+
+
+def _selector_for(candidate: _Candidate) -> Optional[str]:
+    """A simple, stable selector for a winning container (tag#id or tag.class)."""
+    element_id = candidate.element_id
+    if element_id and _SAFE_NAME.match(element_id) and not re.search(r'\d{3,}', element_id):
+        return f"{candidate.name}#{element_id}"
+    for cls in candidate.classes:
+        if _POSITIVE_HINTS.search(cls) and _SAFE_NAME.match(cls) and not re.search(r'\d{3,}', cls):
+            return f"{candidate.name}.{cls}"
+    if candidate.name in {'article', 'main'}:
+        return candidate.name
+    return None
+
+
+def _split_selector(selector: str) -> Tuple[str, str, str]:
+    """Split 'tag#id' / 'tag.class' / 'tag' into (tag, id, class)."""
+    if '#' in selector:
+        name, element_id = selector.split('#', 1)
+        return name, element_id, ''
+    if '.' in selector:
+        name, cls = selector.split('.', 1)
+        return name, '', cls
+    return selector, '', ''
+
+
+class ArticleExtractor:
+    """Single-pass article text extraction with per-domain learned selectors.
+
+    The page is parsed once (lxml when installed), then one tree walk collects
+    paragraph text and scores candidate containers by text and link density.
+    The winning container's selector is remembered per domain, so the next
+    page from the same site only needs to walk that subtree.
+    """
+
+    def __init__(self, selectors_path: str = _DEFAULT_SELECTORS_PATH, parser: str = DEFAULT_PARSER):
+        self.selectors_path = selectors_path
+        self.parser = parser
+        self.selectors: Dict[str, Dict[str, Any]] = self._load_selectors(selectors_path)
+        self._dirty = False
+
+    @staticmethod
+    def _load_selectors(path: str) -> Dict[str, Dict[str, Any]]:
+        try:
+            if not path or not os.path.exists(path):
+                return {}
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except Exception:
+            return {}
+
+    def save(self) -> None:
+        if not self._dirty or not self.selectors_path:
+            return
+        try:
+            tmp_path = f"{self.selectors_path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.selectors, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.selectors_path)
+            self._dirty = False
+        except Exception as e:
+            logger.warning(f"⚠️ Could not write extractor selectors {self.selectors_path}: {e}")
+
+    def _learn(self, domain: str, candidate: _Candidate) -> None:
+        if not domain:
+            return
+        selector = _selector_for(candidate)
+        if not selector:
+            return
+        entry = self.selectors.get(domain)
+        if isinstance(entry, dict) and entry.get('selector') == selector:
+            entry['hits'] = int(entry.get('hits', 0)) + 1
+        else:
+            self.selectors[domain] = {'selector': selector, 'hits': 1}
+        self.selectors[domain]['updated_at'] = datetime.now().isoformat(timespec='seconds')
+        self._dirty = True
+
+    def _parse(self, html: str) -> Tuple[Any, bool]:
+        """Parse a page, returning (root, is_lxml)."""
+        if self.parser == 'lxml' and LXML_AVAILABLE:
+            try:
+                return lxml.html.document_fromstring(html), True
+            except ValueError:
+                # Unicode input with an XML encoding declaration
+                try:
+                    return lxml.html.document_fromstring(html.encode('utf-8')), True
+                except (ValueError, etree.ParserError):
+                    pass
+            except etree.ParserError:
+                pass
+        return BeautifulSoup(html, 'html.parser' if self.parser == 'lxml' else self.parser), False
+
+    @staticmethod
+    def _find(root: Any, is_lxml: bool, selector: str) -> Any:
+        name, element_id, cls = _split_selector(selector)
+        if not _SAFE_NAME.match(name) or not _SAFE_NAME.match(element_id or cls or name):
+            return None
+        if is_lxml:
+            if element_id:
+                xpath = f".//{name}[@id='{element_id}']"
+            elif cls:
+                xpath = f".//{name}[contains(concat(' ', normalize-space(@class), ' '), ' {cls} ')]"
+            else:
+                xpath = f".//{name}"
+            found = root.xpath(xpath)
+            return found[0] if found else None
+        if element_id:
+            return root.find(name, id=element_id)
+        if cls:
+            return root.find(name, class_=cls)
+        return root.find(name)
+
+    def extract(self, html: str, url: str = '', max_chars: int = 5000) -> str:
+        """Return the main article text of an HTML page ('' if nothing article-like is found)."""
+        if not html:
+            return ""
+        root, is_lxml = self._parse(html)
+        events = _lxml_events if is_lxml else _bs4_events
+        attrs = _lxml_attrs if is_lxml else _bs4_attrs
+        domain = (urlparse(url).netloc or '').lower() if url else ''
+
+        # Fast path: walk only the subtree that worked for this site before.
+        learned = self.selectors.get(domain) if domain else None
+        if isinstance(learned, dict) and learned.get('selector'):
+            container = self._find(root, is_lxml, learned['selector'])
+            if container is not None:
+                paragraphs, _ = _walk(events(container), attrs)
+                text = ' '.join(paragraphs)
+                if len(text) >= MIN_ARTICLE_CHARS:
+                    return text[:max_chars]
+            # Layout changed; fall through and relearn.
+            self.selectors.pop(domain, None)
+            self._dirty = True
+
+        paragraphs, candidates = _walk(events(root), attrs)
+        best = _pick_candidate(candidates)
+        if best is not None:
+            text = ' '.join(paragraphs[best.start:best.end])
+            if len(text) >= MIN_ARTICLE_CHARS:
+                self._learn(domain, best)
+                return text[:max_chars]
+
+        # Fallback: every paragraph on the page
+        return ' '.join(paragraphs)[:max_chars]
+
+
+def extract_article_text(html: str, url: str = '', max_chars: int = 5000) -> str:
+    """Convenience wrapper without selector persistence."""
+    return ArticleExtractor(selectors_path='').extract(html, url, max_chars=max_chars)
@@ -0,0 +1,94 @@
+import asyncio
+import contextlib
+import logging
+from typing import Any, AsyncIterator, Iterable, Optional
+
+try:
+    from playwright.async_api import async_playwright
+    PLAYWRIGHT_AVAILABLE = True
+except ImportError:
+    PLAYWRIGHT_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_USER_AGENT = 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
+DEFAULT_BLOCKED_RESOURCES = ('image', 'font', 'media')
+
+
+class BrowserPool:
+    """One headless Chromium (and browser context) shared by all JS-rendered pages in a run.
+
+    The browser starts on the first ``page()`` request and stays up until
+    ``close()``. At most ``max_pages`` pages are open at once, and requests for
+    the blocked resource types (images, fonts, media by default) are aborted
+    before they hit the network.
+    """
+
+    def __init__(
+        self,
+        max_pages: int = 2,
+        blocked_resource_types: Iterable[str] = DEFAULT_BLOCKED_RESOURCES,
+        user_agent: str = DEFAULT_USER_AGENT,
+    ):
+        self.max_pages = max(1, int(max_pages))
+        self.blocked_resource_types = {t.strip().lower() for t in blocked_resource_types if t and t.strip()}
+        self.user_agent = user_agent
+        self._playwright: Any = None
+        self._browser: Any = None
+        self._context: Any = None
+        self._start_lock: Optional[asyncio.Lock] = None
+        self._page_slots: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _bind_loop(self) -> None:
+        # Locks/semaphores belong to one event loop; a new asyncio.run() starts over.
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._start_lock = asyncio.Lock()
+            self._page_slots = asyncio.Semaphore(self.max_pages)
+            self._playwright = self._browser = self._context = None
+
+    async def _route(self, route: Any) -> None:
+        if route.request.resource_type in self.blocked_resource_types:
+            await route.abort()
+        else:
+            await route.continue_()
+
+    async def _ensure_started(self) -> None:
+        async with self._start_lock:
+            if self._context is not None:
+                return
+            logger.info("🌐 Starting shared headless browser")
+            self._playwright = await async_playwright().start()
+            self._browser = await self._playwright.chromium.launch(headless=True)
+            self._context = await self._browser.new_context(user_agent=self.user_agent)
+            if self.blocked_resource_types:
+                await self._context.route('**/*', self._route)
+
+    @contextlib.asynccontextmanager
+    async def page(self) -> AsyncIterator[Any]:
+        """Yield a fresh page in the shared context, waiting for a free slot."""
+        if not PLAYWRIGHT_AVAILABLE:
+            raise RuntimeError("Playwright not available")
+        self._bind_loop()
+        async with self._page_slots:
+            await self._ensure_started()
+            page = await self._context.new_page()
+            try:
+                yield page
+            finally:
+                try:
+                    await page.close()
+                except Exception:
+                    pass
+
+    async def close(self) -> None:
+        for resource, method in ((self._context, 'close'), (self._browser, 'close'), (self._playwright, 'stop')):
+            if resource is None:
+                continue
+            try:
+                await getattr(resource, method)()
+            except Exception as e:
+                logger.debug(f"Browser pool shutdown: {e}")
+        self._playwright = self._browser = self._context = None
@@ -0,0 +1,298 @@
+import bisect
+import glob
+import hashlib
+import json
+import os
+import re
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set
+
+from .news_dedupe import title_fingerprint
+
+_DEFAULT_ARCHIVE_PATH = "episode_archive.jsonl"
+_LEGACY_PATTERN = "episode_articles_*.json"
+_LEGACY_NAME_RE = re.compile(r"episode_articles_(\d{8})_(\d{6})\.json$")
+_INDEX_VERSION = 1
+# The index remembers a hash of the archive's first bytes to notice a replaced archive
+_HEAD_BYTES = 4096
+
+# Only what later runs need from an archived article
+ARCHIVE_FIELDS = ("source", "title", "link")
+
+
+def _compact_article(article: Dict[str, Any]) -> Dict[str, str]:
+    return {field: (article.get(field) or "").strip() for field in ARCHIVE_FIELDS}
+
+
+def _title_tokens(title: str) -> Set[str]:
+    fp = title_fingerprint((title or "").strip())
+    return set(fp.split(" ")) if fp else set()
+
+
+def _file_head_hash(path: str, length: int) -> str:
+    with open(path, "rb") as f:
+        return hashlib.blake2b(f.read(min(length, _HEAD_BYTES)), digest_size=8).hexdigest()
+
+
+class TitleIndex:
+    """Inverted index from title tokens (``title_fingerprint`` words) to archived articles.
+
+    Items are kept in archive (date) order and posting lists hold ascending item
+    ids, so ``window`` narrows the index to a date range with two bisects and
+    token frequencies/candidates are counted within that range only.
+    """
+
+    def __init__(self, items: Optional[List[List[str]]] = None, postings: Optional[Dict[str, List[int]]] = None):
+        # Each item is [date "YYYY-MM-DD", source, title, link]
+        self.items: List[List[str]] = items or []
+        self.postings: Dict[str, List[int]] = postings or {}
+        self.archive_bytes = 0
+        self.archive_head = ""
+        self._lo = 0
+        self._hi = len(self.items)
+        self._tokens: Dict[int, Set[str]] = {}
+
+    @classmethod
+    def build(cls, articles: Iterable[Dict[str, Any]]) -> "TitleIndex":
+        """In-memory index over article dicts (``date`` may be a datetime or missing)."""
+        def _day(article: Dict[str, Any]) -> str:
+            when = article.get("date")
+            return when.date().isoformat() if isinstance(when, datetime) else ""
+
+        index = cls()
+        for article in sorted(articles or [], key=_day):
+            index.add(_day(article), article)
+        return index
+
+    def add(self, episode_day: str, article: Dict[str, Any]) -> None:
+        compact = _compact_article(article)
+        item_id = len(self.items)
+        self.items.append([episode_day, compact["source"], compact["title"], compact["link"]])
+        for token in _title_tokens(compact["title"]):
+            self.postings.setdefault(token, []).append(item_id)
+        self._hi = len(self.items)
+
+    def window(self, since: date, until: Optional[date] = None) -> "TitleIndex":
+        """View of the items dated ``since``..``until`` (inclusive); shares storage with this index."""
+        days = [item[0] for item in self.items]
+        view = TitleIndex(self.items, self.postings)
+        view._tokens = self._tokens
+        view._lo = bisect.bisect_left(days, since.isoformat())
+        view._hi = bisect.bisect_right(days, until.isoformat()) if until else len(days)
+        return view
+
+    def __len__(self) -> int:
+        return max(0, self._hi - self._lo)
+
+    def ids(self) -> range:
+        return range(self._lo, self._hi)
+
+    def _postings_in_window(self, token: str) -> List[int]:
+        posting = self.postings.get(token)
+        if not posting:
+            return []
+        return posting[bisect.bisect_left(posting, self._lo):bisect.bisect_left(posting, self._hi)]
+
+    def frequency(self, token: str) -> int:
+        """Number of items in the window whose title contains ``token``."""
+        posting = self.postings.get(token)
+        if not posting:
+            return 0
+        return bisect.bisect_left(posting, self._hi) - bisect.bisect_left(posting, self._lo)
+
+    def candidates(self, tokens: Iterable[str]) -> List[int]:
+        """Ids of items in the window sharing at least one of ``tokens``, newest first."""
+        found: Set[int] = set()
+        for token in tokens:
+            found.update(self._postings_in_window(token))
+        return sorted(found, reverse=True)
+
+    def tokens(self, item_id: int) -> Set[str]:
+        cached = self._tokens.get(item_id)
+        if cached is None:
+            cached = _title_tokens(self.items[item_id][2])
+            self._tokens[item_id] = cached
+        return cached
+
+    def article(self, item_id: int) -> Dict[str, Any]:
+        """``{'date': datetime, 'source', 'title', 'link'}``, like ``EpisodeArchive.query`` results."""
+        day, source, title, link = self.items[item_id]
+        try:
+            when: Any = datetime.strptime(day, "%Y-%m-%d")
+        except ValueError:
+            when = None
+        return {"date": when, "source": source, "title": title, "link": link}
+
+    @classmethod
+    def load(cls, path: str) -> Optional["TitleIndex"]:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(data, dict) or data.get("version") != _INDEX_VERSION:
+            return None
+        index = cls(data.get("items") or [], data.get("postings") or {})
+        index.archive_bytes = int(data.get("archive_bytes", 0) or 0)
+        index.archive_head = str(data.get("archive_head", ""))
+        return index
+
+    def save(self, path: str) -> None:
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "version": _INDEX_VERSION,
+                "archive_bytes": self.archive_bytes,
+                "archive_head": self.archive_head,
+                "items": self.items,
+                "postings": self.postings,
+            }, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp_path, path)
+
+
+class EpisodeArchive:
+    """All episodes' referenced articles in one append-only JSONL file.
+
+    Each line is one episode: ``{"date": "YYYY-MM-DD", "run_id": ..., "articles": [...]}``
+    with only source/title/link per article. Lines are appended in date order, so
+    ``query`` reads the file backwards and stops at the first episode older than
+    the requested range; a run touches only the episodes it asks for.
+    """
+
+    def __init__(self, path: str = _DEFAULT_ARCHIVE_PATH, legacy_pattern: str = _LEGACY_PATTERN):
+        self.path = path
+        self.legacy_pattern = legacy_pattern
+        # episode_archive.jsonl -> episode_archive.index.json
+        self.index_path = f"{os.path.splitext(path)[0]}.index.json"
+
+    def append(self, episode_date: date, articles: List[Dict[str, Any]], run_id: str = "") -> None:
+        self.ensure_imported()
+        record = {
+            "date": episode_date.isoformat(),
+            "run_id": run_id,
+            "articles": [_compact_article(a) for a in articles or []],
+        }
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def ensure_imported(self) -> int:
+        """Build the archive from legacy episode_articles_*.json files if it does not exist yet.
+
+        Returns the number of episodes imported (0 when the archive already exists).
+        """
+        if os.path.exists(self.path):
+            return 0
+        episodes = []
+        for article_file in glob.glob(self.legacy_pattern):
+            match = _LEGACY_NAME_RE.search(os.path.basename(article_file))
+            if not match:
+                continue
+            try:
+                file_date = datetime.strptime(match.group(1), "%Y%m%d").date()
+                with open(article_file, "r", encoding="utf-8") as f:
+                    articles = json.load(f) or []
+            except Exception:
+                continue
+            episodes.append((file_date, f"{match.group(1)}_{match.group(2)}", articles))
+        episodes.sort(key=lambda e: e[1])
+
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for file_date, run_id, articles in episodes:
+                record = {
+                    "date": file_date.isoformat(),
+                    "run_id": run_id,
+                    "articles": [_compact_article(a) for a in articles if isinstance(a, dict)],
+                }
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        os.replace(tmp_path, self.path)
+        return len(episodes)
+
+    def _lines_reversed(self, block_size: int = 65536) -> Iterator[str]:
+        with open(self.path, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            position = f.tell()
+            tail = b""
+            while position > 0:
+                step = min(block_size, position)
+                position -= step
+                f.seek(position)
+                chunk = f.read(step) + tail
+                lines = chunk.split(b"\n")
+                tail = lines.pop(0)
+                for line in reversed(lines):
+                    if line.strip():
+                        yield line.decode("utf-8", errors="replace")
+            if tail.strip():
+                yield tail.decode("utf-8", errors="replace")
+
+    def query(self, since: date, until: Optional[date] = None) -> List[Dict[str, Any]]:
+        """Articles of episodes dated ``since``..``until`` (inclusive), newest episode first.
+
+        Each result is ``{'date': datetime, 'source', 'title', 'link'}``.
+        """
+        self.ensure_imported()
+        since_key = since.isoformat()
+        until_key = until.isoformat() if until else None
+        results: List[Dict[str, Any]] = []
+        for line in self._lines_reversed():
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            episode_key = str(record.get("date", ""))
+            if episode_key < since_key:
+                break
+            if until_key and episode_key > until_key:
+                continue
+            try:
+                episode_dt = datetime.strptime(episode_key, "%Y-%m-%d")
+            except ValueError:
+                continue
+            for article in record.get("articles") or []:
+                results.append({"date": episode_dt, **_compact_article(article)})
+        return results
+
+    def title_index(self) -> TitleIndex:
+        """The persisted title-token index, brought up to date with the archive.
+
+        The archive is append-only, so only lines added since the index was last
+        saved are read; a shorter or replaced archive triggers a full rebuild.
+        """
+        self.ensure_imported()
+        size = os.path.getsize(self.path)
+        index = TitleIndex.load(self.index_path)
+        if (
+            index is None
+            or index.archive_bytes > size
+            or (index.archive_bytes and index.archive_head != _file_head_hash(self.path, index.archive_bytes))
+        ):
+            index = TitleIndex()
+        if index.archive_bytes == size:
+            return index
+
+        offset = index.archive_bytes
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            for raw in f:
+                if not raw.endswith(b"\n"):
+                    break  # a line still being written; pick it up next time
+                offset += len(raw)
+                try:
+                    record = json.loads(raw.decode("utf-8", errors="replace"))
+                except ValueError:
+                    continue
+                episode_day = str(record.get("date", ""))
+                for article in record.get("articles") or []:
+                    if isinstance(article, dict):
+                        index.add(episode_day, article)
+        index.archive_bytes = offset
+        index.archive_head = _file_head_hash(self.path, offset)
+        try:
+            index.save(self.index_path)
+        except OSError:
+            pass
+        return index
@@ -5,13 +5,7 @@ from dataclasses import dataclass, asdict
 from datetime import datetime
 from typing import Any, Dict, Iterable, List, Optional, Tuple
 
-
-_TITLE_STOPWORDS = {
-    'och', 'eller', 'men', 'att', 'som', 'det', 'den', 'detta', 'dessa', 'en', 'ett', 'i', 'på', 'av', 'till',
-    'för', 'med', 'utan', 'över', 'under', 'efter', 'före', 'om', 'när', 'där', 'här', 'från', 'mot',
-    'säger', 'sa', 'uppger', 'enligt', 'nya', 'ny', 'nu', 'idag', 'igår', 'imorgon',
-    'the', 'a', 'an', 'and', 'or', 'but', 'to', 'of', 'in', 'on', 'for', 'with', 'from', 'by', 'as', 'at',
-}
+from .news_dedupe import title_fingerprint as _title_fingerprint
 
 
 def _safe_int(value: Any) -> Optional[int]:
@@ -23,19 +17,6 @@ def _safe_int(value: Any) -> Optional[int]:
         return None
 
 
-def _title_fingerprint(title: str) -> str:
-    if not title:
-        return ""
-    text = title.lower()
-    text = re.sub(r"[^\w\såäöÅÄÖ-]", " ", text)
-    text = re.sub(r"\s+", " ", text).strip()
-    tokens = [t for t in text.split(" ") if len(t) >= 4 and t not in _TITLE_STOPWORDS and not t.isdigit()]
-    if not tokens:
-        return ""
-    tokens = sorted(set(tokens))
-    return " ".join(tokens[:12])
-
-
 def _infer_sport_label(title: str, link: str) -> Optional[str]:
     title_l = (title or "").lower()
     link_l = (link or "").lower()
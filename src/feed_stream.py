@@ -0,0 +1,149 @@
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, List, Optional
+from xml.etree.ElementTree import Element, XMLPullParser
+
+from feedparser import FeedParserDict
+
+_ENTRY_TAGS = {'item', 'entry'}
+_FEED_TAGS = {'channel', 'feed'}
+# Same mapping as feedparser: dc:date and Atom updated are 'updated', not 'published'
+_PUBLISHED_TAGS = {'published', 'pubDate', 'issued'}
+_UPDATED_TAGS = {'updated', 'modified', 'date'}
+
+
+def _local(tag: str) -> str:
+    """Strip the '{namespace}' prefix ElementTree puts on tag names."""
+    return tag.rsplit('}', 1)[-1] if '}' in tag else tag
+
+
+def _text(elem: Element) -> str:
+    # Atom allows type="xhtml" content as child elements
+    return ''.join(elem.itertext()).strip()
+
+
+def _parse_date(value: str) -> Optional[Any]:
+    """Parse RFC 822 (RSS) or ISO 8601 (Atom/Dublin Core) dates into a UTC struct_time."""
+    value = (value or '').strip()
+    if not value:
+        return None
+    dt: Optional[datetime] = None
+    try:
+        dt = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        try:
+            dt = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        except ValueError:
+            return None
+    if dt is None:
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc).timetuple()
+
+
+def _entry_from_element(elem: Element) -> FeedParserDict:
+    """Build a feedparser-compatible entry from an RSS <item> or Atom <entry>."""
+    entry = FeedParserDict()
+    content: List[Dict[str, str]] = []
+    guid = ''
+    for child in elem:
+        name = _local(child.tag)
+        if name == 'title' and 'title' not in entry:
+            entry['title'] = _text(child)
+        elif name == 'link':
+            href = child.get('href')
+            if href is not None:
+                # Atom: prefer rel="alternate" (the default when rel is missing)
+                if child.get('rel', 'alternate') == 'alternate' or 'link' not in entry:
+                    entry['link'] = href.strip()
+            elif 'link' not in entry:
+                entry['link'] = _text(child)
+        elif name in {'description', 'summary'} and 'summary' not in entry:
+            entry['summary'] = _text(child)
+        elif name in {'encoded', 'content'}:
+            value = _text(child)
+            if value:
+                content.append({'value': value})
+        elif name == 'guid':
+            guid = _text(child)
+        elif name in _PUBLISHED_TAGS and 'published_parsed' not in entry:
+            parsed = _parse_date(_text(child))
+            if parsed:
+                entry['published_parsed'] = parsed
+        elif name in _UPDATED_TAGS and 'updated_parsed' not in entry:
+            parsed = _parse_date(_text(child))
+            if parsed:
+                entry['updated_parsed'] = parsed
+    if content:
+        entry['content'] = content
+    if not entry.get('link') and guid.startswith('http'):
+        entry['link'] = guid
+    return entry
+
+
+class StreamedFeed:
+    """Feed entries collected by FeedStreamParser, shaped like feedparser's result."""
+
+    def __init__(self, title: str, entries: List[FeedParserDict], complete: bool):
+        self.feed = FeedParserDict(title=title) if title else FeedParserDict()
+        self.entries = entries
+        self.bozo = False
+        self.bozo_exception = None
+        # False when reading stopped early at the entry budget
+        self.complete = complete
+
+
+class FeedStreamParser:
+    """Incremental RSS/Atom reader that can stop once enough entries are parsed.
+
+    Feed it raw byte chunks as they arrive. ``done`` turns True when
+    ``max_entries`` entries are complete, so the caller can stop downloading.
+    Malformed XML raises ``ParseError``; callers then fall back to feedparser
+    on the full document.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max(1, int(max_entries))
+        self.entries: List[FeedParserDict] = []
+        self.title = ''
+        self._parser = XMLPullParser(events=('start', 'end'))
+        self._depth_in_entry = 0
+        self._feed_elem: Optional[Element] = None
+
+    @property
+    def done(self) -> bool:
+        return len(self.entries) >= self.max_entries
+
+    def feed(self, chunk: bytes) -> None:
+        self._parser.feed(chunk)
+        for event, elem in self._parser.read_events():
+            name = _local(elem.tag)
+            if event == 'start':
+                if name in _ENTRY_TAGS:
+                    self._depth_in_entry += 1
+                elif name in _FEED_TAGS and self._feed_elem is None:
+                    self._feed_elem = elem
+                continue
+
+            if name in _ENTRY_TAGS:
+                self._depth_in_entry -= 1
+                if self._depth_in_entry == 0:
+                    self.entries.append(_entry_from_element(elem))
+                    # Entries are not needed once converted; keep memory flat.
+                    elem.clear()
+                    if self._feed_elem is not None:
+                        try:
+                            self._feed_elem.remove(elem)
+                        except ValueError:
+                            pass
+                    if self.done:
+                        return
+            elif name == 'title' and not self.title and self._depth_in_entry == 0:
+                self.title = _text(elem)
+
+    def close(self) -> None:
+        self._parser.close()
+
+    def result(self, complete: bool) -> StreamedFeed:
+        return StreamedFeed(self.title, self.entries[: self.max_entries], complete)
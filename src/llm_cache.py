@@ -0,0 +1,228 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_DEFAULT_CACHE_PATH = "llm_cache.sqlite3"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    provider TEXT NOT NULL,
+    model TEXT NOT NULL,
+    response TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_responses_created_at ON responses(created_at);
+CREATE INDEX IF NOT EXISTS idx_responses_last_access ON responses(last_access);
+"""
+
+
+def llm_cache_key(
+    provider: str,
+    model: str,
+    messages: List[Dict[str, Any]],
+    temperature: Optional[float],
+    max_tokens: Optional[int],
+) -> str:
+    """Content address of an LLM request: everything that changes the answer, nothing else."""
+    payload = json.dumps(
+        {
+            "provider": (provider or "").strip().lower(),
+            "model": (model or "").strip(),
+            "messages": [
+                {"role": m.get("role", "user"), "content": m.get("content", "")} for m in messages or []
+            ],
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+        },
+        ensure_ascii=False,
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMCache:
+    """On-disk cache of LLM responses keyed by ``llm_cache_key``.
+
+    Entries older than ``ttl_hours`` are ignored and evicted; when more than
+    ``max_entries`` remain, the least recently used ones are dropped. Every
+    ``put`` is committed at once: the point is to survive a crash later in the run.
+    """
+
+    def __init__(self, path: str = _DEFAULT_CACHE_PATH, ttl_hours: float = 48, max_entries: int = 200):
+        self.path = path
+        self.ttl_seconds = max(0.0, float(ttl_hours)) * 3600
+        self.max_entries = max(1, int(max_entries))
+        self.hits = 0
+        self.misses = 0
+        self._conn: Optional[sqlite3.Connection] = None
+        # The GUI calls the generator from worker threads
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.executescript(_SCHEMA)
+        return self._conn
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response for ``key``, or None if missing/expired."""
+        if not key:
+            return None
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute("SELECT response, created_at FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None or row[1] < time.time() - self.ttl_seconds:
+                self.misses += 1
+                return None
+            conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (time.time(), key))
+            conn.commit()
+            self.hits += 1
+            return row[0]
+
+    def put(self, key: str, response: str, provider: str = "", model: str = "") -> None:
+        if not key or not response:
+            return
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, provider, model, response, created_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, provider or "", model or "", response, now, now),
+            )
+            self._evict(conn)
+            conn.commit()
+
+    def _evict(self, conn: sqlite3.Connection) -> int:
+        removed = conn.execute(
+            "DELETE FROM responses WHERE created_at < ?", (time.time() - self.ttl_seconds,)
+        ).rowcount
+        (count,) = conn.execute("SELECT COUNT(*) FROM responses").fetchone()
+        if count > self.max_entries:
+            removed += conn.execute(
+                "DELETE FROM responses WHERE key IN "
+                "(SELECT key FROM responses ORDER BY last_access ASC LIMIT ?)",
+                (count - self.max_entries,),
+            ).rowcount
+        return removed
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is None:
+                return
+            self._conn.close()
+            self._conn = None
+
+
+_default_cache: Optional[LLMCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def _env_flag(name: str) -> bool:
+    return os.getenv(name, "").strip().lower() in {"1", "true", "yes", "on"}
+
+
+def default_llm_cache() -> Optional[LLMCache]:
+    """Process-wide cache configured by MMM_LLM_CACHE* (None when disabled)."""
+    global _default_cache
+    path = os.getenv("MMM_LLM_CACHE", _DEFAULT_CACHE_PATH).strip()
+    if not path or path.lower() in {"0", "false", "no"}:
+        return None
+    with _default_cache_lock:
+        if _default_cache is None or _default_cache.path != path:
+            _default_cache = LLMCache(
+                path,
+                ttl_hours=float(os.getenv("MMM_LLM_CACHE_TTL_HOURS", "48") or 48),
+                max_entries=int(os.getenv("MMM_LLM_CACHE_MAX_ENTRIES", "200") or 200),
+            )
+        return _default_cache
+
+
+def _lookup(cache: LLMCache, key: str, provider: str, model: str, use_cache: bool) -> Optional[str]:
+    if not use_cache or _env_flag("MMM_LLM_CACHE_BYPASS"):
+        return None
+    try:
+        cached = cache.get(key)
+    except sqlite3.Error as e:
+        logger.warning(f"[LLM-CACHE] Kunde inte läsa cachen: {e}")
+        return None
+    if cached is not None:
+        logger.info(f"[LLM-CACHE] ♻️ Återanvänder sparat svar ({provider}/{model}, {len(cached)} tecken)")
+    return cached
+
+
+def _store(
+    cache: LLMCache, key: str, response: str, provider: str, model: str, accept: Optional[Callable[[str], bool]]
+) -> None:
+    if not response or (accept is not None and not accept(response)):
+        return
+    try:
+        cache.put(key, response, provider=provider, model=model)
+    except sqlite3.Error as e:
+        logger.warning(f"[LLM-CACHE] Kunde inte spara svaret: {e}")
+
+
+def cached_llm_call(
+    provider: str,
+    model: str,
+    messages: List[Dict[str, Any]],
+    temperature: Optional[float],
+    max_tokens: Optional[int],
+    call: Callable[[], str],
+    *,
+    use_cache: bool = True,
+    accept: Optional[Callable[[str], bool]] = None,
+) -> str:
+    """Return the cached response for this request, or run ``call()`` and cache its result.
+
+    ``use_cache=False`` (or MMM_LLM_CACHE_BYPASS=1) skips the lookup but still stores
+    the fresh response, so a forced re-run refreshes the cache. Responses that
+    ``accept`` rejects (e.g. unparsable JSON) are returned but not stored.
+    """
+    cache = default_llm_cache()
+    if cache is None:
+        return call()
+    key = llm_cache_key(provider, model, messages, temperature, max_tokens)
+    cached = _lookup(cache, key, provider, model, use_cache)
+    if cached is not None:
+        return cached
+    response = call()
+    _store(cache, key, response, provider, model, accept)
+    return response
+
+
+async def acached_llm_call(
+    provider: str,
+    model: str,
+    messages: List[Dict[str, Any]],
+    temperature: Optional[float],
+    max_tokens: Optional[int],
+    call: Callable[[], Awaitable[str]],
+    *,
+    use_cache: bool = True,
+    accept: Optional[Callable[[str], bool]] = None,
+) -> str:
+    """Async ``cached_llm_call``; ``call`` returns an awaitable."""
+    cache = default_llm_cache()
+    if cache is None:
+        return await call()
+    key = llm_cache_key(provider, model, messages, temperature, max_tokens)
+    cached = _lookup(cache, key, provider, model, use_cache)
+    if cached is not None:
+        return cached
+    response = await call()
+    _store(cache, key, response, provider, model, accept)
+    return response
@@ -0,0 +1,420 @@
+import asyncio
+import json
+import logging
+import os
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Dict, Iterator, List, Optional, Tuple
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+OPENROUTER_URL = "https://openrouter.ai/api/v1/chat/completions"
+OPENAI_URL = "https://api.openai.com/v1/chat/completions"
+GEMINI_URL = "https://generativelanguage.googleapis.com/v1beta/models/{model}:generateContent"
+GEMINI_STREAM_URL = "https://generativelanguage.googleapis.com/v1beta/models/{model}:streamGenerateContent"
+
+PROVIDERS = ("openrouter", "openai", "gemini")
+_API_KEY_ENV = {"openrouter": "OPENROUTER_API_KEY", "openai": "OPENAI_API_KEY", "gemini": "GEMINI_API_KEY"}
+_OPENROUTER_HEADERS = {
+    "HTTP-Referer": "https://github.com/PontusDahlberg",
+    "X-Title": "MMM Podcast Generator",
+}
+
+# Worth another attempt: rate limits, overload and gateway hiccups
+RETRY_STATUSES = {408, 409, 425, 429, 500, 502, 503, 504, 529}
+
+
+class LLMError(RuntimeError):
+    """An LLM request that failed for good (after retries, or with a non-retryable status)."""
+
+    def __init__(self, message: str, provider: str = "", status: Optional[int] = None):
+        super().__init__(message)
+        self.provider = provider
+        self.status = status
+
+
+def parse_retry_after(value: Optional[str], now: Optional[datetime] = None) -> Optional[float]:
+    """Seconds to wait according to a Retry-After header (delta-seconds or HTTP date)."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - (now or datetime.now(timezone.utc))).total_seconds())
+
+
+def _parse_concurrency(spec: str) -> Dict[str, int]:
+    """``"openrouter=4,gemini=2"`` -> ``{"openrouter": 4, "gemini": 2}``."""
+    limits: Dict[str, int] = {}
+    for part in (spec or "").split(","):
+        name, _, value = part.partition("=")
+        try:
+            limits[name.strip().lower()] = max(1, int(value))
+        except ValueError:
+            continue
+    return limits
+
+
+class LLMClient:
+    """One pooled HTTP client for every chat-completion provider.
+
+    Sync calls share one keep-alive ``httpx.Client``; async calls share one
+    ``httpx.AsyncClient`` per event loop. Each provider has its own concurrency
+    limit, and failed requests (transport errors and ``RETRY_STATUSES``) are
+    retried with exponential backoff and full jitter, waiting at least as long as
+    the server's Retry-After asks for.
+    """
+
+    def __init__(
+        self,
+        *,
+        timeout: float = 90.0,
+        max_retries: int = 3,
+        backoff_base: float = 1.0,
+        backoff_max: float = 30.0,
+        max_retry_after: float = 120.0,
+        concurrency: Optional[Dict[str, int]] = None,
+    ):
+        self.timeout = float(timeout)
+        self.max_retries = max(0, int(max_retries))
+        self.backoff_base = max(0.0, float(backoff_base))
+        self.backoff_max = max(self.backoff_base, float(backoff_max))
+        self.max_retry_after = float(max_retry_after)
+        self.concurrency = {"openrouter": 4, "openai": 4, "gemini": 2}
+        self.concurrency.update(concurrency or {})
+        self.retries = 0
+        self._client: Optional[httpx.Client] = None
+        self._client_lock = threading.Lock()
+        self._thread_limits = {
+            provider: threading.BoundedSemaphore(limit) for provider, limit in self.concurrency.items()
+        }
+        # Async clients and semaphores belong to the event loop that created them
+        self._async_clients: Dict[int, httpx.AsyncClient] = {}
+        self._async_limits: Dict[Tuple[int, str], asyncio.Semaphore] = {}
+
+    def _limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=max(self.concurrency.values()) * 2,
+            max_keepalive_connections=max(self.concurrency.values()),
+            keepalive_expiry=60.0,
+        )
+
+    def _sync_client(self) -> httpx.Client:
+        with self._client_lock:
+            if self._client is None:
+                self._client = httpx.Client(timeout=self.timeout, limits=self._limits())
+            return self._client
+
+    def _async_client(self) -> httpx.AsyncClient:
+        loop_id = id(asyncio.get_running_loop())
+        client = self._async_clients.get(loop_id)
+        if client is None:
+            client = httpx.AsyncClient(timeout=self.timeout, limits=self._limits())
+            self._async_clients[loop_id] = client
+        return client
+
+    def _async_limit(self, provider: str) -> asyncio.Semaphore:
+        key = (id(asyncio.get_running_loop()), provider)
+        semaphore = self._async_limits.get(key)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.concurrency.get(provider, 4))
+            self._async_limits[key] = semaphore
+        return semaphore
+
+    @staticmethod
+    def build_request(
+        provider: str,
+        model: str,
+        messages: List[Dict[str, Any]],
+        temperature: Optional[float],
+        max_tokens: Optional[int],
+        api_key: str,
+    ) -> Tuple[str, Dict[str, str], Dict[str, str], Dict[str, Any]]:
+        """``(url, headers, params, json)`` for one chat completion."""
+        if provider == "gemini":
+            system_lines: List[str] = []
+            contents: List[Dict[str, Any]] = []
+            for msg in messages or []:
+                role = (msg.get("role") or "user").strip().lower()
+                text = (msg.get("content") or "").strip()
+                if not text:
+                    continue
+                if role == "system":
+                    system_lines.append(text)
+                    continue
+                contents.append({"role": "model" if role == "assistant" else "user", "parts": [{"text": text}]})
+            if not contents:
+                raise ValueError("Inga giltiga messages för Gemini-anrop")
+            generation_config: Dict[str, Any] = {}
+            if temperature is not None:
+                generation_config["temperature"] = temperature
+            if max_tokens:
+                generation_config["maxOutputTokens"] = max_tokens
+            payload: Dict[str, Any] = {"contents": contents, "generationConfig": generation_config}
+            if system_lines:
+                payload["systemInstruction"] = {"parts": [{"text": "\n\n".join(system_lines)}]}
+            return GEMINI_URL.format(model=model), {}, {"key": api_key}, payload
+
+        headers = {"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"}
+        if provider == "openrouter":
+            headers.update(_OPENROUTER_HEADERS)
+        payload = {"model": model, "messages": messages}
+        if temperature is not None:
+            payload["temperature"] = temperature
+        if max_tokens:
+            payload["max_tokens"] = max_tokens
+        return (OPENROUTER_URL if provider == "openrouter" else OPENAI_URL), headers, {}, payload
+
+    @staticmethod
+    def parse_response(provider: str, data: Dict[str, Any]) -> str:
+        if provider == "gemini":
+            candidates = data.get("candidates") or []
+            if not candidates:
+                raise LLMError("Gemini svar saknar candidates", provider)
+            parts = (candidates[0].get("content") or {}).get("parts") or []
+            text = "".join((p.get("text") or "") for p in parts).strip()
+            if not text:
+                raise LLMError("Gemini svar saknar text", provider)
+            return text
+        try:
+            return (data["choices"][0]["message"]["content"] or "").strip()
+        except (KeyError, IndexError, TypeError):
+            raise LLMError(f"{provider} svar saknar choices", provider)
+
+    @staticmethod
+    def parse_stream_chunk(provider: str, chunk: Dict[str, Any]) -> str:
+        """Text delta of one server-sent event (empty for role/usage-only events)."""
+        if chunk.get("error"):
+            error = chunk["error"]
+            raise LLMError(str(error.get("message") if isinstance(error, dict) else error), provider)
+        if provider == "gemini":
+            candidates = chunk.get("candidates") or []
+            parts = ((candidates[0].get("content") or {}).get("parts") or []) if candidates else []
+            return "".join((p.get("text") or "") for p in parts)
+        choices = chunk.get("choices") or []
+        if not choices:
+            return ""
+        return (choices[0].get("delta") or {}).get("content") or ""
+
+    def _prepare(
+        self,
+        provider: str,
+        model: str,
+        messages: List[Dict[str, Any]],
+        temperature: Optional[float],
+        max_tokens: Optional[int],
+        api_key: Optional[str],
+    ) -> Tuple[str, Tuple[str, Dict[str, str], Dict[str, str], Dict[str, Any]]]:
+        provider = (provider or "openrouter").strip().lower()
+        if provider not in PROVIDERS:
+            raise ValueError(f"Okänd LLM-provider: {provider}")
+        key = (api_key or os.getenv(_API_KEY_ENV[provider], "")).strip()
+        if not key:
+            raise ValueError(f"{_API_KEY_ENV[provider]} saknas i miljövariabler")
+        return provider, self.build_request(provider, model, messages, temperature, max_tokens, key)
+
+    def _retry_delay(self, attempt: int, response: Optional[httpx.Response]) -> float:
+        delay = random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+        if response is not None:
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            if retry_after is not None:
+                delay = max(delay, min(retry_after, self.max_retry_after))
+        return delay
+
+    def _should_retry(self, attempt: int, provider: str, error: str, response: Optional[httpx.Response]) -> bool:
+        if attempt >= self.max_retries:
+            return False
+        # A 2xx only gets here when its body was not JSON (proxy or HTML error page)
+        if response is not None and response.status_code >= 400 and response.status_code not in RETRY_STATUSES:
+            return False
+        self.retries += 1
+        logger.warning(f"[LLM] {provider}: {error}; försök {attempt + 2}/{self.max_retries + 1}")
+        return True
+
+    def complete(
+        self,
+        provider: str,
+        model: str,
+        messages: List[Dict[str, Any]],
+        *,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        api_key: Optional[str] = None,
+    ) -> str:
+        """Run one chat completion and return the response text."""
+        provider, (url, headers, params, payload) = self._prepare(
+            provider, model, messages, temperature, max_tokens, api_key
+        )
+        client = self._sync_client()
+        attempt = 0
+        while True:
+            response: Optional[httpx.Response] = None
+            with self._thread_limits.setdefault(provider, threading.BoundedSemaphore(4)):
+                try:
+                    response = client.post(url, headers=headers, params=params, json=payload)
+                    if response.status_code < 400:
+                        return self.parse_response(provider, response.json())
+                    error = f"HTTP {response.status_code}: {response.text[:200]}"
+                except httpx.HTTPError as e:
+                    error = f"{type(e).__name__}: {e}"
+                except ValueError:
+                    error = f"Ogiltigt JSON-svar (HTTP {response.status_code}): {response.text[:200]}"
+            if not self._should_retry(attempt, provider, error, response):
+                raise LLMError(error, provider, response.status_code if response is not None else None)
+            time.sleep(self._retry_delay(attempt, response))
+            attempt += 1
+
+    async def acomplete(
+        self,
+        provider: str,
+        model: str,
+        messages: List[Dict[str, Any]],
+        *,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        api_key: Optional[str] = None,
+    ) -> str:
+        """Async ``complete``; concurrent calls overlap up to the provider's limit."""
+        provider, (url, headers, params, payload) = self._prepare(
+            provider, model, messages, temperature, max_tokens, api_key
+        )
+        client = self._async_client()
+        attempt = 0
+        while True:
+            response: Optional[httpx.Response] = None
+            async with self._async_limit(provider):
+                try:
+                    response = await client.post(url, headers=headers, params=params, json=payload)
+                    if response.status_code < 400:
+                        return self.parse_response(provider, response.json())
+                    error = f"HTTP {response.status_code}: {response.text[:200]}"
+                except httpx.HTTPError as e:
+                    error = f"{type(e).__name__}: {e}"
+                except ValueError:
+                    error = f"Ogiltigt JSON-svar (HTTP {response.status_code}): {response.text[:200]}"
+            if not self._should_retry(attempt, provider, error, response):
+                raise LLMError(error, provider, response.status_code if response is not None else None)
+            await asyncio.sleep(self._retry_delay(attempt, response))
+            attempt += 1
+
+    def stream(
+        self,
+        provider: str,
+        model: str,
+        messages: List[Dict[str, Any]],
+        *,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        api_key: Optional[str] = None,
+    ) -> Iterator[str]:
+        """Run one chat completion as a stream and yield text deltas as they arrive.
+
+        Connecting is retried like ``complete``; once text has been yielded a
+        failure is raised instead, since a retry would repeat what the caller
+        already consumed. Close the generator to abort the request early.
+        """
+        provider, (url, headers, params, payload) = self._prepare(
+            provider, model, messages, temperature, max_tokens, api_key
+        )
+        if provider == "gemini":
+            url = GEMINI_STREAM_URL.format(model=model)
+            params = {**params, "alt": "sse"}
+        else:
+            payload = {**payload, "stream": True}
+        client = self._sync_client()
+        attempt = 0
+        started = False
+        while True:
+            response: Optional[httpx.Response] = None
+            with self._thread_limits.setdefault(provider, threading.BoundedSemaphore(4)):
+                try:
+                    with client.stream("POST", url, headers=headers, params=params, json=payload) as response:
+                        if response.status_code < 400:
+                            for line in response.iter_lines():
+                                if not line.startswith("data:"):
+                                    continue  # keep-alive comments and blank separators
+                                data = line[5:].strip()
+                                if data == "[DONE]":
+                                    return
+                                try:
+                                    chunk = json.loads(data)
+                                except ValueError:
+                                    continue
+                                delta = self.parse_stream_chunk(provider, chunk)
+                                if delta:
+                                    started = True
+                                    yield delta
+                            return
+                        response.read()
+                        error = f"HTTP {response.status_code}: {response.text[:200]}"
+                except httpx.HTTPError as e:
+                    if started:
+                        raise LLMError(f"Strömmen bröts: {type(e).__name__}: {e}", provider)
+                    error = f"{type(e).__name__}: {e}"
+            if not self._should_retry(attempt, provider, error, response):
+                raise LLMError(error, provider, response.status_code if response is not None else None)
+            time.sleep(self._retry_delay(attempt, response))
+            attempt += 1
+
+    def gather(self, calls: List[Awaitable[Any]]) -> List[Any]:
+        """Run coroutines concurrently from sync code; failures are returned as exceptions.
+
+        Uses a fresh event loop (in a worker thread when the caller already runs
+        one) and closes that loop's async HTTP client afterwards.
+        """
+        async def _run() -> List[Any]:
+            try:
+                return await asyncio.gather(*calls, return_exceptions=True)
+            finally:
+                loop_id = id(asyncio.get_running_loop())
+                client = self._async_clients.pop(loop_id, None)
+                for key in [k for k in self._async_limits if k[0] == loop_id]:
+                    del self._async_limits[key]
+                if client is not None:
+                    await client.aclose()
+
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(_run())
+        results: List[Any] = []
+        worker = threading.Thread(target=lambda: results.extend(asyncio.run(_run())))
+        worker.start()
+        worker.join()
+        return results
+
+    def close(self) -> None:
+        with self._client_lock:
+            if self._client is not None:
+                self._client.close()
+                self._client = None
+
+
+_default_client: Optional[LLMClient] = None
+_default_client_lock = threading.Lock()
+
+
+def default_llm_client() -> LLMClient:
+    """Process-wide client configured by MMM_LLM_TIMEOUT, MMM_LLM_MAX_RETRIES and MMM_LLM_CONCURRENCY."""
+    global _default_client
+    with _default_client_lock:
+        if _default_client is None:
+            _default_client = LLMClient(
+                timeout=float(os.getenv("MMM_LLM_TIMEOUT", "90") or 90),
+                max_retries=int(os.getenv("MMM_LLM_MAX_RETRIES", "3") or 3),
+                concurrency=_parse_concurrency(os.getenv("MMM_LLM_CONCURRENCY", "")),
+            )
+        return _default_client
@@ -54,7 +54,7 @@ class MorgonPoddService:
             try:
                 filtered_data, dedupe_stats = filter_scraped_data_for_freshness(
                     scraped_data,
-                    history_path="news_history.json",
+                    history_path="news_history.jsonl",
                     dedupe_days=21,
                     retain_days=60,
                     allow_followups=True,
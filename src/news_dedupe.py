@@ -1,25 +1,42 @@
 import json
 import os
 import re
+import time
 from dataclasses import dataclass
-from datetime import datetime, timedelta, timezone
+from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional, Tuple
 from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
 
 
-_DEFAULT_HISTORY_PATH = "news_history.json"
+_DEFAULT_HISTORY_PATH = "news_history.jsonl"
 
 
+# The set run_podcast_complete.py used for the url:/title: keys already in the
+# persisted history, so existing title keys keep matching.
 _TITLE_STOPWORDS = {
-    "och", "att", "det", "som", "för", "från", "med", "till", "har", "här", "den", "detta",
-    "samt", "även", "inte", "mer", "mot", "nya", "ny", "nu", "idag", "i", "på", "av",
-    "en", "ett", "om", "ur", "vid", "efter", "under", "över", "kring", "sin", "sitt", "sina",
-    "sverige", "svenska", "stockholm", "göteborg", "malmö",
+    "och", "eller", "men", "att", "som", "det", "den", "detta", "dessa", "en", "ett", "i", "på", "av", "till",
+    "för", "med", "utan", "över", "under", "efter", "före", "om", "när", "där", "här", "från", "mot",
+    "säger", "sa", "uppger", "enligt", "nya", "ny", "nu", "idag", "igår", "imorgon",
+    "the", "a", "an", "and", "or", "but", "to", "of", "in", "on", "for", "with", "from", "by", "as", "at",
 }
 
+_TITLE_PUNCT_RE = re.compile(r"[^\w\såäöÅÄÖ-]")
+_WHITESPACE_RE = re.compile(r"\s+")
 
-def _utc_now() -> datetime:
-    return datetime.now(timezone.utc)
+# Memoized (canonical URL, title fingerprint) on article dicts; see article_keys()
+_KEYS_FIELD = "_dedupe_keys"
+
+
+def _epoch_now() -> int:
+    return int(time.time())
+
+
+def _to_epoch(value: Any) -> int:
+    """Convert an ISO timestamp (naive means UTC) to epoch seconds."""
+    dt = datetime.fromisoformat(value)
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return int(dt.timestamp())
 
 
 def canonicalize_url(url: str) -> str:
@@ -45,8 +62,8 @@ def title_fingerprint(title: str) -> str:
     if not title:
         return ""
     text = title.lower()
-    text = re.sub(r"[^\w\såäöÅÄÖ-]", " ", text)
-    text = re.sub(r"\s+", " ", text).strip()
+    text = _TITLE_PUNCT_RE.sub(" ", text)
+    text = _WHITESPACE_RE.sub(" ", text).strip()
     tokens = [
         t
         for t in text.split(" ")
@@ -58,6 +75,34 @@ def title_fingerprint(title: str) -> str:
     return " ".join(tokens[:12])
 
 
+def article_keys(article: Dict[str, Any]) -> Tuple[str, str]:
+    """Return (canonical URL, title fingerprint) of an article, computed once per dict.
+
+    The keys are memoized on the dict under ``_dedupe_keys`` (copies made with
+    ``dict(article)`` keep them). Use ``public_fields`` before writing articles to disk.
+    """
+    memo = article.get(_KEYS_FIELD)
+    if isinstance(memo, tuple) and len(memo) == 2:
+        return memo
+    keys = (
+        canonicalize_url((article.get("link") or "").strip()),
+        title_fingerprint((article.get("title") or "").strip()),
+    )
+    article[_KEYS_FIELD] = keys
+    return keys
+
+
+def history_keys(article: Dict[str, Any]) -> Tuple[str, str]:
+    """The ("url:...", "title:...") history keys of an article ("" when missing)."""
+    url_key, fp = article_keys(article)
+    return (f"url:{url_key}" if url_key else "", f"title:{fp}" if fp else "")
+
+
+def public_fields(article: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy of an article without the memoized dedupe keys."""
+    return {k: v for k, v in article.items() if k != _KEYS_FIELD}
+
+
 def is_weather_source(source_type: str) -> bool:
     return (source_type or "").lower() == "weather"
 
@@ -82,79 +127,235 @@ class DedupeStats:
 
 
 class NewsHistory:
-    def __init__(self, path: str = _DEFAULT_HISTORY_PATH):
-        self.path = path
-        self.data: Dict[str, Any] = {"version": 1, "items": {}}
+    """When url:/title: keys were last used, kept as an append-only log.
+
+    ``save()`` appends one line per ``mark_seen`` batch instead of rewriting the
+    whole history. The log is compacted (one line per live key) once it holds
+    more than twice as many entries as there are live keys. A legacy
+    ``news_history.json`` next to the log is imported on first load.
+    """
+
+    def __init__(self, path: str = _DEFAULT_HISTORY_PATH, compact_min_entries: int = 500):
+        if path.endswith(".json"):
+            # Old callers pass the JSON path; the log lives next to it.
+            self.legacy_path = path
+            self.path = f"{path}l"
+        else:
+            self.path = path
+            self.legacy_path = path[:-1] if path.endswith(".jsonl") else ""
+        self.compact_min_entries = max(0, int(compact_min_entries))
+        # key -> [first_seen, last_seen, count], times as UTC epoch seconds
+        self.items: Dict[str, List[int]] = {}
+        # key -> last use known from elsewhere (merge_seen); consulted, never saved
+        self._merged: Dict[str, int] = {}
+        self._pending: List[Tuple[int, List[str]]] = []
+        self._logged_entries = 0
+        self._needs_compaction = False
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.items or key in self._merged
+
+    def _apply(self, key: str, first_seen: int, last_seen: int, count: int = 1) -> None:
+        entry = self.items.get(key)
+        if entry is None:
+            self.items[key] = [first_seen, last_seen, count]
+        else:
+            entry[0] = min(entry[0], first_seen)
+            entry[1] = max(entry[1], last_seen)
+            entry[2] += count
 
     def load(self) -> None:
-        if not os.path.exists(self.path):
-            self.data = {"version": 1, "items": {}}
-            return
+        self.items = {}
+        self._merged = {}
+        self._pending = []
+        self._logged_entries = 0
+        self._needs_compaction = False
+        if os.path.exists(self.path):
+            self._load_log()
+        elif self.legacy_path and os.path.exists(self.legacy_path):
+            self._load_legacy()
+            self._needs_compaction = True
+
+    def _load_log(self) -> None:
         try:
             with open(self.path, "r", encoding="utf-8") as f:
-                self.data = json.load(f)
-            if not isinstance(self.data, dict) or "items" not in self.data:
-                self.data = {"version": 1, "items": {}}
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # A run killed mid-append leaves a partial last line
+                        self._needs_compaction = True
+                        continue
+                    if not isinstance(record, dict):
+                        continue
+                    if "k" in record:
+                        self._apply(str(record["k"]), int(record["f"]), int(record["l"]), int(record.get("c", 1)))
+                        self._logged_entries += 1
+                    elif "keys" in record:
+                        ts = int(record.get("t", 0))
+                        for key in record.get("keys") or []:
+                            self._apply(str(key), ts, ts)
+                            self._logged_entries += 1
         except Exception:
-            self.data = {"version": 1, "items": {}}
+            self.items = {}
+            self._needs_compaction = True
+
+    def _load_legacy(self) -> None:
+        try:
+            with open(self.legacy_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            items = data.get("items", {}) if isinstance(data, dict) else {}
+        except Exception:
+            return
+        for key, entry in (items if isinstance(items, dict) else {}).items():
+            try:
+                last_seen = _to_epoch(entry.get("last_seen"))
+                first_seen = _to_epoch(entry.get("first_seen") or entry.get("last_seen"))
+                self._apply(key, first_seen, last_seen, int(entry.get("count", 1)))
+            except Exception:
+                continue
+
+    def _should_compact(self) -> bool:
+        return self._needs_compaction or (
+            self._logged_entries > self.compact_min_entries and self._logged_entries > 2 * len(self.items)
+        )
 
     def save(self) -> None:
-        tmp_path = f"{self.path}.tmp"
-        with open(tmp_path, "w", encoding="utf-8") as f:
-            json.dump(self.data, f, ensure_ascii=False, indent=2)
-        os.replace(tmp_path, self.path)
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        if self._should_compact():
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                for key, (first_seen, last_seen, count) in self.items.items():
+                    f.write(json.dumps({"k": key, "f": first_seen, "l": last_seen, "c": count}, ensure_ascii=False) + "\n")
+            os.replace(tmp_path, self.path)
+            self._logged_entries = len(self.items)
+            self._needs_compaction = False
+        elif self._pending:
+            with open(self.path, "a", encoding="utf-8") as f:
+                for ts, keys in self._pending:
+                    f.write(json.dumps({"t": ts, "keys": keys}, ensure_ascii=False) + "\n")
+                    self._logged_entries += len(keys)
+        self._pending = []
 
     def prune(self, keep_days: int = 60) -> int:
-        items = self.data.get("items", {})
-        if not isinstance(items, dict):
-            self.data["items"] = {}
-            return 0
-
-        cutoff = _utc_now() - timedelta(days=keep_days)
-        removed = 0
-        for k in list(items.keys()):
-            try:
-                last_seen = datetime.fromisoformat(items[k].get("last_seen"))
-                if last_seen.tzinfo is None:
-                    last_seen = last_seen.replace(tzinfo=timezone.utc)
-                if last_seen < cutoff:
-                    items.pop(k, None)
-                    removed += 1
-            except Exception:
-                items.pop(k, None)
-                removed += 1
-        return removed
+        """Forget keys not seen for ``keep_days``; the log drops them at its next compaction."""
+        cutoff = _epoch_now() - int(keep_days * 86400)
+        expired = [key for key, entry in self.items.items() if entry[1] < cutoff]
+        for key in expired:
+            del self.items[key]
+        return len(expired)
+
+    def last_seen(self, key: str) -> Optional[int]:
+        """Latest known use of ``key`` (logged or merged), or None."""
+        entry = self.items.get(key)
+        merged = self._merged.get(key)
+        if entry is None:
+            return merged
+        return entry[1] if merged is None else max(entry[1], merged)
 
     def seen_within_days(self, key: str, days: int) -> bool:
         if not key:
             return False
-        items = self.data.get("items", {})
-        if not isinstance(items, dict) or key not in items:
-            return False
-        try:
-            last_seen = datetime.fromisoformat(items[key].get("last_seen"))
-            if last_seen.tzinfo is None:
-                last_seen = last_seen.replace(tzinfo=timezone.utc)
-            return last_seen >= (_utc_now() - timedelta(days=days))
-        except Exception:
-            return False
+        last = self.last_seen(key)
+        return last is not None and last >= _epoch_now() - int(days * 86400)
+
+    def seen_many(self, keys: List[str], days: int) -> List[bool]:
+        """``seen_within_days`` for many keys at once, with a single cutoff for the batch."""
+        cutoff = _epoch_now() - int(days * 86400)
+        last_seen = self.last_seen
+        result = []
+        for key in keys:
+            last = last_seen(key) if key else None
+            result.append(last is not None and last >= cutoff)
+        return result
 
-    def mark_seen(self, keys: List[str]) -> None:
-        items = self.data.setdefault("items", {})
-        if not isinstance(items, dict):
-            self.data["items"] = {}
-            items = self.data["items"]
+    def merge_seen(self, key: str, seen_at: int) -> None:
+        """Count ``key`` as used at ``seen_at`` for this session only.
 
-        now = _utc_now().isoformat()
-        for key in keys:
-            if not key:
+        Merged keys (e.g. from episode archives, which are re-read every run) are
+        consulted by the ``seen`` checks but never written to the log.
+        """
+        if not key:
+            return
+        current = self._merged.get(key)
+        if current is None or seen_at > current:
+            self._merged[key] = seen_at
+
+    def mark_seen(self, keys: List[str]) -> None:
+        now = _epoch_now()
+        batch = [key for key in keys if key]
+        for key in batch:
+            self._apply(key, now, now)
+        if batch:
+            self._pending.append((now, batch))
+
+
+class DedupeService:
+    """Single "used recently?" index for articles.
+
+    Wraps the persistent ``NewsHistory`` and folds in anything else that counts as
+    used (e.g. articles from recent episode archives) so every check consults the
+    same keys. Falls back to an in-memory index when the history cannot be read.
+    """
+
+    def __init__(self, history_path: str = _DEFAULT_HISTORY_PATH, dedupe_days: int = 21, retain_days: int = 60):
+        self.dedupe_days = dedupe_days
+        self.history = NewsHistory(history_path)
+        self.persistent = True
+        try:
+            self.history.load()
+            self.history.prune(keep_days=retain_days)
+        except Exception:
+            self.history = NewsHistory(history_path)
+            self.persistent = False
+
+    def __len__(self) -> int:
+        return len(self.history)
+
+    def absorb(self, articles: List[Dict[str, Any]], date_field: str = "date") -> int:
+        """Count archived articles (with a datetime in ``date_field``) as used on that day."""
+        absorbed = 0
+        for article in articles or []:
+            when = article.get(date_field)
+            if not isinstance(when, datetime):
                 continue
-            entry = items.get(key)
-            if not isinstance(entry, dict):
-                items[key] = {"first_seen": now, "last_seen": now, "count": 1}
-            else:
-                entry["last_seen"] = now
-                entry["count"] = int(entry.get("count", 0)) + 1
+            # Whole-day resolution, like the archive file names
+            seen_at = int(when.replace(hour=23, minute=59, second=59, microsecond=0).timestamp())
+            for key in history_keys(article):
+                if key:
+                    self.history.merge_seen(key, seen_at)
+                    absorbed += 1
+        return absorbed
+
+    def seen(self, article: Dict[str, Any]) -> Tuple[bool, bool]:
+        """(seen by URL, seen by title fingerprint) within ``dedupe_days``."""
+        url_seen, title_seen = self.history.seen_many(list(history_keys(article)), self.dedupe_days)
+        return url_seen, title_seen
+
+    def seen_many(self, articles: List[Dict[str, Any]]) -> List[bool]:
+        flat = [key for article in articles for key in history_keys(article)]
+        seen = self.history.seen_many(flat, self.dedupe_days)
+        return [seen[2 * i] or seen[2 * i + 1] for i in range(len(articles))]
+
+    def mark_used(self, articles: List[Dict[str, Any]]) -> None:
+        """Mark articles as used, including the other outlets' versions clustered under them."""
+        keys = []
+        for article in articles:
+            keys.extend(history_keys(article))
+            for alternate in article.get("alternates") or []:
+                if isinstance(alternate, dict):
+                    # Copy: alternates are written to disk as-is, without memoized keys
+                    keys.extend(history_keys(dict(alternate)))
+        self.history.mark_seen([key for key in keys if key])
+
+    def save(self) -> None:
+        if self.persistent:
+            self.history.save()
 
 
 def filter_scraped_data_for_freshness(
@@ -164,9 +365,7 @@ def filter_scraped_data_for_freshness(
     retain_days: int = 60,
     allow_followups: bool = True,
 ) -> Tuple[List[Dict[str, Any]], DedupeStats]:
-    history = NewsHistory(history_path)
-    history.load()
-    history.prune(keep_days=retain_days)
+    dedupe = DedupeService(history_path, dedupe_days=dedupe_days, retain_days=retain_days)
 
     total_in = 0
     total_out = 0
@@ -191,24 +390,15 @@ def filter_scraped_data_for_freshness(
             continue
 
         kept_items: List[Dict[str, Any]] = []
-        used_keys_to_mark: List[str] = []
 
-        for item in items:
+        # Items are only marked after the whole group, so one batched lookup per group
+        # sees exactly what per-item lookups would.
+        seen = dedupe.seen_many(items)
+
+        for item, is_repeat in zip(items, seen):
             title = (item.get("title") or "").strip()
-            link = (item.get("link") or "").strip()
             summary = (item.get("summary") or "").strip()
 
-            url_key = canonicalize_url(link)
-            fp = title_fingerprint(title)
-
-            key_url = f"url:{url_key}" if url_key else ""
-            key_title = f"title:{fp}" if fp else ""
-
-            is_repeat = (
-                (key_url and history.seen_within_days(key_url, dedupe_days))
-                or (key_title and history.seen_within_days(key_title, dedupe_days))
-            )
-
             followup_ok = allow_followups and is_follow_up_text(title, summary)
 
             if is_repeat and not followup_ok:
@@ -217,36 +407,21 @@ def filter_scraped_data_for_freshness(
                 continue
 
             kept_items.append(item)
-            if key_url:
-                used_keys_to_mark.append(key_url)
-            if key_title:
-                used_keys_to_mark.append(key_title)
 
         # If we filtered everything for a source, keep at least one item (best-effort)
         if not kept_items and items:
             kept_items = [items[0]]
-            title = (items[0].get("title") or "").strip()
-            link = (items[0].get("link") or "").strip()
-            summary = (items[0].get("summary") or "").strip()
-            url_key = canonicalize_url(link)
-            fp = title_fingerprint(title)
-            key_url = f"url:{url_key}" if url_key else ""
-            key_title = f"title:{fp}" if fp else ""
-            if key_url:
-                used_keys_to_mark.append(key_url)
-            if key_title:
-                used_keys_to_mark.append(key_title)
-
-        history.mark_seen(used_keys_to_mark)
+
+        dedupe.mark_used(kept_items)
 
         new_group = dict(source_group)
-        new_group["items"] = kept_items
+        new_group["items"] = [public_fields(item) for item in kept_items]
         filtered.append(new_group)
 
         total_out += len(kept_items)
         per_source[source_name]["out"] += len(kept_items)
 
-    history.save()
+    dedupe.save()
 
     return filtered, DedupeStats(
         total_items_in=total_in,
@@ -0,0 +1,170 @@
+import math
+import re
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+_TOKEN_PIECE_RE = re.compile(r"\w+|[^\w\s]")
+_SENTENCE_SPLIT_RE = re.compile(r"(?<=[.!?])\s+")
+_WORD_RE = re.compile(r"\w+")
+
+
+def estimate_tokens(text: str) -> int:
+    """Local token estimate: ~4 characters per word piece, one token per punctuation mark.
+
+    Close enough to BPE tokenizers on Swedish and English news text to budget
+    prompts without calling the provider's tokenizer.
+    """
+    return sum(max(1, math.ceil(len(piece) / 4)) for piece in _TOKEN_PIECE_RE.findall(text or ""))
+
+
+def _content_words(text: str) -> set:
+    return {w for w in _WORD_RE.findall((text or "").lower()) if len(w) >= 4}
+
+
+def extract_sentences(text: str, max_chars: int, focus: str = "") -> str:
+    """The most informative sentences of ``text`` that fit in ``max_chars``, in original order.
+
+    Sentences are scored by position (news leads first), overlap with ``focus``
+    (the title) and whether they carry numbers; whole sentences are picked
+    greedily. Only when not even one sentence fits is the best one cut at a word
+    boundary.
+    """
+    text = " ".join((text or "").split())
+    if len(text) <= max_chars:
+        return text
+    if max_chars <= 0:
+        return ""
+    sentences = [s for s in _SENTENCE_SPLIT_RE.split(text) if s]
+    focus_words = _content_words(focus)
+
+    def _score(index: int, sentence: str) -> float:
+        score = 1.0 / (1 + index)
+        if focus_words:
+            score += 1.5 * len(_content_words(sentence) & focus_words) / len(focus_words)
+        if re.search(r"\d", sentence):
+            score += 0.3
+        return score
+
+    ranked = sorted(range(len(sentences)), key=lambda i: _score(i, sentences[i]), reverse=True)
+    chosen: List[int] = []
+    used = 0
+    for index in ranked:
+        length = len(sentences[index]) + (1 if chosen else 0)
+        if used + length <= max_chars:
+            chosen.append(index)
+            used += length
+    if not chosen:
+        best = sentences[ranked[0]]
+        cut = best[: max(0, max_chars - 1)].rsplit(" ", 1)[0].rstrip(" ,;:-")
+        return cut + "…" if cut else ""
+    return " ".join(sentences[i] for i in sorted(chosen))
+
+
+def allocate_budget(
+    weights: Sequence[float],
+    total: int,
+    minimum: int = 0,
+    maximum: Optional[int] = None,
+    caps: Optional[Sequence[int]] = None,
+) -> List[int]:
+    """Split ``total`` proportionally to ``weights`` within ``[minimum, maximum]`` per share.
+
+    ``caps`` limit single shares (e.g. to the text an article actually has); what a
+    capped share cannot use is redistributed over the others.
+    """
+    count = len(weights)
+    if not count:
+        return []
+    limits = [
+        min(maximum if maximum is not None else total, caps[i] if caps is not None else total)
+        for i in range(count)
+    ]
+    shares = [0] * count
+    open_ids = [i for i in range(count) if limits[i] > 0]
+    remaining = max(0, total)
+    while open_ids and remaining > 0:
+        weight_sum = sum(max(weights[i], 1e-6) for i in open_ids)
+        capped = []
+        for i in open_ids:
+            proposal = remaining * max(weights[i], 1e-6) / weight_sum
+            if shares[i] + proposal >= limits[i]:
+                capped.append(i)
+        if not capped:
+            for i in open_ids:
+                shares[i] += int(remaining * max(weights[i], 1e-6) / weight_sum)
+            break
+        for i in capped:
+            remaining -= limits[i] - shares[i]
+            shares[i] = limits[i]
+            open_ids.remove(i)
+    # The minimum wins over proportionality (short of an article's own cap)
+    return [max(share, min(minimum, limits[i])) for i, share in enumerate(shares)]
+
+
+class ArticlePromptBuilder:
+    """Builds the article block of a prompt within a token budget.
+
+    Each article costs its fixed lines (``render`` with empty content) plus its
+    content. Articles that do not fit even with ``min_chars`` of content are
+    dropped from the end; the rest of the budget is split by relevance
+    (``relevance_score``, else list rank) between ``min_chars`` and ``max_chars``
+    per article, and filled with ``extract_sentences`` of the cleaned text.
+    """
+
+    def __init__(
+        self,
+        token_budget: int,
+        *,
+        min_chars: int = 120,
+        max_chars: int = 1000,
+        clean: Optional[Callable[[str], str]] = None,
+    ):
+        self.token_budget = max(0, int(token_budget))
+        self.min_chars = max(0, int(min_chars))
+        self.max_chars = max(self.min_chars, int(max_chars))
+        self.clean = clean or (lambda text: " ".join((text or "").split()))
+
+    @staticmethod
+    def _weight(article: Dict[str, Any], rank: int, count: int) -> float:
+        score = article.get("relevance_score")
+        if isinstance(score, (int, float)) and score > 0:
+            return float(score)
+        # Without scores, the list order is the ranking
+        return float(count - rank)
+
+    def build(
+        self,
+        articles: List[Dict[str, Any]],
+        text_of: Callable[[Dict[str, Any]], str],
+        render: Callable[[int, Dict[str, Any], str], str],
+    ) -> Tuple[str, List[Dict[str, Any]], int]:
+        """``(block, included articles, estimated tokens)``.
+
+        ``text_of`` gives an article's raw text; ``render(number, article, content)``
+        formats one entry.
+        """
+        texts = [self.clean(text_of(article)) for article in articles]
+        overheads = [estimate_tokens(render(i, article, "")) for i, article in enumerate(articles, 1)]
+        chars_per_token = max(2.5, sum(len(t) for t in texts) / max(1, sum(estimate_tokens(t) for t in texts)))
+        min_tokens = int(self.min_chars / chars_per_token)
+
+        count = len(articles)
+        while count and sum(overheads[:count]) + count * min_tokens > self.token_budget:
+            count -= 1
+        articles, texts = articles[:count], texts[:count]
+        if not articles:
+            return "", [], 0
+
+        content_chars = int((self.token_budget - sum(overheads[:count])) * chars_per_token)
+        shares = allocate_budget(
+            [self._weight(article, rank, count) for rank, article in enumerate(articles)],
+            content_chars,
+            minimum=self.min_chars,
+            maximum=self.max_chars,
+            caps=[len(text) for text in texts],
+        )
+        entries = [
+            render(i, article, extract_sentences(text, share, focus=article.get("title") or ""))
+            for i, (article, text, share) in enumerate(zip(articles, texts, shares), 1)
+        ]
+        block = "".join(entries)
+        return block, articles, estimate_tokens(block)
@@ -0,0 +1,182 @@
+import json
+import math
+import os
+from typing import Any, Dict, Iterable, List, Optional
+
+from .episode_archive import EpisodeArchive
+from .news_dedupe import title_fingerprint
+
+_DEFAULT_MODEL_PATH = "relevance_model.json"
+_MODEL_VERSION = 1
+
+
+def relevance_tokens(title: str) -> List[str]:
+    """Title words used by the model (same normalization as the dedupe title fingerprint)."""
+    fp = title_fingerprint((title or "").strip())
+    return fp.split(" ") if fp else []
+
+
+class RelevanceModel:
+    """TF-IDF profile of the articles that made it into earlier episodes.
+
+    Two tables are persisted and updated incrementally:
+
+    - ``df``/``docs``: document frequencies over every article title the curation
+      has seen (the background the IDF is computed from), and
+    - ``profile``/``positives``: summed, length-normalized word vectors of the
+      articles episodes actually referenced, read from the episode archive.
+
+    Both decay by ``decay`` per run (or per archived episode), so recent editorial
+    choices weigh most and the tables stay bounded. ``score`` is the cosine
+    similarity between an article's TF-IDF title vector and the IDF-weighted
+    profile, from 0.0 to 1.0.
+    """
+
+    def __init__(self, path: str = _DEFAULT_MODEL_PATH, decay: float = 0.98, min_weight: float = 0.05):
+        self.path = path
+        self.decay = float(decay)
+        self.min_weight = float(min_weight)
+        self.docs = 0.0
+        self.df: Dict[str, float] = {}
+        self.positives = 0.0
+        self.profile: Dict[str, float] = {}
+        self.archive_bytes = 0
+        self._profile_norm: Optional[float] = None
+        self._dirty = False
+
+    @classmethod
+    def load(cls, path: str = _DEFAULT_MODEL_PATH, **kwargs: Any) -> "RelevanceModel":
+        model = cls(path, **kwargs)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return model
+        if not isinstance(data, dict) or data.get("version") != _MODEL_VERSION:
+            return model
+        model.docs = float(data.get("docs", 0.0) or 0.0)
+        model.df = {k: float(v) for k, v in (data.get("df") or {}).items()}
+        model.positives = float(data.get("positives", 0.0) or 0.0)
+        model.profile = {k: float(v) for k, v in (data.get("profile") or {}).items()}
+        model.archive_bytes = int(data.get("archive_bytes", 0) or 0)
+        return model
+
+    def __len__(self) -> int:
+        return len(self.df)
+
+    @property
+    def trained(self) -> bool:
+        return bool(self.profile) and self.docs > 0
+
+    def _decay(self, table: Dict[str, float]) -> None:
+        for token in list(table):
+            weight = table[token] * self.decay
+            if weight < self.min_weight:
+                del table[token]
+            else:
+                table[token] = weight
+
+    def idf(self, token: str) -> float:
+        # Smoothed, so words never seen in the background still get a finite weight
+        return math.log((1.0 + self.docs) / (1.0 + self.df.get(token, 0.0))) + 1.0
+
+    def observe(self, titles: Iterable[str]) -> None:
+        """Add one run's candidate titles to the background document frequencies."""
+        token_sets = [set(relevance_tokens(title)) for title in titles]
+        token_sets = [tokens for tokens in token_sets if tokens]
+        if not token_sets:
+            return
+        self._decay(self.df)
+        self.docs = self.docs * self.decay + len(token_sets)
+        for tokens in token_sets:
+            for token in tokens:
+                self.df[token] = self.df.get(token, 0.0) + 1.0
+        self._profile_norm = None
+        self._dirty = True
+
+    def learn(self, titles: Iterable[str]) -> None:
+        """Add the titles of one episode's referenced articles to the profile."""
+        vectors = []
+        for title in titles:
+            tokens = relevance_tokens(title)
+            if tokens:
+                weight = 1.0 / math.sqrt(len(tokens))
+                vectors.append({token: weight for token in tokens})
+        if not vectors:
+            return
+        self._decay(self.profile)
+        self.positives = self.positives * self.decay + len(vectors)
+        for vector in vectors:
+            for token, weight in vector.items():
+                self.profile[token] = self.profile.get(token, 0.0) + weight
+        self._profile_norm = None
+        self._dirty = True
+
+    def sync_with_archive(self, archive: EpisodeArchive) -> int:
+        """Learn from episodes appended to the archive since the last sync; returns how many."""
+        archive.ensure_imported()
+        size = os.path.getsize(archive.path)
+        if self.archive_bytes > size:
+            # Archive was replaced: start the profile over (the background stays valid)
+            self.profile, self.positives, self.archive_bytes = {}, 0.0, 0
+        if self.archive_bytes == size:
+            return 0
+        episodes = 0
+        offset = self.archive_bytes
+        with open(archive.path, "rb") as f:
+            f.seek(offset)
+            for raw in f:
+                if not raw.endswith(b"\n"):
+                    break
+                offset += len(raw)
+                try:
+                    record = json.loads(raw.decode("utf-8", errors="replace"))
+                except ValueError:
+                    continue
+                articles = [a for a in record.get("articles") or [] if isinstance(a, dict)]
+                self.learn(a.get("title") or "" for a in articles)
+                episodes += 1
+        self.archive_bytes = offset
+        self._dirty = True
+        return episodes
+
+    def _norm_of_profile(self) -> float:
+        if self._profile_norm is None:
+            self._profile_norm = math.sqrt(
+                sum((weight * self.idf(token)) ** 2 for token, weight in self.profile.items())
+            )
+        return self._profile_norm
+
+    def score(self, title: str) -> float:
+        """Cosine similarity between ``title`` and the profile of earlier episodes (0.0-1.0)."""
+        tokens = relevance_tokens(title)
+        if not tokens or not self.trained:
+            return 0.0
+        profile_norm = self._norm_of_profile()
+        if not profile_norm:
+            return 0.0
+        dot = 0.0
+        norm = 0.0
+        for token in tokens:
+            weight = self.idf(token)
+            norm += weight * weight
+            dot += weight * self.profile.get(token, 0.0) * weight
+        if not norm:
+            return 0.0
+        return max(0.0, min(1.0, dot / (math.sqrt(norm) * profile_norm)))
+
+    def save(self) -> None:
+        if not self._dirty or not self.path:
+            return
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "version": _MODEL_VERSION,
+                "docs": round(self.docs, 4),
+                "df": {k: round(v, 4) for k, v in self.df.items()},
+                "positives": round(self.positives, 4),
+                "profile": {k: round(v, 4) for k, v in self.profile.items()},
+                "archive_bytes": self.archive_bytes,
+            }, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp_path, self.path)
+        self._dirty = False
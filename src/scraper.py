@@ -1,27 +1,87 @@
 import asyncio
 import aiohttp
+import contextlib
+import contextvars
+import itertools
 from bs4 import BeautifulSoup
 from datetime import datetime
 import json
 import logging
 import os
 import re
+import time
 from urllib.parse import urljoin, urlparse
-from typing import List, Dict, Any
+from typing import List, Dict, Any, AsyncIterator, Awaitable, Iterator, Tuple
 import feedparser
 from urllib.parse import quote_plus
 
-# Optional imports for JavaScript rendering
-try:
-    from playwright.async_api import async_playwright
-    PLAYWRIGHT_AVAILABLE = True
-except ImportError:
-    PLAYWRIGHT_AVAILABLE = False
+from article_cache import ArticleCache
+from article_extractor import ArticleExtractor
+from feed_stream import FeedStreamParser, StreamedFeed
+from xml.etree.ElementTree import ParseError
+from news_dedupe import canonicalize_url
+from source_health import SourceHealth
+from story_clusters import cluster_scraped_data
+
+# JavaScript rendering (Playwright is optional)
+from browser_pool import BrowserPool, PLAYWRIGHT_AVAILABLE
+if not PLAYWRIGHT_AVAILABLE:
     logging.warning("Playwright not available - JavaScript scraping disabled. Install with: pip install playwright")
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Timing/byte counters of the source currently being scraped. Tasks spawned for
+# article fetches inherit the context, so concurrent fetches land on the right source.
+_SOURCE_STATS: contextvars.ContextVar[Dict[str, Any] | None] = contextvars.ContextVar('source_stats', default=None)
+
+
+def _new_source_stats() -> Dict[str, Any]:
+    return {
+        'total_ms': 0.0,
+        'phases_ms': {},
+        'requests': 0,
+        'bytes': 0,
+        'article_fetches': 0,
+        'article_cache_hits': 0,
+        'feeds_not_modified': 0,
+    }
+
+
+def _set_stat(key: str, value: Any) -> None:
+    stats = _SOURCE_STATS.get()
+    if stats is not None:
+        stats[key] = value
+
+
+def _count_stat(key: str, amount: int = 1) -> None:
+    stats = _SOURCE_STATS.get()
+    if stats is not None:
+        stats[key] = stats.get(key, 0) + amount
+
+
+def _record_phase(phase: str, started: float, stats: Dict[str, Any] | None = None, *, count_total: bool = False) -> None:
+    """Add the time since ``started`` (a perf_counter value) to ``phases_ms[phase]``."""
+    stats = stats if stats is not None else _SOURCE_STATS.get()
+    if stats is None:
+        return
+    elapsed = (time.perf_counter() - started) * 1000
+    phases = stats.setdefault('phases_ms', {})
+    phases[phase] = round(phases.get(phase, 0.0) + elapsed, 1)
+    if count_total:
+        stats['total_ms'] = round(stats.get('total_ms', 0.0) + elapsed, 1)
+
+
+@contextlib.contextmanager
+def _timed_phase(phase: str, stats: Dict[str, Any] | None = None, *, count_total: bool = False) -> Iterator[None]:
+    """Add the wall time of the block to ``phases_ms[phase]`` of the current source."""
+    stats = stats if stats is not None else _SOURCE_STATS.get()
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        _record_phase(phase, started, stats, count_total=count_total)
+
 class NewsScraper:
     def __init__(self, sources_file: str = "sources.json"):
         with open(sources_file, 'r', encoding='utf-8') as f:
@@ -31,10 +91,64 @@ class NewsScraper:
         self.auto_fix_feeds = os.getenv('MMM_AUTO_FIX_FEEDS', '1').strip().lower() not in {'0', 'false', 'no'}
         self.feed_cache_path = os.getenv('MMM_FEED_URL_CACHE', 'feed_url_cache.json')
         self.feed_url_cache: Dict[str, Dict[str, Any]] = self._load_feed_url_cache(self.feed_cache_path)
+        # Conditional GET (ETag/Last-Modified) per feed URL, persisted next to the feed URL cache
+        self.conditional_get = os.getenv('MMM_FEED_CONDITIONAL_GET', '1').strip().lower() not in {'0', 'false', 'no'}
+        self.feed_http_cache_path = os.getenv('MMM_FEED_HTTP_CACHE', 'feed_http_cache.json')
+        self.feed_http_cache: Dict[str, Dict[str, Any]] = (
+            self._load_feed_url_cache(self.feed_http_cache_path) if self.conditional_get else {}
+        )
+        self._feed_http_cache_dirty = False
         self.require_article_content = os.getenv('MMM_REQUIRE_ARTICLE_CONTENT', '0').strip().lower() in {'1', 'true', 'yes'}
         self.thin_ratio_threshold = float(os.getenv('MMM_THIN_RATIO_THRESHOLD', '0.35') or 0.35)
         self.thin_ratio_auto_strict = os.getenv('MMM_THIN_AUTO_STRICT', '0').strip().lower() in {'1', 'true', 'yes'}
         self.thin_ratio_min_items = int(os.getenv('MMM_THIN_RATIO_MIN_ITEMS', '6') or 6)
+        self.stream_feeds = os.getenv('MMM_FEED_STREAMING', '1').strip().lower() not in {'0', 'false', 'no'}
+        # Article-body fetches fan out across all sources through shared limits
+        self.article_fetch_concurrency = int(os.getenv('MMM_ARTICLE_FETCH_CONCURRENCY', '8') or 8)
+        self.article_fetch_per_host = int(os.getenv('MMM_ARTICLE_FETCH_PER_HOST', '2') or 2)
+        self._fetch_limits_loop: asyncio.AbstractEventLoop | None = None
+        self._article_fetch_semaphore: asyncio.Semaphore | None = None
+        self._host_semaphores: Dict[str, asyncio.Semaphore] = {}
+        # One pooled HTTP session per scrape run (initial pass, strict retry and enrichment)
+        self.http_limit = int(os.getenv('MMM_HTTP_LIMIT', '30') or 30)
+        self.http_limit_per_host = int(os.getenv('MMM_HTTP_LIMIT_PER_HOST', '6') or 6)
+        self.http_dns_ttl = int(os.getenv('MMM_HTTP_DNS_TTL', '600') or 600)
+        self.http_keepalive = float(os.getenv('MMM_HTTP_KEEPALIVE', '30') or 30)
+        self._session: aiohttp.ClientSession | None = None
+        # JS-rendered sources share one browser per run (started on first use)
+        self.browser_pool = BrowserPool(
+            max_pages=int(os.getenv('MMM_BROWSER_MAX_PAGES', '2') or 2),
+            blocked_resource_types=os.getenv('MMM_BROWSER_BLOCK_RESOURCES', 'image,font,media').split(','),
+        )
+        # Per-source feed state from the current run, used by the incremental strict retry
+        self._rss_retry_state: Dict[str, Dict[str, Any]] = {}
+        # Single-pass extraction; per-domain selectors learned from earlier pages
+        self.extractor = ArticleExtractor(os.getenv('MMM_EXTRACTOR_SELECTORS', 'extractor_selectors.json'))
+        # Extracted article bodies (and enrichment results) survive between runs
+        article_cache_path = os.getenv('MMM_ARTICLE_CACHE', 'article_cache.sqlite3').strip()
+        self.article_cache: ArticleCache | None = None
+        if article_cache_path and article_cache_path.lower() not in {'0', 'false', 'no'}:
+            self.article_cache = ArticleCache(
+                article_cache_path,
+                ttl_days=float(os.getenv('MMM_ARTICLE_CACHE_TTL_DAYS', '3') or 3),
+                max_entries=int(os.getenv('MMM_ARTICLE_CACHE_MAX_ENTRIES', '5000') or 5000),
+            )
+
+        # Latency-derived timeouts and a circuit breaker for sources that keep failing
+        source_health_path = os.getenv('MMM_SOURCE_HEALTH', 'source_health.json').strip()
+        self.source_health: SourceHealth | None = None
+        if source_health_path and source_health_path.lower() not in {'0', 'false', 'no'}:
+            self.source_health = SourceHealth(
+                source_health_path,
+                min_timeout=float(os.getenv('MMM_SOURCE_TIMEOUT_MIN', '5') or 5),
+                max_timeout=float(os.getenv('MMM_SOURCE_TIMEOUT_MAX', '20') or 20),
+                failure_threshold=int(os.getenv('MMM_CIRCUIT_FAILURES', '3') or 3),
+                open_runs=int(os.getenv('MMM_CIRCUIT_OPEN_RUNS', '3') or 3),
+            )
+
+        # The same story from several outlets is merged into one item with alternates
+        self.story_clustering = os.getenv('MMM_STORY_CLUSTERING', '1').strip().lower() not in {'0', 'false', 'no'}
+        self.cluster_threshold = float(os.getenv('MMM_CLUSTER_THRESHOLD', '0.3') or 0.3)
 
         # Apply cached URLs first (best-effort)
         for source in self.sources:
@@ -117,6 +231,104 @@ class NewsScraper:
         except Exception as e:
             logger.warning(f"⚠️ Could not write feed URL cache {self.feed_cache_path}: {e}")
 
+    def _save_source_health(self) -> None:
+        if self.source_health is None:
+            return
+        try:
+            self.source_health.save()
+        except Exception as e:
+            logger.warning(f"⚠️ Could not write source health {self.source_health.path}: {e}")
+
+    def _save_feed_http_cache(self) -> None:
+        if not self.conditional_get or not self._feed_http_cache_dirty:
+            return
+        try:
+            tmp_path = f"{self.feed_http_cache_path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.feed_http_cache, f, ensure_ascii=False)
+            os.replace(tmp_path, self.feed_http_cache_path)
+            self._feed_http_cache_dirty = False
+        except Exception as e:
+            logger.warning(f"⚠️ Could not write feed HTTP cache {self.feed_http_cache_path}: {e}")
+
+    def _conditional_headers(self, url: str) -> Dict[str, str]:
+        """Build If-None-Match/If-Modified-Since headers from the validators stored for a feed URL."""
+        if not self.conditional_get:
+            return {}
+        cached = self.feed_http_cache.get(url)
+        if not isinstance(cached, dict) or not cached.get('items'):
+            return {}
+        headers: Dict[str, str] = {}
+        if cached.get('etag'):
+            headers['If-None-Match'] = cached['etag']
+        if cached.get('last_modified'):
+            headers['If-Modified-Since'] = cached['last_modified']
+        return headers
+
+    def _remember_feed_http_cache(self, url: str, meta: Dict[str, Any], result: Dict[str, Any]) -> None:
+        """Store validators and parsed items so an unchanged feed (HTTP 304) can be reused next run."""
+        if not self.conditional_get:
+            return
+        if not (meta.get('etag') or meta.get('last_modified')) or not result.get('items'):
+            # Without validators the publisher can never answer 304; drop stale entries.
+            if self.feed_http_cache.pop(url, None) is not None:
+                self._feed_http_cache_dirty = True
+            return
+        self.feed_http_cache[url] = {
+            'etag': meta.get('etag'),
+            'last_modified': meta.get('last_modified'),
+            'updated_at': datetime.now().isoformat(),
+            'feed_title': result.get('feed_title'),
+            'content_type': result.get('content_type', ''),
+            'final_url': result.get('final_url', url),
+            # Shallow copies: enrichment later mutates the live items
+            'items': [dict(item) for item in result.get('items', [])],
+        }
+        self._feed_http_cache_dirty = True
+
+    def _result_from_feed_http_cache(
+        self,
+        source: Dict[str, Any],
+        cached: Dict[str, Any],
+        max_items: int,
+    ) -> Dict[str, Any]:
+        """Rebuild an RSS result from the previously parsed items after an HTTP 304."""
+        now = datetime.now().isoformat()
+        items: List[Dict[str, Any]] = []
+        thin_items = 0
+        skipped_thin = 0
+        for cached_item in cached.get('items') or []:
+            if not isinstance(cached_item, dict):
+                continue
+            item = dict(cached_item)
+            item['timestamp'] = now
+            if not item.get('summary'):
+                if self.require_article_content:
+                    skipped_thin += 1
+                    continue
+                thin_items += 1
+            items.append(item)
+            if len(items) >= max_items:
+                break
+
+        logger.info(f"♻️ {source['name']}: feed not modified (HTTP 304), reusing {len(items)} cached items")
+        return {
+            'source': source['name'],
+            'type': source['type'],
+            'priority': source.get('priority', 3),
+            'items': items,
+            'scraped_count': len(items),
+            'thin_items': thin_items,
+            'skipped_thin_items': skipped_thin,
+            'format': 'rss',
+            'feed_title': cached.get('feed_title') or source['name'],
+            'http_status': 304,
+            'content_type': cached.get('content_type', ''),
+            'final_url': cached.get('final_url') or source['url'],
+            'original_url': source.get('original_url'),
+            'not_modified': True,
+        }
+
     async def _validate_rss_url(self, session: aiohttp.ClientSession, url: str, source_type: str | None) -> Dict[str, Any] | None:
         meta = await self.fetch_url_with_meta(session, url, source_type)
         text = meta.get('text', '')
@@ -163,13 +375,48 @@ class NewsScraper:
                 return validated['url']
         return None
 
+    def _create_session(self) -> aiohttp.ClientSession:
+        # aiohttp negotiates gzip/deflate itself, and brotli when the brotli package is installed.
+        connector = aiohttp.TCPConnector(
+            limit=max(0, self.http_limit),
+            limit_per_host=max(0, self.http_limit_per_host),
+            use_dns_cache=True,
+            ttl_dns_cache=self.http_dns_ttl,
+            keepalive_timeout=self.http_keepalive,
+        )
+        return aiohttp.ClientSession(connector=connector)
+
+    @contextlib.asynccontextmanager
+    async def _http_session(self) -> AsyncIterator[aiohttp.ClientSession]:
+        """Yield the shared session, creating (and later closing) it if none is open."""
+        if self._session is not None and not self._session.closed:
+            yield self._session
+            return
+        self._session = self._create_session()
+        try:
+            yield self._session
+        finally:
+            await self._session.close()
+            self._session = None
+
     async def fetch_url_with_meta(
         self,
         session: aiohttp.ClientSession,
         url: str,
-        source_type: str = None
+        source_type: str = None,
+        extra_headers: Dict[str, str] | None = None,
+        stream_feed_entries: int | None = None,
+        timeout: float | None = None,
     ) -> Dict[str, Any]:
-        """Fetch URL and return content plus HTTP metadata for better diagnostics."""
+        """Fetch URL and return content plus HTTP metadata for better diagnostics.
+
+        ``timeout`` is the total request timeout in seconds (default 20); the result
+        reports ``elapsed_ms`` and, on failure, whether the request ``timed_out``.
+
+        With ``stream_feed_entries`` the body is parsed as RSS/Atom while it downloads
+        and reading stops once that many entries are parsed; the result then carries
+        the parsed ``feed`` (None when the stream could not be parsed).
+        """
         # Use different user agents for different source types
         if source_type == 'weather' and 'wttr.in' in url:
             headers = {
@@ -181,45 +428,192 @@ class NewsScraper:
                 'Accept': 'application/rss+xml, application/atom+xml, application/xml;q=0.9, text/xml;q=0.9, text/html;q=0.8, */*;q=0.7',
                 'Accept-Language': 'sv-SE,sv;q=0.9,en-US;q=0.8,en;q=0.7'
             }
+        if extra_headers:
+            headers.update(extra_headers)
 
         logger.info(f"🌐 Fetching {url} with User-Agent: {headers['User-Agent'][:50]}...")
 
+        started = time.perf_counter()
         try:
-            async with session.get(url, headers=headers, timeout=aiohttp.ClientTimeout(total=20)) as response:
+            async with session.get(url, headers=headers, timeout=aiohttp.ClientTimeout(total=timeout or 20)) as response:
                 content_type = response.headers.get('Content-Type', '')
                 final_url = str(response.url)
                 status = response.status
+                etag = response.headers.get('ETag')
+                last_modified = response.headers.get('Last-Modified')
+                _count_stat('requests')
 
-                try:
-                    content = await response.text()
-                except UnicodeDecodeError:
-                    content = (await response.read()).decode('utf-8', errors='ignore')
+                if status == 304:
+                    logger.info(f"♻️ Not modified: {url} (HTTP 304)")
+                    return {
+                        'text': "",
+                        'status': status,
+                        'content_type': content_type,
+                        'final_url': final_url,
+                        'error': None,
+                        'etag': etag,
+                        'last_modified': last_modified,
+                        'elapsed_ms': round((time.perf_counter() - started) * 1000, 1),
+                    }
+
+                feed = None
+                if stream_feed_entries and status < 400:
+                    content, feed = await self._read_feed_stream(response, stream_feed_entries)
+                else:
+                    body = await response.read()
+                    _count_stat('bytes', len(body))
+                    try:
+                        content = await response.text()
+                    except UnicodeDecodeError:
+                        content = body.decode('utf-8', errors='ignore')
 
                 logger.info(f"✅ Fetched {len(content)} characters from {url} (HTTP {status}, {content_type})")
                 logger.info(f"📝 Content preview: {content[:200]}...")
 
-                return {
+                meta = {
                     'text': content,
                     'status': status,
                     'content_type': content_type,
                     'final_url': final_url,
                     'error': None,
+                    'etag': etag,
+                    'last_modified': last_modified,
+                    'elapsed_ms': round((time.perf_counter() - started) * 1000, 1),
                 }
+                if stream_feed_entries:
+                    meta['feed'] = feed
+                return meta
         except Exception as e:
-            logger.error(f"❌ Error fetching {url}: {e}")
+            timed_out = isinstance(e, asyncio.TimeoutError)
+            if timed_out:
+                logger.error(f"❌ Timed out fetching {url} after {timeout or 20:.0f}s")
+            else:
+                logger.error(f"❌ Error fetching {url}: {e}")
             return {
                 'text': "",
                 'status': None,
                 'content_type': "",
                 'final_url': url,
-                'error': str(e),
+                'error': f"timeout after {timeout or 20:.0f}s" if timed_out else str(e),
+                'timed_out': timed_out,
+                'elapsed_ms': round((time.perf_counter() - started) * 1000, 1),
             }
     
+    async def _read_feed_stream(
+        self,
+        response: aiohttp.ClientResponse,
+        max_entries: int,
+    ) -> Tuple[str, StreamedFeed | None]:
+        """Read a feed body chunk by chunk, parsing entries as they arrive.
+
+        Stops downloading once ``max_entries`` entries are parsed. HTML responses and
+        malformed XML are read to the end and returned without a feed so the caller
+        can fall back to feedparser (which tolerates bozo feeds).
+        """
+        parser = FeedStreamParser(max_entries)
+        chunks: List[bytes] = []
+        streaming = True
+        complete = True
+        async for chunk in response.content.iter_chunked(16384):
+            chunks.append(chunk)
+            _count_stat('bytes', len(chunk))
+            if not streaming:
+                continue
+            if len(chunks) == 1 and self._looks_like_html(chunk[:1024].decode('utf-8', errors='ignore')):
+                streaming = False
+                continue
+            try:
+                parser.feed(chunk)
+            except ParseError:
+                streaming = False
+                continue
+            if parser.done:
+                complete = False
+                break
+
+        feed = None
+        if streaming:
+            try:
+                if complete:
+                    parser.close()
+                feed = parser.result(complete)
+            except ParseError:
+                feed = None
+            if feed is not None and not feed.entries:
+                feed = None
+            if feed is not None and not complete:
+                logger.info(f"✂️ Stopped reading feed after {len(feed.entries)} entries")
+
+        try:
+            encoding = response.get_encoding()
+        except Exception:
+            encoding = 'utf-8'
+        try:
+            text = b''.join(chunks).decode(encoding, errors='replace')
+        except LookupError:
+            text = b''.join(chunks).decode('utf-8', errors='replace')
+        return text, feed
+
     async def fetch_url(self, session: aiohttp.ClientSession, url: str, source_type: str = None) -> str:
         meta = await self.fetch_url_with_meta(session, url, source_type)
         return meta.get('text', '')
     
+    @staticmethod
+    async def _attributed(stats: Dict[str, Any] | None, phase: str, awaitable: Awaitable[Any]) -> Any:
+        """Await ``awaitable`` with its requests, bytes and time booked on ``stats``."""
+        token = _SOURCE_STATS.set(stats)
+        try:
+            with _timed_phase(phase, stats, count_total=True):
+                return await awaitable
+        finally:
+            _SOURCE_STATS.reset(token)
+
     async def scrape_source(self, session: aiohttp.ClientSession, source: Dict[str, Any]) -> Dict[str, Any]:
+        stats = _new_source_stats()
+        result = await self._attributed(stats, 'scrape', self._scrape_source(session, source))
+        result['scrape_stats'] = stats
+        self._record_source_health(source, result, stats)
+        return result
+
+    def _source_timeout(self, source: Dict[str, Any]) -> float:
+        timeout = self.source_health.timeout_for(source['name']) if self.source_health else 20.0
+        _set_stat('timeout_s', timeout)
+        return timeout
+
+    def _record_source_health(self, source: Dict[str, Any], result: Dict[str, Any], stats: Dict[str, Any]) -> None:
+        if self.source_health is None:
+            return
+        name = source['name']
+        if not result.get('error'):
+            self.source_health.record_success(name, stats.get('feed_latency_ms'))
+            return
+        timed_out = stats.get('feed_timed_out')
+        opened = self.source_health.record_failure(
+            name,
+            str(result.get('error')),
+            timed_out_after=stats.get('timeout_s') if timed_out else None,
+        )
+        if opened:
+            record = self.source_health.records.get(name, {})
+            logger.warning(
+                f"🔌 Circuit opened for {name} after {record.get('consecutive_failures')} failures; "
+                f"skipping it for {record.get('open_runs')} runs"
+            )
+
+    def _circuit_open_result(self, source: Dict[str, Any]) -> Dict[str, Any]:
+        record = self.source_health.records.get(source['name'], {}) if self.source_health else {}
+        logger.warning(
+            f"🔌 Skipping {source['name']}: circuit open "
+            f"({record.get('consecutive_failures')} failures, last: {record.get('last_error')})"
+        )
+        result = self.create_empty_result(
+            source,
+            f"Circuit open after {record.get('consecutive_failures')} consecutive failures; skipped this run",
+        )
+        result['circuit_open'] = True
+        return result
+
+    async def _scrape_source(self, session: aiohttp.ClientSession, source: Dict[str, Any]) -> Dict[str, Any]:
         logger.info(f"🔍 Scraping {source['name']} ({source['url']})...")
         
         # Check if this is an RSS feed
@@ -237,99 +631,104 @@ class NewsScraper:
         else:
             return await self.scrape_html_source(session, source)
     
+    def _cached_article_content(self, url: str) -> str | None:
+        if self.article_cache is None:
+            return None
+        try:
+            cached = self.article_cache.get(canonicalize_url(url))
+        except Exception as e:
+            logger.debug(f"Article cache lookup failed for {url}: {e}")
+            return None
+        if cached is not None:
+            _count_stat('article_cache_hits')
+        return cached
+
+    def _store_article_content(self, url: str, text: str) -> None:
+        if self.article_cache is None or not text:
+            return
+        try:
+            self.article_cache.put(canonicalize_url(url), text)
+        except Exception as e:
+            logger.debug(f"Article cache write failed for {url}: {e}")
+
+    def _flush_article_cache(self) -> None:
+        if self.article_cache is None:
+            return
+        try:
+            self.article_cache.flush()
+            logger.info(
+                f"🗄️ Article cache: {self.article_cache.hits} hits, {self.article_cache.misses} misses"
+            )
+        except Exception as e:
+            logger.warning(f"⚠️ Could not write article cache {self.article_cache.path}: {e}")
+
     async def fetch_article_content(self, session: aiohttp.ClientSession, url: str) -> str:
-        """Fetch full article content from URL"""
+        """Fetch full article content from URL (served from the article cache when fresh)"""
+        cached = self._cached_article_content(url)
+        if cached is not None:
+            return cached
+        return await self._fetch_article_content_uncached(session, url)
+
+    async def _fetch_article_content_uncached(self, session: aiohttp.ClientSession, url: str) -> str:
+        _count_stat('article_fetches')
+        text = await self._download_article_content(session, url)
+        self._store_article_content(url, text)
+        return text
+
+    async def _download_article_content(self, session: aiohttp.ClientSession, url: str) -> str:
         try:
             content = await self.fetch_url(session, url, 'html')
             if not content:
                 return ""
-            
-            soup = BeautifulSoup(content, 'html.parser')
-            
-            # Remove script, style, nav, and comment form elements
-            for element in soup(['script', 'style', 'nav', 'header', 'footer', 'aside', 'form']):
-                element.decompose()
-            
-            # Also remove common comment/reply sections
-            for element in soup.find_all(class_=['comment-form', 'comments', 'respond', 'comment-respond', 'reply']):
-                element.decompose()
-            
-            # Common article content selectors (in priority order)
-            article_selectors = [
-                'article .entry-content',  # WordPress common
-                'article .post-content',   # Blog common
-                '.article-body',           # News sites
-                '.story-body',             # BBC-style
-                '.content-body',           # Generic
-                'article',                 # Full article tag
-                '.entry-content',          # WordPress
-                '.post-content',           # Blogs
-                '.article-content',        # News
-                '.content',                # Generic
-                'main article',            # Semantic HTML
-                '.wp-block-post-content',  # WordPress blocks
-                '.entry',                  # Generic blog
-                '.post',                   # Generic blog
-                'main'                     # Main content
-            ]
-            
-            best_text = ""
-            best_length = 0
-            
-            for selector in article_selectors:
-                try:
-                    elements = soup.select(selector)
-                    for element in elements[:2]:  # Check first 2 matches
-                        # Get text from this element
-                        text = element.get_text(separator=' ', strip=True)
-                        
-                        # Clean up the text
-                        text = ' '.join(text.split())  # Normalize whitespace
-                        
-                        # Skip if too short or looks like navigation/comments
-                        if len(text) < 100:
-                            continue
-                        if any(skip_word in text[:100].lower() for skip_word in [
-                            'menu', 'search', 'subscribe', 'lämna ett svar', 
-                            'din e-postadress', 'obligatoriska fält', 'comment', 'reply'
-                        ]):
-                            continue
-                        
-                        # Keep the longest quality text found
-                        if len(text) > best_length:
-                            best_text = text
-                            best_length = len(text)
-                except:
-                    continue
-            
-            if best_text:
-                return best_text[:5000]  # Increased limit to 5000 chars for better content
-            
-            # Fallback: get all paragraph text
-            paragraphs = soup.find_all('p')
-            if paragraphs:
-                # Filter out short paragraphs and comment form text
-                good_paragraphs = []
-                for p in paragraphs:
-                    p_text = p.get_text(strip=True)
-                    if len(p_text) > 30:
-                        # Skip if it looks like comment form
-                        if any(skip in p_text.lower() for skip in [
-                            'din e-postadress', 'obligatoriska fält', 
-                            'lämna ett svar', 'avbryt svar'
-                        ]):
-                            continue
-                        good_paragraphs.append(p_text)
-                
-                if good_paragraphs:
-                    text = ' '.join(good_paragraphs)
-                    return text[:5000] if text else ""  # Increased limit for better content
-            
-            return ""
+            return self.extractor.extract(content, url, max_chars=5000)
         except Exception as e:
             logger.debug(f"Could not fetch article content from {url}: {e}")
             return ""
 
+    def _article_fetch_limits(self, url: str) -> Tuple[asyncio.Semaphore, asyncio.Semaphore]:
+        """Return the (global, per-host) semaphores bounding article fetches for the running loop."""
+        loop = asyncio.get_running_loop()
+        if self._fetch_limits_loop is not loop:
+            # Semaphores are bound to one event loop; GUI callers run asyncio.run() repeatedly.
+            self._fetch_limits_loop = loop
+            self._article_fetch_semaphore = asyncio.Semaphore(max(1, self.article_fetch_concurrency))
+            self._host_semaphores = {}
+        host = (urlparse(url).netloc or '').lower()
+        host_semaphore = self._host_semaphores.get(host)
+        if host_semaphore is None:
+            host_semaphore = asyncio.Semaphore(max(1, self.article_fetch_per_host))
+            self._host_semaphores[host] = host_semaphore
+        return self._article_fetch_semaphore, host_semaphore
+
+    async def fetch_article_content_limited(self, session: aiohttp.ClientSession, url: str) -> str:
+        """fetch_article_content, bounded by the shared global and per-host limits."""
+        # Cache hits never wait for a network slot
+        cached = self._cached_article_content(url)
+        if cached is not None:
+            return cached
+        global_semaphore, host_semaphore = self._article_fetch_limits(url)
+        # Wait for the host slot first so a busy host does not hold a global slot.
+        async with host_semaphore:
+            async with global_semaphore:
+                logger.debug(f"  📄 Fetching full content: {url}")
+                return await self._fetch_article_content_uncached(session, url)
+
+    async def _fetch_article_contents(self, session: aiohttp.ClientSession, urls: List[str | None]) -> List[str]:
+        """Fetch several article bodies concurrently, preserving order ('' for None/failed URLs)."""
+        async def _fetch_one(url: str | None) -> str:
+            if not url:
+                return ""
+            try:
+                return await self.fetch_article_content_limited(session, url)
+            except Exception as e:
+                logger.debug(f"Could not fetch article content from {url}: {e}")
+                return ""
+
+        if not any(urls):
+            return ["" for _ in urls]
+        with _timed_phase('article_fetch'):
+            return list(await asyncio.gather(*(_fetch_one(url) for url in urls)))
+
     @staticmethod
     def _clean_text(text: str) -> str:
         if not text:
@@ -350,13 +749,8 @@ class NewsScraper:
             return ""
         
         try:
-            async with async_playwright() as p:
-                browser = await p.chromium.launch(headless=True)
-                context = await browser.new_context(
-                    user_agent='Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
-                )
-                page = await context.new_page()
-                
+            # Shared browser for the whole run; images/fonts/media are blocked
+            async with self.browser_pool.page() as page:
                 # Navigate to page
                 logger.debug(f"🌐 Loading JavaScript page: {url}")
                 await page.goto(url, wait_until='networkidle', timeout=30000)
@@ -451,7 +845,6 @@ class NewsScraper:
                 
                 # Get page content
                 content = await page.content()
-                await browser.close()
                 
                 return content
                 
@@ -549,19 +942,207 @@ class NewsScraper:
             logger.debug(f"Error extracting Facebook posts: {e}")
             return []
     
+    def _iter_rss_candidates(self, entries: List[Any], base_url: str) -> Iterator[Dict[str, Any]]:
+        """Yield usable feed entries as item skeletons, lazily and in feed order."""
+        for entry in entries:
+            title = self._clean_text(entry.get('title', '').strip())
+            summary = self._clean_text(entry.get('summary', '').strip())
+            if not summary:
+                summary = self._clean_text(entry.get('description', '').strip())
+            if not summary:
+                content_list = entry.get('content', []) or []
+                if isinstance(content_list, list) and content_list:
+                    summary = self._clean_text((content_list[0] or {}).get('value', '').strip())
+            
+            # Use title, or summary if no title
+            text = title if title else summary
+            if not text or len(text) <= 10:
+                continue
+
+            entry_link = entry.get('link', '')
+            if entry_link:
+                entry_link = urljoin(base_url, entry_link)
+            item = {
+                'title': text,
+                'link': entry_link,
+                'timestamp': datetime.now().isoformat()
+            }
+            
+            # Add published date if available
+            if hasattr(entry, 'published_parsed') and entry.published_parsed:
+                try:
+                    pub_date = datetime(*entry.published_parsed[:6])
+                    item['published'] = pub_date.isoformat()
+                except:
+                    pass
+            
+            # Check if summary is too short or generic
+            # We should fetch full content for most RSS feeds as they often only provide teasers
+            needs_full_content = False
+            if not summary or len(summary) < 200:
+                needs_full_content = True
+            elif any(generic in summary.lower() for generic in [
+                'inlägget', 'dök först upp på', 'läs mer', 'read more', 
+                'continue reading', 'click here', '...', 'the post',
+                'appeared first on', 'fortsätt läsa', 'dök först upp'
+            ]):
+                needs_full_content = True
+            # Also fetch if summary is mostly links/HTML (or has any HTML tags)
+            elif summary.count('<') > 0 or summary.count('http') > 2:
+                needs_full_content = True
+            # Also if very short and generic sounding
+            elif len(summary) < 150 and ('dök' in summary or 'inlägg' in summary):
+                needs_full_content = True
+
+            yield {
+                'item': item,
+                'title': title,
+                'summary': summary,
+                'needs_full_content': needs_full_content and bool(entry_link),
+            }
+
+    async def _fill_rss_items(
+        self,
+        session: aiohttp.ClientSession,
+        candidates: Iterator[Dict[str, Any]],
+        items: List[Dict[str, Any]],
+        max_items: int,
+    ) -> Tuple[int, int]:
+        """Append items from feed candidates until max_items; returns (thin_items, skipped_thin)."""
+        thin_items = 0
+        skipped_thin = 0
+        while len(items) < max_items:
+            # Take just enough entries to fill the remaining slots and fetch their
+            # article bodies concurrently; strict mode may need further batches.
+            batch = list(itertools.islice(candidates, max_items - len(items)))
+            if not batch:
+                break
+            contents = await self._fetch_article_contents(
+                session,
+                [c['item']['link'] if c['needs_full_content'] else None for c in batch],
+            )
+
+            for candidate, article_content in zip(batch, contents):
+                item = candidate['item']
+                title = candidate['title']
+                summary = candidate['summary']
+
+                # Fetch full article content if needed
+                if candidate['needs_full_content']:
+                    if article_content:
+                        item['summary'] = article_content[:2000] + '...' if len(article_content) > 2000 else article_content
+                        logger.debug(f"  ✓ Got {len(article_content)} chars of article content")
+                    elif summary:
+                        item['summary'] = summary[:1000] + '...' if len(summary) > 1000 else summary
+                    else:
+                        logger.warning(f"⚠️ No article content for: {title[:80]} ({item['link']})")
+                else:
+                    # Use existing summary if it's good enough
+                    if summary and summary != title and len(summary) > 10:
+                        item['summary'] = summary[:2000] + '...' if len(summary) > 2000 else summary
+
+                if not item.get('summary'):
+                    if self.require_article_content:
+                        logger.warning(f"⚠️ Skipping thin item (no content): {title[:80]}")
+                        skipped_thin += 1
+                        continue
+                    logger.warning(f"⚠️ Thin item (no content): {title[:80]}")
+                    thin_items += 1
+                
+                items.append(item)
+                logger.debug(f"  ✓ Added RSS item: {item['title'][:80]}...")
+        return thin_items, skipped_thin
+
+    async def _tighten_result(self, session: aiohttp.ClientSession, result: Dict[str, Any]) -> Dict[str, Any]:
+        """Apply the strict content requirement to a first-pass result without re-scraping it.
+
+        Thin items are dropped; RSS sources then continue from the feed entries the
+        first pass did not reach, so only the missing slots cost new fetches.
+        """
+        if not int(result.get('thin_items', 0) or 0):
+            return result
+
+        items = result.get('items') or []
+        kept = [item for item in items if item.get('summary')]
+        skipped = int(result.get('skipped_thin_items', 0) or 0) + (len(items) - len(kept))
+
+        state = self._rss_retry_state.get(result.get('source', ''))
+        if result.get('format') == 'rss' and state:
+            _, extra_skipped = await self._fill_rss_items(session, state['candidates'], kept, state['max_items'])
+            skipped += extra_skipped
+            # An unchanged feed next run should reuse the refilled items, not the thin ones
+            cached_feed = self.feed_http_cache.get(state.get('feed_url', ''))
+            if isinstance(cached_feed, dict) and kept:
+                cached_feed['items'] = [dict(item) for item in kept]
+                self._feed_http_cache_dirty = True
+
+        logger.info(
+            f"🔁 {result.get('source')}: strict retry kept {len(kept)} items (dropped {len(items) - len(kept)} thin)"
+        )
+        tightened = dict(result)
+        tightened['items'] = kept
+        tightened['scraped_count'] = len(kept)
+        tightened['thin_items'] = 0
+        tightened['skipped_thin_items'] = skipped
+        return tightened
+
+    def _rss_max_items(self, source: Dict[str, Any]) -> int:
+        # Dynamic max items: if few sources, get more items per source
+        total_sources = len([s for s in self.sources if s.get('enabled', True)])
+        if total_sources <= 2:
+            max_items = source.get('maxItems', 15)  # Get many items when very few sources
+        elif total_sources <= 4:
+            max_items = source.get('maxItems', 10)  # Get moderate items
+        elif total_sources <= 6:
+            max_items = source.get('maxItems', 7)   # Standard amount
+        else:
+            max_items = source.get('maxItems', 5)   # Limit when many sources
+
+        logger.info(f"📊 Using max {max_items} items (total sources: {total_sources})")
+        return max_items
+
     async def scrape_rss_source(self, session: aiohttp.ClientSession, source: Dict[str, Any]) -> Dict[str, Any]:
         logger.info(f"📡 RSS feed detected for {source['name']}")
         
         try:
+            fetch_started = time.perf_counter()
             attempted_url = source['url']
-            meta = await self.fetch_url_with_meta(session, attempted_url, source.get('type'))
+            max_items = self._rss_max_items(source)
+            # Stop downloading/parsing once there are enough entries to fill max_items,
+            # with headroom for entries skipped as too short or thin.
+            stream_entries = max_items * 3 if self.stream_feeds else None
+            timeout = self._source_timeout(source)
+            meta = await self.fetch_url_with_meta(
+                session,
+                attempted_url,
+                source.get('type'),
+                extra_headers=self._conditional_headers(attempted_url),
+                stream_feed_entries=stream_entries,
+                timeout=timeout,
+            )
+            _set_stat('feed_latency_ms', meta.get('elapsed_ms'))
+            _set_stat('feed_timed_out', bool(meta.get('timed_out')))
+
+            # Unchanged feed: reuse the items parsed on a previous run
+            if meta.get('status') == 304:
+                cached_feed = self.feed_http_cache.get(attempted_url)
+                if isinstance(cached_feed, dict) and cached_feed.get('items'):
+                    _record_phase('feed_fetch', fetch_started)
+                    _count_stat('feeds_not_modified')
+                    return self._result_from_feed_http_cache(source, cached_feed, max_items)
+                # Validators without cached items should never be sent; refetch unconditionally
+                meta = await self.fetch_url_with_meta(
+                    session, attempted_url, source.get('type'), stream_feed_entries=stream_entries, timeout=timeout
+                )
+
             feed_data = meta.get('text', '')
             http_status = meta.get('status')
             content_type = meta.get('content_type', '')
             final_url = meta.get('final_url', attempted_url)
 
-            # Self-heal if feed is broken (HTTP error or HTML block page)
-            if (
+            # Self-heal if feed is broken (HTTP error or HTML block page).
+            # A timeout means a slow host, not a moved feed, so it is not worth more requests.
+            if not meta.get('timed_out') and (
                 (http_status and http_status >= 400)
                 or (feed_data and self._looks_like_html(feed_data))
                 or (not feed_data)
@@ -587,6 +1168,9 @@ class NewsScraper:
                     }
                     self._save_feed_url_cache()
 
+            # Streamed feeds are parsed while downloading, so that parse time is counted here
+            _record_phase('feed_fetch', fetch_started)
+
             if not feed_data:
                 logger.warning(f"❌ Failed to fetch RSS feed from {source['name']}")
                 return self.create_empty_result(
@@ -617,113 +1201,30 @@ class NewsScraper:
             
             logger.info(f"✅ Successfully fetched RSS feed ({len(feed_data)} characters)")
             
-            # Parse RSS feed
-            feed = feedparser.parse(feed_data)
+            # Parse RSS feed (already done while streaming unless the XML was malformed)
+            feed = meta.get('feed')
+            if feed is None:
+                with _timed_phase('parse'):
+                    feed = feedparser.parse(feed_data)
             
             if feed.bozo:
                 logger.warning(f"⚠️ RSS feed may have parsing issues: {feed.bozo_exception}")
             
             logger.info(f"📡 RSS feed parsed: {len(feed.entries)} entries found")
             
-            items = []
-            thin_items = 0
-            skipped_thin = 0
-            
-            # Dynamic max items: if few sources, get more items per source
-            total_sources = len([s for s in self.sources if s.get('enabled', True)])
-            if total_sources <= 2:
-                max_items = source.get('maxItems', 15)  # Get many items when very few sources
-            elif total_sources <= 4:
-                max_items = source.get('maxItems', 10)  # Get moderate items
-            elif total_sources <= 6:
-                max_items = source.get('maxItems', 7)   # Standard amount
-            else:
-                max_items = source.get('maxItems', 5)   # Limit when many sources
-            
-            logger.info(f"📊 Using max {max_items} items (total sources: {total_sources})")
-            
-            for entry in feed.entries:
-                title = self._clean_text(entry.get('title', '').strip())
-                summary = self._clean_text(entry.get('summary', '').strip())
-                if not summary:
-                    summary = self._clean_text(entry.get('description', '').strip())
-                if not summary:
-                    content_list = entry.get('content', []) or []
-                    if isinstance(content_list, list) and content_list:
-                        summary = self._clean_text((content_list[0] or {}).get('value', '').strip())
-                
-                # Use title, or summary if no title
-                text = title if title else summary
-                
-                if text and len(text) > 10:
-                    entry_link = entry.get('link', '')
-                    if entry_link:
-                        entry_link = urljoin(final_url or attempted_url, entry_link)
-                    item = {
-                        'title': text,
-                        'link': entry_link,
-                        'timestamp': datetime.now().isoformat()
-                    }
-                    
-                    # Add published date if available
-                    if hasattr(entry, 'published_parsed') and entry.published_parsed:
-                        try:
-                            pub_date = datetime(*entry.published_parsed[:6])
-                            item['published'] = pub_date.isoformat()
-                        except:
-                            pass
-                    
-                    # Check if summary is too short or generic
-                    # We should fetch full content for most RSS feeds as they often only provide teasers
-                    needs_full_content = False
-                    if not summary or len(summary) < 200:
-                        needs_full_content = True
-                    elif any(generic in summary.lower() for generic in [
-                        'inlägget', 'dök först upp på', 'läs mer', 'read more', 
-                        'continue reading', 'click here', '...', 'the post',
-                        'appeared first on', 'fortsätt läsa', 'dök först upp'
-                    ]):
-                        needs_full_content = True
-                    # Also fetch if summary is mostly links/HTML (or has any HTML tags)
-                    elif summary.count('<') > 0 or summary.count('http') > 2:
-                        needs_full_content = True
-                    # Also if very short and generic sounding
-                    elif len(summary) < 150 and ('dök' in summary or 'inlägg' in summary):
-                        needs_full_content = True
-                    
-                    # Fetch full article content if needed
-                    if needs_full_content and entry_link:
-                        logger.debug(f"  📄 Fetching full content for: {title[:50]}...")
-                        article_content = await self.fetch_article_content(session, entry_link)
-                        if article_content:
-                            item['summary'] = article_content[:2000] + '...' if len(article_content) > 2000 else article_content
-                            logger.debug(f"  ✓ Got {len(article_content)} chars of article content")
-                        elif summary:
-                            item['summary'] = summary[:1000] + '...' if len(summary) > 1000 else summary
-                        else:
-                            logger.warning(f"⚠️ No article content for: {title[:80]} ({entry_link})")
-                    else:
-                        # Use existing summary if it's good enough
-                        if summary and summary != title and len(summary) > 10:
-                            item['summary'] = summary[:2000] + '...' if len(summary) > 2000 else summary
-
-                    if not item.get('summary'):
-                        if self.require_article_content:
-                            logger.warning(f"⚠️ Skipping thin item (no content): {title[:80]}")
-                            skipped_thin += 1
-                            continue
-                        logger.warning(f"⚠️ Thin item (no content): {title[:80]}")
-                        thin_items += 1
-                    
-                    items.append(item)
-                    logger.debug(f"  ✓ Added RSS item: {text[:80]}...")
-
-                    if len(items) >= max_items:
-                        break
+            candidates = self._iter_rss_candidates(feed.entries, final_url or attempted_url)
+            items: List[Dict[str, Any]] = []
+            thin_items, skipped_thin = await self._fill_rss_items(session, candidates, items, max_items)
+            # Keep the partially consumed entries so a strict retry can refill from here
+            self._rss_retry_state[source['name']] = {
+                'candidates': candidates,
+                'max_items': max_items,
+                'feed_url': attempted_url,
+            }
             
             logger.info(f"✅ Successfully extracted {len(items)} RSS items from {source['name']}")
             
-            return {
+            result = {
                 'source': source['name'],
                 'type': source['type'],
                 'priority': source.get('priority', 3),
@@ -738,13 +1239,20 @@ class NewsScraper:
                 'final_url': final_url,
                 'original_url': source.get('original_url')
             }
+            self._remember_feed_http_cache(attempted_url, meta, result)
+            return result
             
         except Exception as e:
             logger.error(f"❌ Error parsing RSS feed from {source['name']}: {e}")
             return self.create_empty_result(source, f'RSS parsing error: {str(e)}')
     
     async def scrape_html_source(self, session: aiohttp.ClientSession, source: Dict[str, Any]) -> Dict[str, Any]:
-        meta = await self.fetch_url_with_meta(session, source['url'], source.get('type'))
+        with _timed_phase('feed_fetch'):
+            meta = await self.fetch_url_with_meta(
+                session, source['url'], source.get('type'), timeout=self._source_timeout(source)
+            )
+        _set_stat('feed_latency_ms', meta.get('elapsed_ms'))
+        _set_stat('feed_timed_out', bool(meta.get('timed_out')))
         html = meta.get('text', '')
         http_status = meta.get('status')
         content_type = meta.get('content_type', '')
@@ -779,12 +1287,14 @@ class NewsScraper:
         
         if needs_javascript and PLAYWRIGHT_AVAILABLE:
             logger.info(f"🚀 Detected dynamic content - using JavaScript rendering for {source['name']}")
-            js_html = await self.fetch_javascript_content(source['url'], source.get('selector'))
+            with _timed_phase('js_render'):
+                js_html = await self.fetch_javascript_content(source['url'], source.get('selector'))
             if js_html:
                 html = js_html
                 logger.info(f"✅ JavaScript rendering complete ({len(html)} characters)")
         
-        soup = BeautifulSoup(html, 'html.parser')
+        with _timed_phase('parse'):
+            soup = BeautifulSoup(html, 'html.parser')
         items = []
         thin_items = 0
         skipped_thin = 0
@@ -817,7 +1327,7 @@ class NewsScraper:
             elements = soup.select(selector)
             logger.info(f"📰 Found {len(elements)} total HTML elements matching selector")
             
-            processed = 0
+            entries = []
             for elem in elements[:max_items]:
                 text = elem.get_text(strip=True)
                 if text and len(text) > 10:
@@ -832,33 +1342,37 @@ class NewsScraper:
 
                     if link:
                         link = urljoin(final_url or source['url'], link)
-
-                    summary = ''
-                    if link:
-                        article_content = await self.fetch_article_content(session, link)
-                        if article_content:
-                            summary = article_content[:2000] + '...' if len(article_content) > 2000 else article_content
-                        else:
-                            logger.warning(f"⚠️ No article content for: {text[:80]} ({link})")
-
-                    if not summary and self.require_article_content:
-                        logger.warning(f"⚠️ Skipping thin item (no content): {text[:80]}")
-                        skipped_thin += 1
-                        continue
-                    if not summary:
-                        logger.warning(f"⚠️ Thin item (no content): {text[:80]}")
-                        thin_items += 1
-                    
-                    items.append({
-                        'title': text,
-                        'link': link,
-                        'summary': summary,
-                        'timestamp': datetime.now().isoformat()
-                    })
-                    logger.debug(f"  ✓ Added HTML item: {text[:80]}...")
-                    processed += 1
+                    entries.append((text, link))
                 else:
                     logger.debug(f"  ✗ Skipped (too short): {text[:40]}...")
+
+            contents = await self._fetch_article_contents(session, [link or None for _, link in entries])
+
+            processed = 0
+            for (text, link), article_content in zip(entries, contents):
+                summary = ''
+                if link:
+                    if article_content:
+                        summary = article_content[:2000] + '...' if len(article_content) > 2000 else article_content
+                    else:
+                        logger.warning(f"⚠️ No article content for: {text[:80]} ({link})")
+
+                if not summary and self.require_article_content:
+                    logger.warning(f"⚠️ Skipping thin item (no content): {text[:80]}")
+                    skipped_thin += 1
+                    continue
+                if not summary:
+                    logger.warning(f"⚠️ Thin item (no content): {text[:80]}")
+                    thin_items += 1
+                
+                items.append({
+                    'title': text,
+                    'link': link,
+                    'summary': summary,
+                    'timestamp': datetime.now().isoformat()
+                })
+                logger.debug(f"  ✓ Added HTML item: {text[:80]}...")
+                processed += 1
             
             logger.info(f"✅ Successfully extracted {processed} HTML items from {source['name']}")
         
@@ -1086,6 +1600,17 @@ class NewsScraper:
         if not query:
             return
 
+        # Reuse related articles found for the same story on a previous run
+        cache_key = canonicalize_url(item.get('link') or '') or f"title:{title}"
+        if self.article_cache is not None:
+            try:
+                cached_related = self.article_cache.get_related(f"{provider}:{omni_only}:{cache_key}")
+            except Exception:
+                cached_related = None
+            if cached_related:
+                item['related'] = cached_related[:max_related]
+                return
+
         require_domain = 'omni.se' if omni_only else None
         entries: List[Dict[str, Any]] = []
 
@@ -1107,7 +1632,7 @@ class NewsScraper:
             if not link or link == existing_url:
                 continue
             try:
-                content = await self.fetch_article_content(session, link)
+                content = await self.fetch_article_content_limited(session, link)
             except Exception:
                 content = ''
             content = (content or '').strip()
@@ -1124,6 +1649,11 @@ class NewsScraper:
 
         if related:
             item['related'] = related
+            if self.article_cache is not None:
+                try:
+                    self.article_cache.put_related(f"{provider}:{omni_only}:{cache_key}", related)
+                except Exception as e:
+                    logger.debug(f"Article cache write failed for related items: {e}")
 
     async def _enrich_thin_items(self, results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Best-effort enrichment: if an item is too 'thin', try to fetch 1-2 related sources."""
@@ -1148,7 +1678,7 @@ class NewsScraper:
         )
 
         enriched = 0
-        async with aiohttp.ClientSession() as session:
+        async with self._http_session() as session:
             for group in results or []:
                 if enriched >= max_items_total:
                     break
@@ -1168,12 +1698,16 @@ class NewsScraper:
                     if not self._is_thin_item(item):
                         continue
                     try:
-                        await self._enrich_item_with_related(
-                            session,
-                            item,
-                            max_related=max_related,
-                            provider=provider,
-                            omni_only=omni_only,
+                        await self._attributed(
+                            group.get('scrape_stats'),
+                            'enrichment',
+                            self._enrich_item_with_related(
+                                session,
+                                item,
+                                max_related=max_related,
+                                provider=provider,
+                                omni_only=omni_only,
+                            ),
                         )
                         if item.get('related'):
                             enriched += 1
@@ -1183,22 +1717,36 @@ class NewsScraper:
 
         return results
     
+    def _cluster_stories(self, results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        if not self.story_clustering:
+            return results
+        started = time.perf_counter()
+        try:
+            clustered, stats = cluster_scraped_data(results, threshold=self.cluster_threshold)
+        except Exception as e:
+            logger.warning(f"🧬 Story clustering failed, continuing without it: {e}")
+            return results
+        logger.info(
+            "🧬 [CLUSTER] Items in=%s, out=%s, clusters=%s, merged=%s (%.2fs)",
+            stats.total_items_in,
+            stats.total_items_out,
+            stats.clusters,
+            stats.merged_items,
+            time.perf_counter() - started,
+        )
+        return clustered
+
     async def scrape_all(self) -> List[Dict[str, Any]]:
-        async def _scrape_once() -> List[Dict[str, Any]]:
+        async def _scrape_once(session: aiohttp.ClientSession) -> List[Dict[str, Any]]:
             logger.info(f"🚀 Starting scraping from {len(self.sources)} sources...")
-            async with aiohttp.ClientSession() as session:
-                tasks = [self.scrape_source(session, source) for source in self.sources]
-                scraped = await asyncio.gather(*tasks)
+            self._rss_retry_state = {}
 
-            # Optional best-effort enrichment for items that are too short to summarize well
-            try:
-                scraped = await self._enrich_thin_items(scraped)
-            except Exception as e:
-                logger.warning(f"🧩 Enrichment step failed, continuing without it: {e}")
+            async def _scrape_or_skip(source: Dict[str, Any]) -> Dict[str, Any]:
+                if self.source_health is not None and not self.source_health.allow(source['name']):
+                    return self._circuit_open_result(source)
+                return await self.scrape_source(session, source)
 
-            # Sort by priority
-            scraped.sort(key=lambda x: x.get('priority', 99))
-            return scraped
+            return list(await asyncio.gather(*(_scrape_or_skip(source) for source in self.sources)))
 
         def _compute_thin_stats(scraped: List[Dict[str, Any]]) -> Dict[str, int | float]:
             total_items = sum(len(result.get('items', [])) for result in scraped)
@@ -1238,20 +1786,73 @@ class NewsScraper:
                 if thin_count or skipped_count:
                     logger.warning(f"    ⚠️ Thin items: {thin_count} (skipped: {skipped_count})")
 
-        results = await _scrape_once()
+            _log_timing_table(scraped)
 
-        # Auto-tighten if too many thin items and strict mode is allowed
-        if self.thin_ratio_auto_strict and not self.require_article_content:
-            stats = _compute_thin_stats(results)
-            if stats['total_seen'] >= self.thin_ratio_min_items and stats['thin_ratio'] >= self.thin_ratio_threshold:
-                logger.warning(
-                    "⚠️ High thin-item ratio (%.0f%%). Retrying with strict content requirement.",
-                    stats['thin_ratio'] * 100,
+        def _log_timing_table(scraped: List[Dict[str, Any]]) -> None:
+            rows = [r for r in scraped if isinstance(r.get('scrape_stats'), dict)]
+            if not rows:
+                return
+            rows.sort(key=lambda r: r['scrape_stats'].get('total_ms', 0.0), reverse=True)
+            columns = [
+                ('feed_fetch', 'fetch'), ('parse', 'parse'), ('js_render', 'js'),
+                ('article_fetch', 'articles'), ('strict_retry', 'strict'), ('enrichment', 'enrich'),
+            ]
+            logger.info("⏱️ Time per source (s), slowest first:")
+            logger.info(
+                f"  {'source':<28} {'total':>6} "
+                + ' '.join(f"{label:>8}" for _, label in columns)
+                + f" {'KB':>7} {'req':>4} {'art':>4} {'hits':>4}"
+            )
+            for result in rows:
+                stats = result['scrape_stats']
+                phases = stats.get('phases_ms') or {}
+                logger.info(
+                    f"  {str(result.get('source', ''))[:28]:<28} {stats.get('total_ms', 0.0) / 1000:>6.1f} "
+                    + ' '.join(f"{phases.get(name, 0.0) / 1000:>8.1f}" for name, _ in columns)
+                    + f" {stats.get('bytes', 0) / 1024:>7.0f} {stats.get('requests', 0):>4}"
+                    f" {stats.get('article_fetches', 0):>4} {stats.get('article_cache_hits', 0):>4}"
                 )
-                self.require_article_content = True
-                results = await _scrape_once()
+
+        run_started = time.perf_counter()
+        try:
+            async with self._http_session() as session:
+                results = await _scrape_once(session)
+
+                # Auto-tighten if too many thin items and strict mode is allowed.
+                # The retry reuses this pass: thin items are dropped and only their slots refilled.
+                if self.thin_ratio_auto_strict and not self.require_article_content:
+                    stats = _compute_thin_stats(results)
+                    if stats['total_seen'] >= self.thin_ratio_min_items and stats['thin_ratio'] >= self.thin_ratio_threshold:
+                        logger.warning(
+                            "⚠️ High thin-item ratio (%.0f%%). Retrying with strict content requirement.",
+                            stats['thin_ratio'] * 100,
+                        )
+                        self.require_article_content = True
+                        results = list(await asyncio.gather(*(
+                            self._attributed(r.get('scrape_stats'), 'strict_retry', self._tighten_result(session, r))
+                            for r in results
+                        )))
+
+                # Optional best-effort enrichment for items that are too short to summarize well
+                try:
+                    results = await self._enrich_thin_items(results)
+                except Exception as e:
+                    logger.warning(f"🧩 Enrichment step failed, continuing without it: {e}")
+        finally:
+            # Playwright must shut down inside the loop that started it
+            await self.browser_pool.close()
+
+        # Sort by priority
+        results.sort(key=lambda x: x.get('priority', 99))
+        self._rss_retry_state = {}
+        results = self._cluster_stories(results)
 
         _log_scrape_summary(results)
+        logger.info(f"⏱️ Scraping took {time.perf_counter() - run_started:.1f}s in total")
+        self._save_feed_http_cache()
+        self._save_source_health()
+        self._flush_article_cache()
+        self.extractor.save()
         return results
 
 async def main():
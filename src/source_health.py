@@ -0,0 +1,146 @@
+import json
+import math
+import os
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+_DEFAULT_HEALTH_PATH = "source_health.json"
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    rank = max(0, min(len(ordered) - 1, math.ceil(pct / 100.0 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+class SourceHealth:
+    """Persisted per-source latency history and circuit breaker.
+
+    Timeouts follow the observed fetch latency of each source (a multiple of its
+    p95, clamped to ``[min_timeout, max_timeout]``). After ``failure_threshold``
+    failed runs in a row the circuit opens and the source is skipped for
+    ``open_runs`` runs; the next run is a half-open probe that closes the circuit
+    on success or reopens it (for twice as long, up to ``max_open_runs``) on failure.
+    """
+
+    def __init__(
+        self,
+        path: str = _DEFAULT_HEALTH_PATH,
+        *,
+        default_timeout: float = 20.0,
+        min_timeout: float = 5.0,
+        max_timeout: float = 20.0,
+        latency_multiplier: float = 3.0,
+        min_samples: int = 3,
+        max_samples: int = 20,
+        failure_threshold: int = 3,
+        open_runs: int = 3,
+        max_open_runs: int = 24,
+    ):
+        self.path = path
+        self.default_timeout = float(default_timeout)
+        self.min_timeout = float(min_timeout)
+        self.max_timeout = max(self.min_timeout, float(max_timeout))
+        self.latency_multiplier = float(latency_multiplier)
+        self.min_samples = max(1, int(min_samples))
+        self.max_samples = max(self.min_samples, int(max_samples))
+        self.failure_threshold = max(1, int(failure_threshold))
+        self.open_runs = max(1, int(open_runs))
+        self.max_open_runs = max(self.open_runs, int(max_open_runs))
+        self.records: Dict[str, Dict[str, Any]] = self._load(path)
+        self._dirty = False
+
+    @staticmethod
+    def _load(path: str) -> Dict[str, Dict[str, Any]]:
+        try:
+            if not path or not os.path.exists(path):
+                return {}
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except Exception:
+            return {}
+
+    def _record(self, name: str) -> Dict[str, Any]:
+        record = self.records.get(name)
+        if not isinstance(record, dict):
+            record = {'state': CLOSED, 'consecutive_failures': 0, 'latencies_ms': []}
+            self.records[name] = record
+        return record
+
+    def timeout_for(self, name: str) -> float:
+        """Total request timeout (seconds) for a source's feed/page fetch."""
+        latencies = self._record(name).get('latencies_ms') or []
+        if len(latencies) < self.min_samples:
+            return self.default_timeout
+        derived = _percentile(latencies, 95) / 1000.0 * self.latency_multiplier
+        return round(max(self.min_timeout, min(self.max_timeout, derived)), 1)
+
+    def allow(self, name: str) -> bool:
+        """Whether to scrape ``name`` this run. Call once per source and run."""
+        record = self._record(name)
+        if record.get('state') != OPEN:
+            return True
+        remaining = int(record.get('skip_runs_remaining', 0) or 0)
+        if remaining > 0:
+            record['skip_runs_remaining'] = remaining - 1
+            self._dirty = True
+            return False
+        record['state'] = HALF_OPEN
+        self._dirty = True
+        return True
+
+    def state(self, name: str) -> str:
+        return self._record(name).get('state', CLOSED)
+
+    def record_success(self, name: str, latency_ms: Optional[float]) -> None:
+        record = self._record(name)
+        if latency_ms is not None:
+            latencies = list(record.get('latencies_ms') or [])
+            latencies.append(round(float(latency_ms), 1))
+            record['latencies_ms'] = latencies[-self.max_samples:]
+        record.update({
+            'state': CLOSED,
+            'consecutive_failures': 0,
+            'open_runs': 0,
+            'skip_runs_remaining': 0,
+            'last_success': datetime.now().isoformat(timespec='seconds'),
+        })
+        self._dirty = True
+
+    def record_failure(self, name: str, error: str, *, timed_out_after: Optional[float] = None) -> bool:
+        """Count a failed run; returns True when this failure opened the circuit."""
+        record = self._record(name)
+        if timed_out_after is not None:
+            # A timeout says the source needs at least this long; let the next timeout grow.
+            latencies = list(record.get('latencies_ms') or [])
+            latencies.append(round(timed_out_after * 1000.0, 1))
+            record['latencies_ms'] = latencies[-self.max_samples:]
+        failures = int(record.get('consecutive_failures', 0) or 0) + 1
+        record['consecutive_failures'] = failures
+        record['last_error'] = (error or '')[:300]
+        record['last_failure'] = datetime.now().isoformat(timespec='seconds')
+        self._dirty = True
+
+        was_probe = record.get('state') == HALF_OPEN
+        if not was_probe and failures < self.failure_threshold:
+            return False
+        previous = int(record.get('open_runs', 0) or 0)
+        open_runs = min(self.max_open_runs, previous * 2) if was_probe and previous else self.open_runs
+        record.update({'state': OPEN, 'open_runs': open_runs, 'skip_runs_remaining': open_runs})
+        return True
+
+    def save(self) -> None:
+        if not self._dirty or not self.path:
+            return
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.records, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.path)
+        self._dirty = False
@@ -0,0 +1,240 @@
+import hashlib
+import math
+import random
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Set, Tuple
+
+from news_dedupe import is_weather_source
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+_TOKEN_RE = re.compile(r"[0-9a-zåäöéü]+")
+
+# Function words that say nothing about which story an article covers
+_STOPWORDS = {
+    "och", "att", "det", "som", "för", "från", "med", "till", "har", "här", "den", "detta", "dessa",
+    "samt", "även", "inte", "mer", "mot", "nya", "nu", "idag", "på", "av", "en", "ett", "om", "ur",
+    "vid", "efter", "under", "över", "kring", "sin", "sitt", "sina", "var", "vara", "blir", "kan",
+    "ska", "skulle", "men", "eller", "när", "där", "säger", "enligt", "uppger", "hade", "man",
+    "the", "and", "for", "with", "from", "that", "this", "was", "are", "has", "have", "will",
+}
+
+
+def _tokens(text: str) -> List[str]:
+    return [t for t in _TOKEN_RE.findall((text or "").lower()) if len(t) >= 3 and t not in _STOPWORDS]
+
+
+def story_shingles(item: Dict[str, Any], lead_words: int = 0) -> Set[str]:
+    """Word shingles for an item: its title words plus the first ``lead_words`` summary words.
+
+    Different outlets word the same story differently, so single words
+    (names, places, key nouns) match far better than multi-word shingles, and
+    headlines agree much more than ledes do; the summary is off by default.
+    """
+    shingles = set(_tokens(item.get("title") or ""))
+    if lead_words > 0:
+        shingles.update(_tokens(item.get("summary") or item.get("content") or "")[:lead_words])
+    return shingles
+
+
+def jaccard(a: Set[str], b: Set[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def shingle_weights(shingle_sets: List[Set[str]]) -> Dict[str, float]:
+    """IDF weight per shingle over one scrape: ``log((n + 1) / document frequency)``.
+
+    A name that is in every headline of the day (a resignation everyone
+    comments on) says little about which story an item covers; rare words
+    (a person, a product) say a lot.
+    """
+    frequency: Dict[str, int] = {}
+    for shingles in shingle_sets:
+        for shingle in shingles:
+            frequency[shingle] = frequency.get(shingle, 0) + 1
+    count = len(shingle_sets)
+    return {shingle: math.log((count + 1) / df) for shingle, df in frequency.items()}
+
+
+def weighted_jaccard(a: Set[str], b: Set[str], weights: Dict[str, float]) -> float:
+    """Jaccard similarity with each shingle counted by its weight (unknown shingles weigh 1)."""
+    if not a or not b:
+        return 0.0
+    union = sum(weights.get(s, 1.0) for s in a | b)
+    return sum(weights.get(s, 1.0) for s in a & b) / union if union else 0.0
+
+
+def _hash_shingle(shingle: str) -> int:
+    return int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=4).digest(), "little")
+
+
+class MinHasher:
+    """MinHash signatures with ``num_perm`` universal hash functions (fixed seed)."""
+
+    def __init__(self, num_perm: int = 64, seed: int = 1):
+        rng = random.Random(seed)
+        self.num_perm = num_perm
+        self._params = [
+            (rng.randrange(1, _MERSENNE_PRIME), rng.randrange(0, _MERSENNE_PRIME)) for _ in range(num_perm)
+        ]
+
+    def signature(self, shingles: Iterable[str]) -> List[int]:
+        hashes = [_hash_shingle(s) for s in shingles]
+        if not hashes:
+            return [_MAX_HASH] * self.num_perm
+        return [
+            min(((a * h + b) % _MERSENNE_PRIME) & _MAX_HASH for h in hashes)
+            for a, b in self._params
+        ]
+
+
+def lsh_candidate_pairs(signatures: List[List[int]], bands: int) -> Set[Tuple[int, int]]:
+    """Index pairs whose signatures agree on at least one band."""
+    if not signatures:
+        return set()
+    rows = max(1, len(signatures[0]) // bands)
+    pairs: Set[Tuple[int, int]] = set()
+    for band in range(bands):
+        buckets: Dict[Tuple[int, ...], List[int]] = {}
+        for index, signature in enumerate(signatures):
+            key = tuple(signature[band * rows:(band + 1) * rows])
+            buckets.setdefault(key, []).append(index)
+        for members in buckets.values():
+            for i in range(len(members)):
+                for j in range(i + 1, len(members)):
+                    pairs.add((members[i], members[j]))
+    return pairs
+
+
+@dataclass
+class ClusterStats:
+    total_items_in: int
+    total_items_out: int
+    clusters: int
+    merged_items: int
+
+
+def cluster_scraped_data(
+    scraped_data: List[Dict[str, Any]],
+    threshold: float = 0.3,
+    num_perm: int = 128,
+    bands: int = 64,
+    min_shingles: int = 3,
+    lead_words: int = 0,
+) -> Tuple[List[Dict[str, Any]], ClusterStats]:
+    """Merge near-duplicate stories across sources.
+
+    MinHash/LSH over ``story_shingles`` proposes candidate pairs; pairs from
+    different sources whose IDF-weighted Jaccard similarity (``shingle_weights``
+    over this scrape) reaches ``threshold`` are merged, most similar first. On
+    real scrapes the same story across outlets shares 30-45% of its headline
+    words, as do different takes on one big story; the weighting keeps the
+    former around 0.35-0.45 and pushes the latter below 0.25. A cluster never holds two items of one source
+    (an outlet's own follow-ups share most headline words), so a merge that
+    would bring a source in twice is skipped instead of chaining stories
+    together. The cluster's representative is the item from the
+    highest-priority source (then the longest summary); the other items are
+    removed from their groups and listed under the representative's
+    ``alternates`` (source, title, link).
+    Weather groups are left alone.
+    """
+    hasher = MinHasher(num_perm=num_perm)
+    positions: List[Tuple[int, int]] = []
+    shingle_sets: List[Set[str]] = []
+    signatures: List[List[int]] = []
+    for group_index, group in enumerate(scraped_data or []):
+        if is_weather_source(group.get("type", "")):
+            continue
+        for item_index, item in enumerate(group.get("items") or []):
+            shingles = story_shingles(item, lead_words=lead_words)
+            if len(shingles) < min_shingles:
+                continue
+            positions.append((group_index, item_index))
+            shingle_sets.append(shingles)
+            signatures.append(hasher.signature(shingles))
+
+    total_in = sum(len(g.get("items") or []) for g in scraped_data or [])
+
+    weights = shingle_weights(shingle_sets)
+    parent = list(range(len(positions)))
+    # Groups (one per source) present in each cluster, kept on the root
+    cluster_groups: Dict[int, Set[int]] = {i: {positions[i][0]} for i in range(len(positions))}
+
+    def _find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    scored_pairs = []
+    for i, j in lsh_candidate_pairs(signatures, bands):
+        if positions[i][0] == positions[j][0]:
+            continue
+        similarity = weighted_jaccard(shingle_sets[i], shingle_sets[j], weights)
+        if similarity >= threshold:
+            scored_pairs.append((similarity, i, j))
+    scored_pairs.sort(key=lambda pair: (-pair[0], pair[1], pair[2]))
+    for _, i, j in scored_pairs:
+        root_i, root_j = _find(i), _find(j)
+        if root_i == root_j or cluster_groups[root_i] & cluster_groups[root_j]:
+            continue
+        parent[root_i] = root_j
+        cluster_groups[root_j] |= cluster_groups.pop(root_i)
+
+    clusters: Dict[int, List[int]] = {}
+    for index in range(len(positions)):
+        clusters.setdefault(_find(index), []).append(index)
+    multi = [members for members in clusters.values() if len(members) > 1]
+    if not multi:
+        return list(scraped_data or []), ClusterStats(total_in, total_in, 0, 0)
+
+    def _rank(index: int) -> Tuple[int, int]:
+        group_index, item_index = positions[index]
+        group = scraped_data[group_index]
+        item = group["items"][item_index]
+        priority = group.get("priority")
+        return (int(priority) if priority is not None else 3, -len(item.get("summary") or ""))
+
+    removed: Set[Tuple[int, int]] = set()
+    alternates: Dict[Tuple[int, int], List[Dict[str, Any]]] = {}
+    for members in multi:
+        members.sort(key=_rank)
+        representative = positions[members[0]]
+        for index in members[1:]:
+            group_index, item_index = positions[index]
+            group = scraped_data[group_index]
+            item = group["items"][item_index]
+            removed.add((group_index, item_index))
+            alternates.setdefault(representative, []).append({
+                "source": group.get("source", ""),
+                "title": item.get("title", ""),
+                "link": item.get("link", ""),
+            })
+
+    clustered: List[Dict[str, Any]] = []
+    for group_index, group in enumerate(scraped_data):
+        items = group.get("items") or []
+        if not any((group_index, i) in removed or (group_index, i) in alternates for i in range(len(items))):
+            clustered.append(group)
+            continue
+        kept = []
+        for item_index, item in enumerate(items):
+            if (group_index, item_index) in removed:
+                continue
+            extra = alternates.get((group_index, item_index))
+            if extra:
+                item = dict(item)
+                item["alternates"] = list(item.get("alternates") or []) + extra
+            kept.append(item)
+        new_group = dict(group)
+        new_group["items"] = kept
+        if "scraped_count" in new_group:
+            new_group["scraped_count"] = len(kept)
+        clustered.append(new_group)
+
+    total_out = total_in - len(removed)
+    return clustered, ClusterStats(total_in, total_out, len(multi), len(removed))
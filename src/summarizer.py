@@ -2,13 +2,13 @@ import json
 import logging
 from datetime import datetime
 from typing import List, Dict, Any, Optional
-from openai import OpenAI
 import os
 from dotenv import load_dotenv
 import sys
 import requests
 sys.path.append(os.path.dirname(__file__))
 from music_library import MusicLibrary
+from llm_client import default_llm_client
 
 load_dotenv()
 logging.basicConfig(level=logging.INFO)
@@ -22,14 +22,11 @@ class PodcastSummarizer:
         
         if self.openrouter_api_key:
             logger.info("Using OpenRouter API")
-            self.client = OpenAI(
-                base_url="https://openrouter.ai/api/v1",
-                api_key=self.openrouter_api_key,
-            )
+            self.client = default_llm_client()
             self.using_openrouter = True
         elif self.openai_api_key:
             logger.info("Using OpenAI API")
-            self.client = OpenAI(api_key=self.openai_api_key)
+            self.client = default_llm_client()
             self.using_openrouter = False
         else:
             logger.warning("No API key found for OpenRouter or OpenAI. Using fallback mode.")
@@ -440,15 +437,14 @@ Mål: Cirka 6–10 minuters samtal (hellre kortare än utfyllnad) som maximerar
             logger.info(f"Using model: {model}")
             
             # Simple API call - no max_tokens or temperature needed
-            response = self.client.chat.completions.create(
-                model=model,
-                messages=[
+            script = self.client.complete(
+                'openrouter' if self.using_openrouter else 'openai',
+                model,
+                [
                     {"role": "system", "content": system_prompt},
                     {"role": "user", "content": prompt}
                 ]
             )
-            
-            script = response.choices[0].message.content
             logger.info("Podcast script generated successfully")
             return script
             
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Regression check for story clustering on real headlines (scrape of 2025-10-15):
+1. The same story from two outlets is merged (Odinga: BBC/DW, ChatGPT erotica: BBC/TechCrunch)
+2. Follow-ups and commentary on one big story stay separate (Anna-Karin Hatt, SVT/DN)
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(__file__))
+
+from story_clusters import cluster_scraped_data
+
+SCRAPED = [
+    {
+        'source': 'SVT Nyheter',
+        'type': 'news',
+        'priority': 3,
+        'items': [
+            {'title': 'Nytt bakslag för LKAB:s monsterbygge i Malmberget'},
+            {'title': 'Miljonnotan efter Anna-Karin Hatt – kan få historiskt avgångsersättning'},
+            {'title': 'Mia Frisk om Anna-Karin Hatts avgång – vill se ändring i debatten'},
+            {'title': 'Chock i Centerpartiet efter Anna-Karin Hatts besked: ”Folk är förbannade”'},
+            {'title': 'Marmorstein: ”Väldigt överraskande” att Anna-Karin Hatt avgår'},
+            {'title': '”Det är för jävligt” – kommunalrådet i Jönköping reagerar på Anna-Karin Hatts avgång'},
+            {'title': 'Grovt kriminell fritogs från förvaret i Ljungbyhed'},
+        ],
+    },
+    {
+        'source': 'Dagens Nyheter',
+        'type': 'news',
+        'priority': 3,
+        'items': [
+            {'title': 'Insändare. Hat och hot mot politiker hotar den svenska demokratin'},
+            {'title': 'Vem vågar ta över efter Hatt?'},
+            {'title': 'Anna-Karin Hatt i tårar när hon informerade partiet'},
+            {'title': 'Björn Wiman: Anna-Karin Hatts avgång är ett jordskalv som får konsekvenser'},
+            {'title': 'Kosovare Asllani fortsätter i landslaget: ”Jag blev oerhört glad”'},
+        ],
+    },
+    {
+        'source': 'BBC News',
+        'type': 'news',
+        'priority': 3,
+        'items': [
+            {'title': "Bowen: Trump's role in Gaza ceasefire was decisive, but not a roadmap to peace"},
+            {'title': "'Father of our democracy': Kenya's Raila Odinga dies in India aged 80"},
+            {'title': "China seizes 60,000 maps over 'mislabelled' Taiwan"},
+            {'title': 'ChatGPT will soon allow erotica for verified adults, says OpenAI boss'},
+        ],
+    },
+    {
+        'source': 'Deutsche Welle',
+        'type': 'news',
+        'priority': 3,
+        'items': [
+            {'title': "Syria's new leader visits Moscow for talks with Putin"},
+            {'title': "Kenya's opposition giant Raila Odinga dies aged 80"},
+            {'title': 'Charlie Kirk: US revokes 6 visas over social media comments'},
+            {'title': "What role can Europe play in Trump's peace plan?"},
+        ],
+    },
+    {
+        'source': 'TechCrunch',
+        'type': 'tech',
+        'priority': 3,
+        'items': [
+            {'title': 'Waymo plans to launch a robotaxi service in London in 2026'},
+            {'title': 'OpenAI has five years to turn $13 billion into $1 trillion'},
+            {'title': 'Sam Altman says ChatGPT will soon allow erotica for adult users'},
+        ],
+    },
+]
+
+
+def _alternate_titles(clustered):
+    """Titel -> rubrikerna som slagits ihop under den"""
+    return {
+        item['title']: [alt['title'] for alt in item.get('alternates') or []]
+        for group in clustered
+        for item in group['items']
+    }
+
+
+def test_cross_source_duplicates_merge():
+    clustered, stats = cluster_scraped_data(SCRAPED)
+    merged = _alternate_titles(clustered)
+    assert merged["'Father of our democracy': Kenya's Raila Odinga dies in India aged 80"] == [
+        "Kenya's opposition giant Raila Odinga dies aged 80"
+    ]
+    assert merged['ChatGPT will soon allow erotica for verified adults, says OpenAI boss'] == [
+        'Sam Altman says ChatGPT will soon allow erotica for adult users'
+    ]
+    assert stats.merged_items == 2
+
+
+def test_hatt_follow_ups_stay_separate():
+    clustered, _ = cluster_scraped_data(SCRAPED)
+    merged = _alternate_titles(clustered)
+    hatt_titles = [
+        item['title']
+        for group in SCRAPED
+        for item in group['items']
+        if 'Hatt' in item['title']
+    ]
+    for title in hatt_titles:
+        assert title in merged, f"Slogs ihop: {title}"
+        assert merged[title] == [], f"Fick alternates: {title}"
+
+
+if __name__ == "__main__":
+    test_cross_source_duplicates_merge()
+    test_hatt_follow_ups_stay_separate()
+    print("✅ Story clustering: dubbletter slås ihop, Hatt-uppföljningarna hålls isär")
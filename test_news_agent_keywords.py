@@ -0,0 +1,28 @@
+#!/usr/bin/env python3
+"""
+Check av nyckelordsmatchningen i NewsScraperAgent:
+1. Böjda och sammansatta former av "hav" hamnar i miljöklassen
+2. Engelska "have"/"having" gör det inte
+"""
+from news_agent_system import NewsArticle, NewsCategory, NewsScraperAgent
+
+
+def test_hav_inflections_are_environment():
+    matcher = NewsScraperAgent.keyword_matcher()
+    for text in ['Havsnivån stiger', 'Havsisen krymper', 'Plast i havet', 'Östersjöhavet syrefattigt', 'Ut på hav']:
+        assert 'environment' in matcher.matches(text), text
+
+    article = NewsArticle(source='SVT Nyheter', title='Havsnivån stiger', content='', link='')
+    assert NewsScraperAgent().categorize(article).category == NewsCategory.ENVIRONMENT_GLOBAL
+
+
+def test_english_have_is_not_environment():
+    matcher = NewsScraperAgent.keyword_matcher()
+    for text in ['We have new numbers', 'Having a good day']:
+        assert 'environment' not in matcher.matches(text), text
+
+
+if __name__ == "__main__":
+    test_hav_inflections_are_environment()
+    test_english_have_is_not_environment()
+    print("✅ Nyckelord: havsformer träffar miljö, engelska 'have' gör det inte")